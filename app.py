@@ -5,6 +5,8 @@
 from flask import Flask, jsonify, request, render_template_string, send_file
 from config import DATA_STORE
 from chatbot import bot
+from sentiment import estado_modelo_sentimiento
+from recrawl_scheduler import iniciar_planificador, obtener_planificador
 from templates import HTML_TEMPLATE
 import threading
 from telegram_bot import start_telegram_bot
@@ -46,7 +48,7 @@ def home():
         total=len(DATA_STORE.get('titulares', [])),
         groq_enabled=bot.brain.enabled if bot.brain else False,
         groq_available=bot.brain.client is not None if bot.brain else False,
-        initialized=bot.initialized,
+        initialized=bot.listo,
         weather=weather,
         user_name=bot.user_name
     )
@@ -99,7 +101,7 @@ def chat():
 
 @app.route('/api/status')
 def status():
-    """Estado del sistema"""
+    """Estado del sistema (incluye qué parte del corpus ya se puede consultar)"""
     return jsonify({
         'initialized': bot.initialized,
         'initializing': bot.initializing,
@@ -108,9 +110,26 @@ def status():
         'current_action': DATA_STORE.get('current_action', 'Iniciando...'),
         'progress': DATA_STORE.get('progress', 0),
         'groq_enabled': bot.brain.enabled if bot.brain else False,
-        'groq_available': bot.brain.client is not None if bot.brain else False
+        'groq_available': bot.brain.client is not None if bot.brain else False,
+        'sentiment_model': estado_modelo_sentimiento()['estado'],
+        **bot.estado_indice()
     })
 
+@app.route('/api/scraper/stats')
+def scraper_stats():
+    """Métricas del scraper (caché HTTP, etc.)"""
+    from scraper import estadisticas_scraper
+    return jsonify(estadisticas_scraper())
+
+@app.route('/api/scraper/telemetry')
+def scraper_telemetry():
+    """Latencias, bytes, reintentos y tiempos por etapa del último refresco"""
+    from telemetry import obtener_telemetria
+    telemetria = obtener_telemetria()
+    if telemetria is None:
+        return jsonify({'error': 'Telemetría desactivada'}), 404
+    return jsonify(telemetria.resumen())
+
 @app.route('/api/headlines')
 def get_headlines():
     """Obtener titulares actuales"""
@@ -120,6 +139,30 @@ def get_headlines():
         'headlines': [{'titulo': h['titulo']} for h in headlines]
     })
 
+@app.route('/api/sentiment/<sentimiento>')
+def get_sentiment_news(sentimiento):
+    """Noticias de un sentimiento, paginadas (?page=1&per_page=10&order=recencia|confianza)"""
+    from sentiment_index import SENTIMIENTOS, ORDENES
+    sentimiento = sentimiento.capitalize()
+    orden = request.args.get('order', 'recencia')
+    if sentimiento not in SENTIMIENTOS or orden not in ORDENES:
+        return jsonify({'error': 'Sentimiento u orden desconocido'}), 400
+    pagina = max(request.args.get('page', 1, type=int), 1)
+    por_pagina = min(max(request.args.get('per_page', 10, type=int), 1), 100)
+    noticias, total = bot.sentimientos.pagina(sentimiento, pagina, por_pagina, orden)
+    return jsonify({
+        'sentiment': sentimiento,
+        'page': pagina,
+        'per_page': por_pagina,
+        'total': total,
+        'news': [{
+            'titulo': n['titulo'],
+            'url': n.get('url'),
+            'nivel_sentimiento': n.get('nivel_sentimiento'),
+            'descripcion_sentimiento': n.get('descripcion_sentimiento')
+        } for n in noticias]
+    })
+
 # RUTA CORREGIDA: Toggle Groq
 @app.route('/api/toggle-groq', methods=['POST'])
 def toggle_groq():
@@ -163,9 +206,16 @@ def toggle_groq():
 @app.route('/api/refresh', methods=['POST'])
 def refresh():
     """Recargar noticias"""
-    bot.initialize_async()
+    if not bot.initialize_async():
+        return jsonify({'status': 'busy', 'message': 'Ya hay una actualización en curso'})
     return jsonify({'status': 'ok', 'message': 'Recargando noticias...'})
 
+@app.route('/api/recrawl')
+def recrawl_stats():
+    """Intervalos y próximas visitas del re-crawl programado por sección"""
+    planificador = obtener_planificador()
+    return jsonify(planificador.estadisticas() if planificador else {'activo': False})
+
 @app.route('/api/tts', methods=['POST'])
 def tts():
     """Texto a voz (Optimizado con Edge TTS + Caché)"""
@@ -291,6 +341,8 @@ if __name__ == '__main__':
     print("   Las noticias se cargarán mientras usas el chat.\n")
     
     bot.initialize_async()
+    # Re-crawl periódico por sección (corre en su propio thread)
+    iniciar_planificador(bot)
     # Iniciar bot de Telegram como proceso independiente con limpieza
     telegram_process = subprocess.Popen([sys.executable, "telegram_bot.py"])
 
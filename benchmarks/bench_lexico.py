@@ -0,0 +1,121 @@
+# ================================================================================
+# benchmarks/bench_lexico.py - MICROBENCHMARK DEL CONTEO DE PALABRAS CLAVE
+# ================================================================================
+#
+# Compara el conteo anterior (un `re.search(r'\b...\b')` por término del
+# léxico) con el patrón único de lexicon.py, y verifica que ambos dan los
+# mismos conteos para cada texto. Usa las noticias del índice persistente o,
+# si está vacío, un corpus sintético con términos simples, compuestos y solapados.
+#
+# Uso (desde la raíz del proyecto):
+#   python -m benchmarks.bench_lexico --repeticiones 5 --salida bench_lexico.json
+#
+# ================================================================================
+
+import re
+import json
+import time
+import random
+import argparse
+
+from lexicon import LexicoSentimiento, obtener_lexico
+
+_RELLENO = ("el la los de del en por para con que gobierno ciudad departamento "
+            "según informó autoridades vecinos durante semana nueva proyecto "
+            "santa cruz la paz cochabamba alcaldía ministerio economía").split()
+
+
+def contar_por_termino(lexico: LexicoSentimiento, texto_lower: str):
+    """Referencia: el conteo original, una búsqueda por término"""
+    negativas = sum(1 for t in lexico.negativas if re.search(r'\b' + re.escape(t) + r'\b', texto_lower))
+    positivas = sum(1 for t in lexico.positivas if re.search(r'\b' + re.escape(t) + r'\b', texto_lower))
+    return negativas, positivas
+
+
+def corpus_sintetico(lexico: LexicoSentimiento, cantidad: int, semilla: int = 7):
+    """Textos de ~1500 caracteres; parte con términos (a veces pegados a otras letras)"""
+    azar = random.Random(semilla)
+    terminos = sorted(lexico.negativas | lexico.positivas)
+    textos = []
+    for _ in range(cantidad):
+        palabras = []
+        while sum(len(p) + 1 for p in palabras) < 1500:
+            if azar.random() < 0.03:
+                termino = azar.choice(terminos)
+                # Variantes que no deben contar: dentro de otra palabra
+                palabras.append(azar.choice([termino, termino, "x" + termino, termino + "s"]))
+            else:
+                palabras.append(azar.choice(_RELLENO))
+        textos.append(" ".join(palabras).capitalize())
+    return textos
+
+
+def _corpus(cantidad: int, lexico: LexicoSentimiento):
+    from news_index import obtener_indice_noticias
+
+    indice = obtener_indice_noticias()
+    noticias = indice.cargar(cantidad) if indice is not None else []
+    if noticias:
+        return [f"{n.get('titulo', '')} {n.get('contenido', '')}" for n in noticias], "índice de noticias"
+    return corpus_sintetico(lexico, cantidad), "sintético"
+
+
+def _medir(funcion, textos, repeticiones):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultados = [funcion(t.lower()) for t in textos]
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor, resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark del léxico de sentimientos")
+    parser.add_argument('--textos', type=int, default=2000)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--sintetico', action='store_true', help="no usar el índice de noticias")
+    parser.add_argument('--salida', help="guardar el resultado en este archivo JSON")
+    args = parser.parse_args()
+
+    lexico = obtener_lexico()
+    if args.sintetico:
+        textos, origen = corpus_sintetico(lexico, args.textos), "sintético"
+    else:
+        textos, origen = _corpus(args.textos, lexico)
+    print(f"📚 {len(textos)} textos ({origen}), {lexico}")
+
+    # Compilar el léxico es parte del costo de una recarga
+    inicio = time.perf_counter()
+    LexicoSentimiento(lexico.negativas, lexico.positivas)
+    compilacion = time.perf_counter() - inicio
+
+    seg_ref, referencia = _medir(lambda t: contar_por_termino(lexico, t), textos, args.repeticiones)
+    seg_unico, conteos = _medir(lexico.contar, textos, args.repeticiones)
+
+    resultado = {
+        'textos': len(textos),
+        'origen': origen,
+        'terminos': len(lexico),
+        'compilacion_ms': round(compilacion * 1000, 2),
+        'por_termino': {
+            'segundos': round(seg_ref, 4),
+            'textos_por_segundo': round(len(textos) / seg_ref, 1) if seg_ref else 0.0
+        },
+        'patron_unico': {
+            'segundos': round(seg_unico, 4),
+            'textos_por_segundo': round(len(textos) / seg_unico, 1) if seg_unico else 0.0
+        },
+        'aceleracion': round(seg_ref / seg_unico, 2) if seg_unico else 0.0,
+        'coincide_con_referencia': conteos == referencia
+    }
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    print(texto)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(texto + "\n")
+
+
+if __name__ == "__main__":
+    main()
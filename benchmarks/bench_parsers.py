@@ -0,0 +1,144 @@
+# ================================================================================
+# benchmarks/bench_parsers.py - PÁGINAS/SEGUNDO POR BACKEND DE PARSEO
+# ================================================================================
+#
+# Compara html.parser vs lxml, con y sin parseo parcial (SoupStrainer), sobre
+# las respuestas grabadas con `python -m benchmarks.bench_scraper --grabar`.
+# También mide el throughput del pool de procesos y verifica que cada
+# combinación extrae exactamente lo mismo que la referencia (html.parser completo).
+# Los artículos se miden también con el selector aprendido (selector_cache.py).
+#
+# Uso (desde la raíz del proyecto):
+#   python -m benchmarks.bench_parsers --repeticiones 3 --procesos 4
+#
+# ================================================================================
+
+import re
+import json
+import time
+import base64
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from http_fixtures import ArchivoFixtures
+from parsing import BACKENDS, backend_disponible, parsear_listado, extraer_cuerpo, extraer_cuerpo_con_selector
+
+PATRON_LISTADO = re.compile(r'^https?://[^/]+/[^/]+(/\d+)?/?$')
+
+
+def _clasificar(archivo: ArchivoFixtures):
+    """Separa las respuestas 200 grabadas en listados y artículos"""
+    listados, articulos = [], []
+    for url, registro in archivo.respuestas.items():
+        if registro['status'] != 200:
+            continue
+        cuerpo = base64.b64decode(registro['body'])
+        (listados if PATRON_LISTADO.match(url) else articulos).append(cuerpo)
+    return listados, articulos
+
+
+def _parsear_todo(listados, articulos, backend, parcial):
+    resultados = []
+    for cuerpo in listados:
+        resultados.append(parsear_listado(cuerpo, None, backend, parcial))
+    for cuerpo in articulos:
+        resultados.append(extraer_cuerpo(cuerpo, 'utf-8', backend, parcial))
+    return resultados
+
+
+def _medir(listados, articulos, backend, parcial, repeticiones):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultados = _parsear_todo(listados, articulos, backend, parcial)
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor, resultados
+
+
+def _medir_aprendido(articulos, selectores, backend, parcial, repeticiones):
+    """Artículos/s cuando cada uno llega con su selector ya aprendido"""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        textos = [extraer_cuerpo_con_selector(c, 'utf-8', s, backend, parcial)[0]
+                  for c, s in zip(articulos, selectores)]
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor, textos
+
+
+def _medir_pool(articulos, backend, parcial, procesos):
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        # Calentamiento: arrancar los procesos e importar bs4/lxml
+        list(pool.map(extraer_cuerpo, articulos[:procesos], ['utf-8'] * procesos,
+                      [backend] * procesos, [parcial] * procesos))
+        inicio = time.perf_counter()
+        n = len(articulos)
+        list(pool.map(extraer_cuerpo, articulos, ['utf-8'] * n, [backend] * n, [parcial] * n,
+                      chunksize=max(n // (procesos * 4), 1)))
+        return time.perf_counter() - inicio
+
+
+def main():
+    import config
+
+    parser = argparse.ArgumentParser(description="Benchmark de backends de parseo")
+    parser.add_argument('--archivo', default=config.HTTP_FIXTURES_ARCHIVO)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--procesos', type=int, default=max(config.PARSEO_PROCESOS, 1))
+    parser.add_argument('--salida', help="guardar el resultado en este archivo JSON")
+    args = parser.parse_args()
+
+    archivo = ArchivoFixtures(args.archivo).cargar()
+    listados, articulos = _clasificar(archivo)
+    total = len(listados) + len(articulos)
+    print(f"📼 {len(listados)} listados y {len(articulos)} artículos grabados")
+
+    _, referencia = _medir(listados, articulos, 'html.parser', False, 1)
+    selectores = [extraer_cuerpo_con_selector(c, 'utf-8', None, 'html.parser', False)[1] for c in articulos]
+
+    combinaciones = []
+    for backend in BACKENDS:
+        if backend_disponible(backend) != backend:
+            print(f"⚠️ Backend {backend} no instalado, se omite")
+            continue
+        for parcial in (False, True):
+            segundos, resultados = _medir(listados, articulos, backend, parcial, args.repeticiones)
+            seg_aprendido, textos = _medir_aprendido(articulos, selectores, backend, parcial, args.repeticiones)
+            combinaciones.append({
+                'backend': backend,
+                'parcial': parcial,
+                'segundos': round(segundos, 4),
+                'paginas_por_segundo': round(total / segundos, 1) if segundos else 0.0,
+                'articulos_por_segundo_aprendido': round(len(articulos) / seg_aprendido, 1) if seg_aprendido else 0.0,
+                'coincide_con_referencia': resultados == referencia and textos == referencia[len(listados):]
+            })
+            print(f"   {backend:12} parcial={str(parcial):5} → "
+                  f"{combinaciones[-1]['paginas_por_segundo']:8.1f} páginas/s, "
+                  f"{combinaciones[-1]['articulos_por_segundo_aprendido']:8.1f} artículos/s con selector aprendido")
+
+    resultado = {
+        'paginas': total,
+        'combinaciones': combinaciones
+    }
+
+    if articulos and combinaciones:
+        mejor = max(combinaciones, key=lambda c: c['paginas_por_segundo'])
+        segundos = _medir_pool(articulos, mejor['backend'], mejor['parcial'], args.procesos)
+        resultado['pool_procesos'] = {
+            'backend': mejor['backend'],
+            'parcial': mejor['parcial'],
+            'procesos': args.procesos,
+            'articulos_por_segundo': round(len(articulos) / segundos, 1) if segundos else 0.0
+        }
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    print(texto)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(texto + "\n")
+
+
+if __name__ == "__main__":
+    main()
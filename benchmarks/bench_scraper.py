@@ -0,0 +1,98 @@
+# ================================================================================
+# benchmarks/bench_scraper.py - BENCHMARK DEL SCRAPER COMPLETO SIN RED
+# ================================================================================
+#
+# Uso (desde la raíz del proyecto):
+#
+#   # 1. Grabar una vez las respuestas reales de listados y artículos
+#   python -m benchmarks.bench_scraper --grabar
+#
+#   # 2. Medir el crawl completo offline (parseo, extracción, progreso)
+#   python -m benchmarks.bench_scraper --repeticiones 3 --latencia-ms 80 --jitter-ms 40
+#   python -m benchmarks.bench_scraper --tasa-error 0.05 --salida bench_output.json
+#
+# ================================================================================
+
+import argparse
+import json
+import statistics
+import time
+
+
+def main():
+    import config
+
+    parser = argparse.ArgumentParser(description="Benchmark offline del scraper")
+    parser.add_argument('--archivo', default=config.HTTP_FIXTURES_ARCHIVO,
+                        help="archivo de fixtures (.jsonl.gz)")
+    parser.add_argument('--grabar', action='store_true',
+                        help="hacer un crawl real y grabar las respuestas")
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--latencia-ms', type=float, default=config.HTTP_FIXTURES_LATENCIA_MS)
+    parser.add_argument('--jitter-ms', type=float, default=config.HTTP_FIXTURES_JITTER_MS)
+    parser.add_argument('--tasa-error', type=float, default=config.HTTP_FIXTURES_TASA_ERROR)
+    parser.add_argument('--salida', help="guardar el resultado en este archivo JSON")
+    args = parser.parse_args()
+
+    # La configuración se fija antes de importar el scraper (SESSION se crea al importar)
+    config.HTTP_FIXTURES_MODO = "grabar" if args.grabar else "reproducir"
+    config.HTTP_FIXTURES_ARCHIVO = args.archivo
+    config.HTTP_FIXTURES_LATENCIA_MS = args.latencia_ms
+    config.HTTP_FIXTURES_JITTER_MS = args.jitter_ms
+    config.HTTP_FIXTURES_TASA_ERROR = args.tasa_error
+
+    # La caché HTTP devolvería 304 (nada que grabar) y falsearía la medición
+    config.HTTP_CACHE_ACTIVO = False
+    if not args.grabar:
+        # Offline no hay servidor que cuidar: el limitador no debe dominar la medición
+        config.SCRAPER_TASA_POR_HOST = 1e6
+        config.SCRAPER_RAFAGA_POR_HOST = 10 ** 6
+
+    import scraper
+
+    repeticiones = 1 if args.grabar else max(args.repeticiones, 1)
+    corridas = []
+    for i in range(repeticiones):
+        config.DATA_STORE['titulares'] = []
+        config.DATA_STORE['progress'] = 0
+
+        inicio = time.perf_counter()
+        noticias = scraper.extraer_todas_las_noticias()
+        duracion = time.perf_counter() - inicio
+
+        corridas.append({
+            'segundos': round(duracion, 3),
+            'noticias': len(noticias),
+            'noticias_por_segundo': round(len(noticias) / duracion, 1) if duracion else 0.0,
+            'progreso_final': config.DATA_STORE.get('progress', 0)
+        })
+
+    if args.grabar:
+        # El archivo se escribe al salir (atexit registrado por instalar_fixtures)
+        return
+
+    adaptador = scraper.SESSION.get_adapter("https://")
+    tiempos = [c['segundos'] for c in corridas]
+    resultado = {
+        'archivo': args.archivo,
+        'latencia_ms': args.latencia_ms,
+        'jitter_ms': args.jitter_ms,
+        'tasa_error': args.tasa_error,
+        'corridas': corridas,
+        'mediana_segundos': round(statistics.median(tiempos), 3),
+        'mejor_segundos': min(tiempos),
+        'respuestas_servidas': adaptador.servidas,
+        'errores_inyectados': adaptador.errores_inyectados,
+        'urls_sin_fixture': adaptador.no_encontradas,
+        'scraper': scraper.estadisticas_scraper()
+    }
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    print(texto)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(texto + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+# ================================================================================
+# benchmarks/bench_sentimiento.py - BENCHMARK OFFLINE DEL ANÁLISIS DE SENTIMIENTOS
+# ================================================================================
+#
+# Mide, sobre el corpus de ejemplo (benchmarks/corpus_noticias.json):
+#
+#   - camino de palabras clave (lexicon.py): noticias/s y latencia p50/p99
+#   - camino BERT por backend (fp32, int8, onnx): de a una noticia y por lotes
+#   - que por lotes dé lo mismo que de a una (etiqueta, nivel y descripción)
+#   - camino híbrido (palabras clave y, si no alcanzan, BERT) por backend
+#   - tasa de noticias que resuelven las palabras clave (sin llegar a BERT)
+#   - concordancia de etiquetas entre backends (contra fp32)
+#
+# Corre sin red: los modelos tienen que estar ya descargados en la caché de
+# Hugging Face (--permitir-descarga la primera vez). La salida es un JSON
+# con la versión del modelo, del léxico y del corpus para comparar entre releases.
+#
+# Uso (desde la raíz del proyecto):
+#   python -m benchmarks.bench_sentimiento --repeticiones 3 --salida bench_sentimiento.json
+#   python -m benchmarks.bench_sentimiento --backends fp32 int8 --tam-lote 16
+#
+# ================================================================================
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
+import statistics
+
+from benchmarks.concordancia_backends import CORPUS, cargar_corpus, memoria_mb, tamano_modelo_mb, _estrellas
+
+
+def _latencias(funcion, textos, repeticiones):
+    """Latencia (ms) de cada llamada y resultados de la última pasada"""
+    latencias = []
+    for _ in range(repeticiones):
+        resultados = []
+        for texto in textos:
+            inicio = time.perf_counter()
+            resultados.append(funcion(texto))
+            latencias.append((time.perf_counter() - inicio) * 1000)
+    return latencias, resultados
+
+
+def _resumen(latencias):
+    if not latencias:
+        return {'noticias': 0}
+    ordenadas = sorted(latencias)
+
+    def percentil(p):
+        return ordenadas[min(int(round(p / 100 * (len(ordenadas) - 1))), len(ordenadas) - 1)]
+
+    total_s = sum(latencias) / 1000
+    return {
+        'noticias': len(latencias),
+        'noticias_por_segundo': round(len(latencias) / total_s, 1) if total_s else 0.0,
+        'latencia_ms_p50': round(percentil(50), 3),
+        'latencia_ms_p99': round(percentil(99), 3),
+        'latencia_ms_media': round(statistics.fmean(latencias), 3)
+    }
+
+
+def _por_lotes(modelo, textos, tam_lote, repeticiones):
+    """
+    Noticias/s pasando por el modelo en lotes ordenados por largo en tokens
+    (como _bert_por_lotes) → (métricas, resultados en el orden de `textos`)
+    """
+    from sentiment import _texto_bert, _longitudes_tokens, _sentimiento_bert
+
+    entradas = [_texto_bert(t) for t in textos]
+    longitudes = _longitudes_tokens(modelo, entradas)
+    orden = sorted(range(len(entradas)), key=lambda i: longitudes[i])
+    resultados = [None] * len(entradas)
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for i in range(0, len(orden), tam_lote):
+            posiciones = orden[i:i + tam_lote]
+            salidas = modelo([entradas[p] for p in posiciones], batch_size=len(posiciones))
+            for posicion, salida in zip(posiciones, salidas):
+                resultados[posicion] = salida
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return {
+        'tam_lote': tam_lote,
+        'noticias_por_segundo': round(len(entradas) / mejor, 1) if mejor else 0.0
+    }, [_sentimiento_bert(r) for r in resultados]
+
+
+def _diferencias_lotes(individuales, por_lotes, maximo=10):
+    """
+    Compara etiqueta, nivel y descripción de cada noticia entre el camino de
+    a una y el de por lotes (el padding puede mover el score y con él el
+    nivel o el redondeo de la descripción).
+    """
+    campos = {'sentimiento': 0, 'nivel': 2, 'descripcion': 3}
+    distintas = [i for i, (a, b) in enumerate(zip(individuales, por_lotes))
+                 if any(a[c] != b[c] for c in campos.values())]
+    total = len(individuales)
+    return {
+        **{nombre: round(sum(1 for a, b in zip(individuales, por_lotes) if a[c] == b[c]) / total, 3)
+           for nombre, c in campos.items()},
+        'distintas': len(distintas),
+        'ejemplos': [{'indice': i,
+                      'individual': [individuales[i][c] for c in campos.values()],
+                      'por_lotes': [por_lotes[i][c] for c in campos.values()]}
+                     for i in distintas[:maximo]]
+    }
+
+
+def medir_palabras(textos, repeticiones):
+    from sentiment import analizar_por_palabras
+
+    latencias, resultados = _latencias(analizar_por_palabras, textos, repeticiones)
+    resueltas = [r for r in resultados if r is not None]
+    return {
+        **_resumen(latencias),
+        'tasa_resueltas': round(len(resueltas) / len(textos), 3) if textos else 0.0,
+        'resueltas_negativas': sum(1 for r in resueltas if r[0] == 'Negativo'),
+        'resueltas_positivas': sum(1 for r in resueltas if r[0] == 'Positivo')
+    }
+
+
+def medir_backend(backend, textos, repeticiones, tam_lote):
+    """BERT solo, por lotes e híbrido para un backend → (métricas, etiquetas BERT)"""
+    from sentiment import crear_pipeline_sentimiento, analizar_con_modelo, analizar_por_palabras
+
+    memoria_antes = memoria_mb()
+    inicio = time.perf_counter()
+    modelo = crear_pipeline_sentimiento(backend)
+    carga = time.perf_counter() - inicio
+    memoria_modelo = memoria_mb() - memoria_antes
+    analizar_con_modelo(modelo, textos[0])  # calentamiento
+
+    latencias_bert, etiquetas = _latencias(lambda t: analizar_con_modelo(modelo, t), textos, repeticiones)
+
+    # Híbrido (sin caché): palabras clave y BERT solo para las que no resolvieron
+    def hibrido(texto):
+        return analizar_por_palabras(texto) or analizar_con_modelo(modelo, texto)
+
+    latencias_hibrido, _ = _latencias(hibrido, textos, repeticiones)
+    por_lotes, etiquetas_lotes = _por_lotes(modelo, textos, tam_lote, repeticiones)
+
+    return {
+        'backend': backend,
+        'carga_s': round(carga, 2),
+        'tamano_modelo_mb': round(tamano_modelo_mb(modelo), 1),
+        'memoria_proceso_mb': round(memoria_modelo, 1),
+        'bert': _resumen(latencias_bert),
+        'bert_por_lotes': {**por_lotes, 'concordancia_individual': _diferencias_lotes(etiquetas, etiquetas_lotes)},
+        'hibrido': _resumen(latencias_hibrido)
+    }, etiquetas
+
+
+def _concordancia(etiquetas, referencia):
+    iguales = sum(1 for a, b in zip(etiquetas, referencia) if a[0] == b[0])
+    estrellas = sum(1 for a, b in zip(etiquetas, referencia) if _estrellas(a) == _estrellas(b))
+    return {
+        'sentimiento': round(iguales / len(referencia), 3),
+        'estrellas': round(estrellas / len(referencia), 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline del análisis de sentimientos")
+    parser.add_argument('--corpus', default=CORPUS)
+    parser.add_argument('--backends', nargs='+', default=['fp32', 'int8', 'onnx'])
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--tam-lote', type=int, default=None, help="por defecto SENTIMIENTO_TAM_LOTE")
+    parser.add_argument('--solo-palabras', action='store_true', help="no cargar ningún modelo")
+    parser.add_argument('--permitir-descarga', action='store_true',
+                        help="dejar que transformers descargue el modelo si no está en caché")
+    parser.add_argument('--salida', help="guardar el resultado en este archivo JSON")
+    args = parser.parse_args()
+
+    # Sin red: transformers/huggingface_hub solo leen la caché local
+    if not args.permitir_descarga:
+        os.environ.setdefault('HF_HUB_OFFLINE', '1')
+        os.environ.setdefault('TRANSFORMERS_OFFLINE', '1')
+
+    import config
+    from lexicon import obtener_lexico
+    from sentiment import backend_sentimiento_disponible
+
+    with open(args.corpus, 'rb') as f:
+        huella_corpus = hashlib.sha1(f.read()).hexdigest()[:12]
+    textos = cargar_corpus(args.corpus)
+    tam_lote = args.tam_lote or config.SENTIMIENTO_TAM_LOTE
+    print(f"📚 {len(textos)} noticias de {args.corpus}")
+
+    palabras = medir_palabras(textos, args.repeticiones)
+    print(f"   palabras clave → {palabras['noticias_por_segundo']} noticias/s, "
+          f"resuelven {palabras['tasa_resueltas']:.0%} sin BERT")
+
+    backends, etiquetas = [], {}
+    if not args.solo_palabras:
+        for backend in args.backends:
+            if backend_sentimiento_disponible(backend) != backend:
+                print(f"⚠️ Backend {backend} no disponible, se omite")
+                continue
+            try:
+                metricas, etiquetas[backend] = medir_backend(backend, textos, args.repeticiones, tam_lote)
+            except (OSError, ImportError) as e:
+                # Offline y sin el modelo en caché, o sin transformers/torch
+                print(f"❌ No se pudo cargar el modelo para {backend}: {e}")
+                continue
+            backends.append(metricas)
+            print(f"   {backend:5} → BERT {metricas['bert']['noticias_por_segundo']} noticias/s "
+                  f"(p50 {metricas['bert']['latencia_ms_p50']} ms, p99 {metricas['bert']['latencia_ms_p99']} ms), "
+                  f"por lotes {metricas['bert_por_lotes']['noticias_por_segundo']} noticias/s, "
+                  f"híbrido {metricas['hibrido']['noticias_por_segundo']} noticias/s")
+            diferencias = metricas['bert_por_lotes']['concordancia_individual']
+            if diferencias['distintas']:
+                print(f"   ⚠️ {backend}: {diferencias['distintas']} noticias dan distinto por lotes que de a una")
+                for ejemplo in diferencias['ejemplos']:
+                    print(f"      #{ejemplo['indice']}: {ejemplo['individual']} → {ejemplo['por_lotes']}")
+
+    referencia = etiquetas.get('fp32')
+    if referencia is not None:
+        for metricas in backends:
+            metricas['concordancia_fp32'] = _concordancia(etiquetas[metricas['backend']], referencia)
+
+    resultado = {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'entorno': {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count()
+        },
+        'modelo': config.SENTIMIENTO_MODELO,
+        'lexico': obtener_lexico().version,
+        'corpus': {'archivo': os.path.basename(args.corpus), 'sha1': huella_corpus, 'noticias': len(textos)},
+        'repeticiones': args.repeticiones,
+        'palabras_clave': palabras,
+        'backends': backends
+    }
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    print(texto)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(texto + "\n")
+    if not args.solo_palabras and not backends:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# ================================================================================
+# benchmarks/concordancia_backends.py - CONCORDANCIA DE BACKENDS DE SENTIMIENTO
+# ================================================================================
+#
+# Pasa el corpus de ejemplo (benchmarks/corpus_noticias.json) por BERT con
+# cada backend de sentiment.py (fp32, int8, onnx) y compara las etiquetas con
+# las de fp32: mismas estrellas y mismo sentimiento (el mapeo estrellas →
+# sentimiento es el de analizar_sentimiento_noticia). Informa también tamaño
+# del modelo, memoria del proceso y latencia por noticia. Sale con código 1 si
+# algún backend queda por debajo de --umbral de concordancia de sentimiento.
+#
+# Uso (desde la raíz del proyecto):
+#   python -m benchmarks.concordancia_backends --backends int8 onnx --umbral 0.95
+#
+# ================================================================================
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+CORPUS = os.path.join(os.path.dirname(__file__), "corpus_noticias.json")
+
+
+def cargar_corpus(ruta: str = CORPUS):
+    """Textos (título + contenido, como en enriquecer_noticias_con_sentimientos) del corpus"""
+    with open(ruta, 'r', encoding='utf-8') as f:
+        noticias = json.load(f)['noticias']
+    return [f"{n.get('titulo', '')} {n.get('contenido', '')}" for n in noticias]
+
+
+def memoria_mb() -> float:
+    """RSS actual del proceso (Linux; 0 si no se puede leer)"""
+    try:
+        with open('/proc/self/status') as f:
+            for linea in f:
+                if linea.startswith('VmRSS:'):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def tamano_modelo_mb(modelo) -> float:
+    """Tamaño serializado de los pesos (state_dict de torch o el .onnx exportado)"""
+    red = modelo.model
+    ruta = getattr(red, 'model_path', None)
+    if ruta and os.path.exists(str(ruta)):
+        return os.path.getsize(str(ruta)) / 1e6
+    import torch
+    buffer = io.BytesIO()
+    torch.save(red.state_dict(), buffer)
+    return buffer.tell() / 1e6
+
+
+def medir_backend(backend: str, textos):
+    """Carga el backend y etiqueta cada texto de a uno → (métricas, resultados)"""
+    from sentiment import crear_pipeline_sentimiento, analizar_con_modelo
+
+    memoria_antes = memoria_mb()
+    inicio = time.perf_counter()
+    modelo = crear_pipeline_sentimiento(backend)
+    carga = time.perf_counter() - inicio
+    memoria_modelo = memoria_mb() - memoria_antes
+
+    analizar_con_modelo(modelo, textos[0])  # calentamiento
+    resultados, latencias = [], []
+    for texto in textos:
+        inicio = time.perf_counter()
+        resultados.append(analizar_con_modelo(modelo, texto))
+        latencias.append((time.perf_counter() - inicio) * 1000)
+
+    metricas = {
+        'backend': backend,
+        'carga_s': round(carga, 2),
+        'tamano_modelo_mb': round(tamano_modelo_mb(modelo), 1),
+        'memoria_proceso_mb': round(memoria_modelo, 1),
+        'latencia_ms_p50': round(statistics.median(latencias), 2),
+        'latencia_ms_media': round(statistics.fmean(latencias), 2)
+    }
+    return metricas, resultados
+
+
+def _estrellas(resultado) -> str:
+    # La descripción de BERT es "BERT: N★ (confianza: x)"
+    return resultado[3].split('★')[0]
+
+
+def main():
+    from sentiment import BACKENDS_SENTIMIENTO, backend_sentimiento_disponible
+
+    parser = argparse.ArgumentParser(description="Concordancia de backends de sentimiento contra fp32")
+    parser.add_argument('--corpus', default=CORPUS)
+    parser.add_argument('--backends', nargs='+', default=[b for b in BACKENDS_SENTIMIENTO if b != 'fp32'])
+    parser.add_argument('--umbral', type=float, default=0.95,
+                        help="concordancia mínima de sentimiento (Positivo/Neutral/Negativo)")
+    parser.add_argument('--salida', help="guardar el resultado en este archivo JSON")
+    args = parser.parse_args()
+
+    textos = cargar_corpus(args.corpus)
+    print(f"📚 {len(textos)} noticias de {args.corpus}")
+
+    referencia_metricas, referencia = medir_backend('fp32', textos)
+    backends = [referencia_metricas]
+    aprobado = True
+
+    for backend in args.backends:
+        if backend_sentimiento_disponible(backend) != backend:
+            print(f"⚠️ Backend {backend} no disponible, se omite")
+            continue
+        metricas, resultados = medir_backend(backend, textos)
+        iguales = sum(1 for a, b in zip(resultados, referencia) if a[0] == b[0])
+        estrellas = sum(1 for a, b in zip(resultados, referencia) if _estrellas(a) == _estrellas(b))
+        metricas['concordancia_sentimiento'] = round(iguales / len(textos), 3)
+        metricas['concordancia_estrellas'] = round(estrellas / len(textos), 3)
+        metricas['diferencias'] = [
+            {'texto': texto[:80], 'fp32': b[3], backend: a[3]}
+            for texto, a, b in zip(textos, resultados, referencia) if a[0] != b[0]
+        ]
+        aprobado = aprobado and metricas['concordancia_sentimiento'] >= args.umbral
+        backends.append(metricas)
+        print(f"   {backend:5} → {metricas['concordancia_sentimiento']:.1%} de concordancia, "
+              f"p50 {metricas['latencia_ms_p50']} ms (fp32: {referencia_metricas['latencia_ms_p50']} ms), "
+              f"{metricas['tamano_modelo_mb']} MB (fp32: {referencia_metricas['tamano_modelo_mb']} MB)")
+
+    resultado = {'noticias': len(textos), 'umbral': args.umbral, 'aprobado': aprobado, 'backends': backends}
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    print(texto)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(texto + "\n")
+    sys.exit(0 if aprobado else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,26 @@
 # brain.py - MOTOR DE IA (EMBEDDINGS + GROQ) - FORMATO MEJORADO
 # ================================================================================
 
+import time
+import threading
 import numpy as np
 from typing import Dict, List
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from groq import Groq
+# sentence_transformers, sklearn y groq se importan al usarlos: importar este
+# módulo (y chatbot) no debe costar la carga de torch
 from config import GROQ_API_KEY, EMBEDDING_MODEL, DATA_STORE
 
 
 class SemanticSearch:
-    """Motor de búsqueda semántica"""
+    """
+    Motor de búsqueda semántica.
+
+    El índice crece en el lugar mientras dura la ingesta: las filas nuevas se
+    escriben en un buffer con capacidad sobrante y recién después se publica
+    el nuevo tamaño. Cada búsqueda toma una "foto" (matriz[:n], documentos[:n])
+    bajo el lock, así que nunca ve un documento sin su embedding ni al revés.
+    Reemplazar un índice ya publicado (index_documents) arma uno nuevo
+    aparte y lo intercambia al final: mientras tanto se busca en el anterior.
+    """
     
     _instance = None
     _model = None
@@ -24,26 +34,187 @@ class SemanticSearch:
     def __init__(self):
         if SemanticSearch._model is None:
             print(f"🔄 Cargando modelo de embeddings...")
+            from sentence_transformers import SentenceTransformer
             SemanticSearch._model = SentenceTransformer(EMBEDDING_MODEL)
             print("✅ Modelo cargado\n")
         
         self.model = SemanticSearch._model
-        self.embeddings = None
-        self.documents = []
-    
-    def index_documents(self, documents: List[Dict]):
-        """Genera embeddings para las noticias"""
-        self.documents = documents
+        # Singleton: el índice publicado se conserva aunque se vuelva a instanciar
+        if not hasattr(self, '_lock'):
+            self._lock = threading.Lock()
+            self._matriz = None   # buffer de embeddings (capacidad >= _n filas)
+            self._documentos = []
+            self._n = 0
+            # Índice que se arma mientras se sigue buscando en el publicado (ver index_documents)
+            self._reconstruccion = None
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def embeddings(self):
+        return self._foto()[0]
+
+    @property
+    def documents(self):
+        return self._foto()[1]
+
+    def _foto(self):
+        """Vista consistente del índice publicado"""
+        with self._lock:
+            if self._n == 0:
+                return None, []
+            return self._matriz[:self._n], self._documentos[:self._n]
+
+    def _codificar(self, documents: List[Dict], verbose: bool, stats: Dict = None):
+        """
+        Embeddings de las noticias: los textos ya vistos salen de la caché en
+        disco (embedding_cache.py) y solo se codifican los que faltan.
+        En `stats` se acumulan hits, codificados y segundos de encode.
+        """
+        from embedding_cache import obtener_cache_embeddings
+
         # Revertimos a texto original (con mayúsculas) para mejor calidad de embeddings
         texts = [f"{doc['titulo']}. {doc.get('resumen', '')}" for doc in documents]
-        
-        print(f"📊 Generando embeddings para {len(texts)} noticias...")
-        self.embeddings = self.model.encode(texts, show_progress_bar=True)
+        stats = stats if stats is not None else {}
+        cache = obtener_cache_embeddings()
+        if cache is None:
+            inicio = time.perf_counter()
+            vectores = np.asarray(self.model.encode(texts, show_progress_bar=verbose), dtype=np.float32)
+            stats['codificados'] = stats.get('codificados', 0) + len(texts)
+            stats['segundos'] = stats.get('segundos', 0.0) + time.perf_counter() - inicio
+            return vectores
+
+        claves = [cache.clave(t) for t in texts]
+        guardados = cache.buscar(claves, EMBEDDING_MODEL)
+        # Textos repetidos dentro del lote se codifican una vez
+        faltantes = list(dict.fromkeys(c for c in claves if c not in guardados))
+        if faltantes:
+            por_clave = dict(zip(claves, texts))
+            inicio = time.perf_counter()
+            nuevos = np.asarray(self.model.encode([por_clave[c] for c in faltantes],
+                                                  show_progress_bar=verbose), dtype=np.float32)
+            duracion = time.perf_counter() - inicio
+            cache.guardar(zip(faltantes, nuevos), EMBEDDING_MODEL)
+            cache.registrar_costo(EMBEDDING_MODEL, len(faltantes), duracion)
+            guardados.update(zip(faltantes, nuevos))
+            stats['segundos'] = stats.get('segundos', 0.0) + duracion
+        stats['hits'] = stats.get('hits', 0) + len(claves) - len(faltantes)
+        stats['codificados'] = stats.get('codificados', 0) + len(faltantes)
+        return np.stack([guardados[c] for c in claves])
+
+    def reportar_cache(self, stats: Dict):
+        """Una línea por ingesta: aciertos de la caché y tiempo de encode evitado"""
+        from embedding_cache import obtener_cache_embeddings
+
+        cache = obtener_cache_embeddings()
+        hits, total = stats.get('hits', 0), stats.get('hits', 0) + stats.get('codificados', 0)
+        if cache is None or not total:
+            return
+        costo = cache.costo_por_texto(EMBEDDING_MODEL)
+        ahorro = f", ~{hits * costo:.1f} s de encode ahorrados" if costo is not None and hits else ""
+        print(f"💾 Embeddings: {hits}/{total} desde la caché ({hits / total:.0%}), "
+              f"{stats.get('codificados', 0)} codificados en {stats.get('segundos', 0.0):.1f} s{ahorro}")
+
+    @staticmethod
+    def _agregar_filas(matriz, documentos: List[Dict], n: int, documents: List[Dict], nuevos: np.ndarray):
+        """Filas nuevas al final de un buffer (duplicando la capacidad si hace falta) → (matriz, documentos, n)"""
+        total = n + len(documents)
+        if matriz is None or total > len(matriz):
+            capacidad = max(total, 2 * (len(matriz) if matriz is not None else 0), 64)
+            ampliada = np.empty((capacidad, nuevos.shape[1]), dtype=nuevos.dtype)
+            if n:
+                ampliada[:n] = matriz[:n]
+            # Las fotos previas siguen apuntando al buffer viejo, que no se modifica
+            matriz = ampliada
+        matriz[n:total] = nuevos
+        return matriz, documentos[:n] + list(documents), total
+
+    def _publicar(self, documents: List[Dict], nuevos: np.ndarray):
+        """
+        Agrega filas y publica el tamaño; durante una reconstrucción van al
+        buffer nuevo, que no se ve hasta publicar_reconstruccion().
+        """
+        with self._lock:
+            if self._reconstruccion is not None:
+                r = self._reconstruccion
+                r['matriz'], r['documentos'], r['n'] = self._agregar_filas(
+                    r['matriz'], r['documentos'], r['n'], documents, nuevos)
+            else:
+                self._matriz, self._documentos, self._n = self._agregar_filas(
+                    self._matriz, self._documentos, self._n, documents, nuevos)
+
+    def vaciar(self):
+        """Descarta el índice publicado (las búsquedas en curso conservan su foto)"""
+        with self._lock:
+            self._matriz = None
+            self._documentos = []
+            self._n = 0
+            self._reconstruccion = None
+
+    def publicar_reconstruccion(self):
+        """Reemplaza el índice publicado por el reconstruido (no hace nada si no hay reconstrucción)"""
+        with self._lock:
+            r = self._reconstruccion
+            if r is None:
+                return
+            self._matriz, self._documentos, self._n = r['matriz'], r['documentos'], r['n']
+            self._reconstruccion = None
+
+    def index_documents(self, documents: List[Dict], tam_lote: int = 256, stats: Dict = None,
+                        publicar: bool = True):
+        """
+        Genera embeddings para las noticias, reemplazando el índice.
+
+        Con el índice vacío (arranque) se publica por lotes, de modo que las
+        primeras noticias ya se pueden buscar mientras se calculan las
+        siguientes. Si ya hay un índice publicado, se sigue buscando en él y
+        el nuevo se arma aparte: se publica al terminar o, con
+        `publicar=False`, cuando quien llama invoque publicar_reconstruccion()
+        (p. ej. la ingesta, después de agregar las noticias que siguen
+        llegando). Si se pasa `stats`, los números de la caché se acumulan
+        ahí y los informa quien llama.
+        """
+        print(f"📊 Generando embeddings para {len(documents)} noticias...")
+        with self._lock:
+            if self._n:
+                self._reconstruccion = {'matriz': None, 'documentos': [], 'n': 0}
+            else:
+                self._matriz, self._documentos, self._reconstruccion = None, [], None
+        propias = stats is None
+        stats = {} if propias else stats
+        for i in range(0, len(documents), tam_lote):
+            lote = documents[i:i + tam_lote]
+            self._publicar(lote, self._codificar(lote, verbose=False, stats=stats))
+        if publicar:
+            self.publicar_reconstruccion()
+        if propias:
+            self.reportar_cache(stats)
         print(f"✅ Embeddings listos\n")
+
+    def add_documents(self, documents: List[Dict], verbose: bool = True, stats: Dict = None):
+        """
+        Agrega noticias nuevas al índice sin recalcular las existentes. Con
+        `stats` (p. ej. una ingesta por micro-lotes) los números de la caché
+        se acumulan ahí en lugar de informarse en cada llamada.
+        """
+        if not documents:
+            return
+
+        if verbose:
+            print(f"📊 Generando embeddings para {len(documents)} noticias nuevas...")
+        # El encode (lo costoso) va fuera del lock: las búsquedas no esperan
+        propias = stats is None
+        stats = {} if propias else stats
+        self._publicar(documents, self._codificar(documents, verbose, stats))
+        if verbose and propias:
+            self.reportar_cache(stats)
+            print(f"✅ Embeddings listos ({len(self)} en el índice)\n")
     
     def search(self, query: str, top_k: int = 3) -> List[Dict]:
         """Busca noticias similares (Híbrido: Semántico + Keyword Boosting)"""
-        if self.embeddings is None or len(self.documents) == 0:
+        embeddings, documents = self._foto()
+        if embeddings is None:
             return []
         
         # 1. Búsqueda Semántica (Multi-Query)
@@ -51,14 +222,16 @@ class SemanticSearch:
         if query.islower():
             queries.append(query.title()) # 'kast' -> 'Kast'
         
+        from sklearn.metrics.pairwise import cosine_similarity
+
         query_embeddings = self.model.encode(queries)
-        all_similarities = cosine_similarity(query_embeddings, self.embeddings)
+        all_similarities = cosine_similarity(query_embeddings, embeddings)
         similarities = np.max(all_similarities, axis=0)
         
         # 2. Keyword Boosting (Crucial para nombres propios cortos)
         # Si la palabra exacta está en el título/resumen, aumentamos su score
         query_lower = query.lower()
-        for idx, doc in enumerate(self.documents):
+        for idx, doc in enumerate(documents):
             content = (doc['titulo'] + " " + doc.get('resumen', '')).lower()
             if query_lower in content:
                 # Boost significativo para asegurar que aparezca
@@ -71,7 +244,7 @@ class SemanticSearch:
         for idx in top_indices:
             if similarities[idx] > 0.12: # Umbral más permisivo gracias al boost
                 results.append({
-                    **self.documents[idx],
+                    **documents[idx],
                     'score': float(similarities[idx])
                 })
         return results
@@ -82,6 +255,7 @@ class GroqBrain:
     
     def __init__(self):
         if GROQ_API_KEY and len(GROQ_API_KEY) > 20 and "PEGA" not in GROQ_API_KEY:
+            from groq import Groq
             self.client = Groq(api_key=GROQ_API_KEY)
             self.enabled = True
             print("✅ Groq AI conectado\n")
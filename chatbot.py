@@ -4,19 +4,18 @@
 
 import threading
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
 from config import DATA_STORE
-from scraper import extraer_todas_las_noticias
-from brain import SemanticSearch, GroqBrain
+from news_index import obtener_indice_noticias
+from pipeline import PipelineIngesta
+from sources import secciones_configuradas, fuente_de_seccion
+from brain import GroqBrain
+from sentiment_index import IndiceSentimientos
 from sentiment import (
-    enriquecer_noticias_con_sentimientos,
     mostrar_estadisticas_sentimientos,
     detectar_consulta_sentimiento,
-    buscar_noticias_positivas,
-    buscar_noticias_negativas,
-    buscar_noticias_neutrales,
     mostrar_resumen_sentimientos,
-    calcular_estadisticas_sentimientos
+    precargar_modelo_sentimiento
 )
 
 
@@ -27,54 +26,56 @@ class NewsChatBot:
         self.search_engine = None
         self.brain = None
         self.noticias = []
+        # Conteos y listas por sentimiento, al día con self.noticias
+        self.sentimientos = IndiceSentimientos()
+        # Corpus que se arma durante una reconstrucción (sin índice persistente)
+        self._corpus_nuevo = None
         self.initialized = False
         self.initializing = False
         self.histories = {} # Memoria de conversación por sesión: {session_id: [msgs]}
         self.user_name = None
+        # Una sola ingesta a la vez (inicial, /api/refresh o re-crawl programado)
+        self._lock_ingesta = threading.Lock()
+        # Callbacks (secciones_rastreadas, nuevas_por_seccion) al terminar cada ingesta
+        self.al_ingerir = []
     
-    def initialize_async(self):
+    def initialize_async(self, secciones: Optional[Dict] = None) -> bool:
         """Inicializa el bot en un thread separado (no bloquea el servidor)"""
-        if self.initializing:
-            return
+        if not self._lock_ingesta.acquire(blocking=False):
+            return False
         
         self.initializing = True
-        thread = threading.Thread(target=self._do_initialize)
+        thread = threading.Thread(target=self._do_initialize, args=(secciones,))
         thread.daemon = True
         thread.start()
+        return True
+
+    def ingestar(self, secciones: Optional[Dict] = None) -> bool:
+        """Ingesta síncrona (para el planificador). False si ya hay otra en curso."""
+        if not self._lock_ingesta.acquire(blocking=False):
+            return False
+        
+        self.initializing = True
+        self._do_initialize(secciones)
+        return True
     
-    def _do_initialize(self):
-        """Proceso de inicialización real"""
+    def _do_initialize(self, secciones: Optional[Dict] = None):
+        """Proceso de inicialización real (libera el lock de ingesta al terminar)"""
+        configuradas = secciones_configuradas()
+        secciones = secciones if secciones is not None else configuradas
         print("\n" + "=" * 60)
-        print("🚀 INICIALIZANDO NEWS CHATBOT (en background)")
+        if len(secciones) == len(configuradas):
+            print("🚀 INICIALIZANDO NEWS CHATBOT (en background)")
+        else:
+            print(f"🚀 ACTUALIZANDO {len(secciones)} SECCIONES (en background)")
         print("=" * 60 + "\n")
         
+        # BERT se carga en background mientras el scraper trae las primeras noticias
+        precargar_modelo_sentimiento()
+        
         try:
-            # 1. Scraping
-            DATA_STORE['titulares'] = [] # Limpiar antes de empezar
-            DATA_STORE['progress'] = 0
-            DATA_STORE['noticias_analizadas'] = 0  # Contador de análisis
-            self.noticias = extraer_todas_las_noticias()
-            
-            # 2. Análisis de sentimientos (NUEVO)
-            if self.noticias:
-                DATA_STORE['current_action'] = "Analizando sentimientos de las noticias..."
-                DATA_STORE['progress'] = 65
-                self.noticias = enriquecer_noticias_con_sentimientos(self.noticias)
-                mostrar_estadisticas_sentimientos(self.noticias)
-                # Actualizar titulares con sentimientos
-                DATA_STORE['titulares'] = self.noticias
-            
-            # 3. Cargar modelos de IA
-            DATA_STORE['current_action'] = "Cargando modelos de IA..."
-            DATA_STORE['progress'] = 78
-            self.search_engine = SemanticSearch()
-            self.brain = GroqBrain()
-            
-            # 4. Indexar noticias
-            if self.noticias:
-                DATA_STORE['current_action'] = f"Generando embeddings para {len(self.noticias)} noticias..."
-                DATA_STORE['progress'] = 90
-                self.search_engine.index_documents(self.noticias)
+            nuevas = self._ingestar(obtener_indice_noticias(), secciones)
+            self._notificar_ingesta(list(secciones), nuevas)
             
             DATA_STORE['current_action'] = "Finalizando..."
             DATA_STORE['progress'] = 100
@@ -89,7 +90,116 @@ class NewsChatBot:
             print(f"❌ Error en inicialización: {e}")
         finally:
             self.initializing = False
+            self._lock_ingesta.release()
+
+    def _notificar_ingesta(self, secciones: List[str], nuevas: List[Dict]):
+        por_seccion = {}
+        for url in secciones:
+            fuente = fuente_de_seccion(url)
+            if fuente is None:
+                continue
+            nombre = fuente.nombre_seccion(url)
+            # Una noticia cuenta en cada sección donde apareció (dedup.fusionar suma a `secciones`)
+            por_seccion[url] = sum(1 for n in nuevas
+                                   if nombre in (n.get('secciones') or [n.get('seccion')])
+                                   and n.get('fuente', fuente.nombre) == fuente.nombre)
+        for callback in self.al_ingerir:
+            try:
+                callback(secciones, por_seccion)
+            except Exception as e:
+                print(f"⚠️ Error en callback de ingesta: {e}")
     
+    def _ingestar(self, indice, secciones: Dict) -> List[Dict]:
+        """
+        Scraping, sentimientos y embeddings en streaming (ver pipeline.py).
+
+        Con índice persistente solo se procesan las noticias nuevas; sin él,
+        el corpus se descarta y se reconstruye desde cero. Devuelve las nuevas.
+        """
+        from config import INDICE_MAX_NOTICIAS
+
+        # Sin índice persistente el corpus se reconstruye; si ya había uno
+        # publicado se sigue respondiendo con él hasta que termina la ingesta
+        self._corpus_nuevo = None
+        if indice is None:
+            if self.search_engine is not None and len(self.search_engine) > 0:
+                self._corpus_nuevo = []
+            else:
+                self.noticias = []
+                self.sentimientos.vaciar()
+        elif not self.noticias:
+            # Primer arranque del proceso: recuperar el corpus persistido
+            self.noticias = indice.cargar(INDICE_MAX_NOTICIAS)
+            self.sentimientos.agregar(self.noticias)
+            print(f"♻️ {len(self.noticias)} noticias recuperadas del índice local")
+
+        # Sin índice persistente (o al arrancar) se regeneran todos los embeddings
+        reindexar = indice is None or self.search_engine is None
+
+        DATA_STORE['titulares'] = list(self.noticias) if indice is not None else []
+        DATA_STORE['progress'] = 0
+        DATA_STORE['noticias_analizadas'] = 0
+
+        # Antes de la ingesta: se responde apenas haya un primer lote indexado
+        if self.brain is None:
+            self.brain = GroqBrain()
+
+        pipeline = PipelineIngesta(indice, al_indexar=self._al_indexar)
+        nuevas = pipeline.ejecutar(
+            secciones=secciones,
+            conocidas=indice.urls() if indice is not None else None,
+            existentes=(self.noticias if indice is not None else []) if reindexar else None,
+            motor_busqueda=None if reindexar else self.search_engine,
+            corpus=self.noticias if indice is not None else []
+        )
+        self.search_engine = pipeline.motor_busqueda
+        if self._corpus_nuevo is not None:
+            # El índice reconstruido ya se publicó: el corpus y sus sentimientos también
+            self.noticias = self._corpus_nuevo
+            self._corpus_nuevo = None
+            self.sentimientos = IndiceSentimientos(self.noticias)
+
+        DATA_STORE['titulares'] = self.noticias
+        if self.noticias:
+            mostrar_estadisticas_sentimientos(self.noticias)
+        return nuevas
+
+    def _al_indexar(self, motor_busqueda, nuevas: List[Dict]):
+        """Publica el motor y las noticias recién indexadas mientras sigue la ingesta"""
+        self.search_engine = motor_busqueda
+        if nuevas and self._corpus_nuevo is not None:
+            # Reconstrucción: se acumulan aparte y se publican al final (_ingestar)
+            self._corpus_nuevo = nuevas + self._corpus_nuevo
+        elif nuevas:
+            from config import INDICE_MAX_NOTICIAS
+
+            # Se reasigna la lista completa: quien esté leyendo conserva la anterior.
+            # Igual que al arrancar, en memoria quedan las INDICE_MAX_NOTICIAS más recientes
+            corpus = nuevas + self.noticias
+            self.noticias = corpus[:INDICE_MAX_NOTICIAS]
+            self.sentimientos.agregar(nuevas)
+            urls_nuevas = {n.get('url') for n in nuevas}
+            self.sentimientos.quitar(n['url'] for n in corpus[INDICE_MAX_NOTICIAS:]
+                                     if n.get('url') and n['url'] not in urls_nuevas)
+
+    @property
+    def listo(self) -> bool:
+        """Puede responder: terminó la ingesta o ya hay noticias indexadas"""
+        if self.initialized:
+            return True
+        return self.brain is not None and self.search_engine is not None and len(self.search_engine) > 0
+
+    def estado_indice(self) -> Dict:
+        """Cuánto del corpus conocido está disponible para las respuestas"""
+        indexadas = len(self.search_engine) if self.search_engine is not None else 0
+        corpus = max(len(DATA_STORE.get('titulares', [])), len(self.noticias), indexadas)
+        return {
+            'searchable': self.listo,
+            'indexed_count': indexadas,
+            'corpus_count': corpus,
+            'coverage': round(indexadas / corpus, 3) if corpus else 0.0
+        }
+
     def _is_follow_up(self, text: str) -> bool:
         """Detecta si la pregunta es un seguimiento de la anterior"""
         text = text.lower()
@@ -104,8 +214,8 @@ class NewsChatBot:
     def answer(self, question: str, session_id: str = 'default') -> str:
         """Procesa una pregunta y devuelve respuesta"""
         
-        # Verificar estado
-        if not self.initialized:
+        # Verificar estado (con ingesta en curso se responde con lo ya indexado)
+        if not self.listo:
             if self.initializing:
                 return "⏳ El bot se está inicializando, por favor espera unos segundos y vuelve a preguntar..."
             else:
@@ -125,29 +235,29 @@ class NewsChatBot:
             tipo_sentimiento = detectar_consulta_sentimiento(question)
             
             if tipo_sentimiento:
-                # Filtrar noticias por sentimiento
+                # Las más recientes del sentimiento pedido, desde el índice (sin recorrer el corpus)
                 if tipo_sentimiento == "positivo":
-                    noticias_filtradas = buscar_noticias_positivas(self.noticias)
+                    sentimiento = "Positivo"
                     emoji = "😊"
                     titulo = "Noticias Positivas"
                 elif tipo_sentimiento == "negativo":
-                    noticias_filtradas = buscar_noticias_negativas(self.noticias)
+                    sentimiento = "Negativo"
                     emoji = "😞"
                     titulo = "Noticias Negativas"
                 else:  # neutral
-                    noticias_filtradas = buscar_noticias_neutrales(self.noticias)
+                    sentimiento = "Neutral"
                     emoji = "😐"
                     titulo = "Noticias Neutrales"
                 
+                noticias_filtradas, total = self.sentimientos.pagina(sentimiento, pagina=1, por_pagina=5)
                 if not noticias_filtradas:
                     return f"{emoji} No encontré noticias con sentimiento {tipo_sentimiento}."
                 
                 # Mostrar resumen + primeras noticias
-                total = len(noticias_filtradas)
                 respuesta = f"{emoji} **{titulo}** (Total: {total})\n\n"
                 
                 # Mostrar las primeras 5
-                for i, noticia in enumerate(noticias_filtradas[:5], 1):
+                for i, noticia in enumerate(noticias_filtradas, 1):
                     titulo_corto = noticia['titulo'][:60] + "..." if len(noticia['titulo']) > 60 else noticia['titulo']
                     respuesta += f"{i}. [{titulo_corto}]({noticia['url']})\n"
                     respuesta += f"   *{noticia['descripcion_sentimiento']}*\n\n"
@@ -214,7 +324,7 @@ class NewsChatBot:
             # No es necesario pasar 'previous_context' si ya estamos forzando el foco.
             
             # Calcular estadísticas globales para el "panorama"
-            global_stats = calcular_estadisticas_sentimientos(self.noticias)
+            global_stats = self.sentimientos.estadisticas()
             
             response = self.brain.generate(
                 question, 
@@ -22,7 +22,9 @@ if not TELEGRAM_BOT_TOKEN:
 
 # --- CONFIGURACIÓN DE SCRAPING ---
 # Configuración de secciones a rastrear
-# Formato: "URL": cantidad_de_paginas
+# Formato: "URL": techo_de_paginas  o  "URL": {"max": techo, "min": piso}
+# La paginación es adaptativa: tras el piso se sigue bajando solo mientras
+# la última página tenga noticias nuevas, sin pasar del techo.
 SECCIONES_CONFIG = {
     "https://eldeber.com.bo/pais": 3,
     "https://eldeber.com.bo/economia": 3,
@@ -31,13 +33,165 @@ SECCIONES_CONFIG = {
     "https://eldeber.com.bo/deportes": 3
 }
 
+# --- FUENTES DE NOTICIAS ---
+# Cada medio es un adaptador de sources.py ("tipo") con sus propias secciones,
+# tasa, ráfaga y concurrencia (si se omiten, los valores globales del scraper).
+# El Deber usa SECCIONES_CONFIG. Todas las fuentes se rastrean a la vez, cada
+# una con su pool: una fuente lenta o caída no frena a las demás. Ejemplo de
+# fuente genérica:
+#   "otro_medio": {"tipo": "selectores", "base_url": "https://medio.com",
+#                  "listado": "article h2 a", "paginacion": "{url}/page/{pagina}",
+#                  "secciones": {"https://medio.com/politica": 2},
+#                  "tasa": 2.0, "max_concurrencia": 4}
+FUENTES_CONFIG = {
+    "eldeber": {"tipo": "eldeber"}
+}
+# Tras estos fallos seguidos una fuente se suspende hasta el próximo refresco
+FUENTES_MAX_FALLOS_SEGUIDOS = 10
+
+# Piso de páginas por defecto (se leen siempre, haya o no novedades)
+PAGINAS_MINIMAS = 1
+
+# --- CONCURRENCIA DEL SCRAPER ---
+# Límite global de peticiones en vuelo y límite por fuente (cortesía con el servidor;
+# vale para las fuentes que no declaran su propio max_concurrencia)
+SCRAPER_MAX_CONCURRENCIA = 16
+SCRAPER_MAX_POR_HOST = 8
+
+# Limitador de tasa por host (token bucket): peticiones/segundo sostenidas y ráfaga.
+# Ante un 429 el host se pausa (Retry-After) y la tasa baja a la mitad.
+SCRAPER_TASA_POR_HOST = 8.0
+SCRAPER_RAFAGA_POR_HOST = 16
+SCRAPER_TASAS_HOSTS = {}     # excepciones por host, ej. {"eldeber.com.bo": 4.0}
+SCRAPER_REINTENTOS_429 = 3
+SCRAPER_PAUSA_429 = 5        # segundos de pausa si el 429 no trae Retry-After
+SCRAPER_MAX_RETRY_AFTER = 60  # un Retry-After mayor no se espera: se suspende la fuente en este refresco
+
+# Etapa de parseo HTML separada de la red (pool de procesos).
+# PARSER_BACKEND: "lxml" (rápido) o "html.parser"; PARSEO_PARCIAL construye solo
+# los nodos que se consultan (SoupStrainer). PARSEO_PROCESOS = 0 parsea en los threads de red.
+PARSER_BACKEND = "lxml"
+PARSEO_PARCIAL = True
+PARSEO_PROCESOS = max((os.cpu_count() or 2) - 1, 1)
+
+# --- CACHÉ Y DATOS PERSISTENTES ---
+# Directorio donde se guardan las cachés en disco (HTTP, índices, etc.)
+CACHE_DIR = os.getenv("NEWSBOT_CACHE_DIR", "cache")
+
+# Caché HTTP condicional (ETag / Last-Modified) para las páginas de noticias
+HTTP_CACHE_ACTIVO = True
+HTTP_CACHE_ARCHIVO = os.path.join(CACHE_DIR, "http_cache.sqlite3")
+
+# Scraping incremental: índice persistente de URLs ya procesadas (con su contenido)
+SCRAPING_INCREMENTAL = True
+INDICE_NOTICIAS_ARCHIVO = os.path.join(CACHE_DIR, "noticias.sqlite3")
+INDICE_MAX_NOTICIAS = 2000  # noticias más recientes que se cargan al arrancar (y que se mantienen en memoria)
+
+# Selector del cuerpo aprendido por patrón de URL (se prueba primero en cada artículo)
+SELECTORES_APRENDIDOS = True
+SELECTORES_ARCHIVO = os.path.join(CACHE_DIR, "selectores.json")
+
+# Archivo del HTML crudo (segmentos gzip + índice de offsets) para re-extraer sin red
+HTML_ARCHIVO_ACTIVO = True
+HTML_ARCHIVO_DIR = os.path.join(CACHE_DIR, "html")
+HTML_ARCHIVO_TAM_SEGMENTO = 64 * 1024 * 1024  # bytes comprimidos por segmento
+
+# --- CRAWL DISTRIBUIDO ---
+# Con CRAWL_PROCESOS > 0 el scraper reparte listados y artículos
+# entre procesos trabajadores (CRAWL_HILOS_POR_PROCESO threads cada uno) a través
+# de una cola SQLite durable. Un trabajo tomado se retiene CRAWL_LEASE segundos:
+# si el proceso muere, vuelve a la cola. Los fallos transitorios se reintentan
+# hasta CRAWL_MAX_INTENTOS veces. 0 = todo en el proceso actual (asyncio).
+CRAWL_PROCESOS = 0
+CRAWL_HILOS_POR_PROCESO = 4
+CRAWL_LEASE = 60
+CRAWL_MAX_INTENTOS = 3
+CRAWL_COLA_ARCHIVO = os.path.join(CACHE_DIR, "cola_crawl.sqlite3")
+
+# Telemetría del scraper: latencias DNS/conexión/TLS/TTFB/total, bytes, reintentos,
+# clases de estado y tiempo por etapa. Se consulta en /api/scraper/telemetry y se
+# vuelca a TELEMETRIA_DIR (un JSON por refresco; None = no volcar).
+TELEMETRIA_ACTIVA = True
+TELEMETRIA_DIR = os.path.join(CACHE_DIR, "telemetria")
+TELEMETRIA_MAX_VOLCADOS = 50
+
+# Fixtures HTTP para medir el scraper sin red:
+#   "grabar"     -> las respuestas reales de SESSION se guardan en el archivo
+#   "reproducir" -> SESSION responde desde el archivo (con latencia y errores simulados)
+HTTP_FIXTURES_MODO = os.getenv("HTTP_FIXTURES_MODO", "")
+HTTP_FIXTURES_ARCHIVO = os.getenv("HTTP_FIXTURES_ARCHIVO", os.path.join(CACHE_DIR, "fixtures_http.jsonl.gz"))
+HTTP_FIXTURES_LATENCIA_MS = float(os.getenv("HTTP_FIXTURES_LATENCIA_MS", "0"))
+HTTP_FIXTURES_JITTER_MS = float(os.getenv("HTTP_FIXTURES_JITTER_MS", "0"))
+HTTP_FIXTURES_TASA_ERROR = float(os.getenv("HTTP_FIXTURES_TASA_ERROR", "0"))
+
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 }
 
+# --- RE-CRAWL PROGRAMADO ---
+# Cada sección se vuelve a rastrear con un intervalo propio, calculado para
+# encontrar ~RECRAWL_OBJETIVO_NUEVAS noticias nuevas por visita según su ritmo
+# de publicación observado (acotado entre MIN y MAX, en segundos).
+RECRAWL_ACTIVO = True
+RECRAWL_INTERVALO_INICIAL = 30 * 60
+RECRAWL_INTERVALO_MIN = 10 * 60
+RECRAWL_INTERVALO_MAX = 6 * 60 * 60
+RECRAWL_OBJETIVO_NUEVAS = 5
+RECRAWL_JITTER = 0.15      # ±15% aleatorio en cada próxima visita
+RECRAWL_AGRUPAR = 120      # secciones que vencen dentro de esta ventana van en la misma corrida
+RECRAWL_SUAVIZADO = 0.3    # peso de la última observación en la media móvil
+RECRAWL_ARCHIVO = os.path.join(CACHE_DIR, "recrawl.json")
+
+# --- DEDUPLICACIÓN ---
+# Duplicados exactos por URL/hash de contenido y casi duplicados por MinHash/LSH
+# (similitud de Jaccard estimada sobre shingles de DEDUP_TAM_SHINGLE palabras).
+DEDUP_ACTIVO = True
+DEDUP_UMBRAL = 0.7
+DEDUP_PERMUTACIONES = 128
+DEDUP_BANDAS = 32  # 32 bandas x 4 filas
+DEDUP_TAM_SHINGLE = 3
+
+# --- INGESTA EN STREAMING ---
+# Las noticias pasan del scraper al análisis de sentimiento y a los embeddings
+# por colas acotadas, en micro-lotes de hasta PIPELINE_TAM_LOTE noticias.
+PIPELINE_TAM_LOTE = 16
+PIPELINE_TAM_COLA = 64
+PIPELINE_ESPERA_LOTE = 0.5  # segundos máximos para completar un micro-lote
+
+# --- ANÁLISIS DE SENTIMIENTOS ---
+# El modelo se carga recién al necesitarlo (o en background al iniciar la ingesta)
+SENTIMIENTO_MODELO = "nlptown/bert-base-multilingual-uncased-sentiment"
+# Backend de inferencia: "fp32", "int8" (cuantización dinámica) u "onnx"
+# (onnxruntime; el grafo exportado se guarda en SENTIMIENTO_ONNX_DIR)
+SENTIMIENTO_BACKEND = os.getenv("SENTIMIENTO_BACKEND", "fp32")
+SENTIMIENTO_ONNX_DIR = os.path.join(CACHE_DIR, "onnx")
+# Las noticias que no se resuelven por palabras clave pasan por BERT en lotes
+# de este tamaño (agrupadas por largo para minimizar el padding).
+SENTIMIENTO_TAM_LOTE = 32
+
+# Procesos trabajadores para BERT (0 = en el proceso principal). Cada uno
+# carga su modelo y usa SENTIMIENTO_HILOS_POR_PROCESO threads intra-op
+# (0 = los núcleos repartidos entre los procesos).
+SENTIMIENTO_PROCESOS = 0
+SENTIMIENTO_HILOS_POR_PROCESO = 0
+
+# Léxico de palabras clave (lexicon.py). None = el léxico por defecto; con un
+# JSON {"negativas": [...], "positivas": [...]} se recarga al modificarlo,
+# revisando el archivo como mucho cada LEXICO_REVISION segundos.
+LEXICO_ARCHIVO = os.getenv("LEXICO_ARCHIVO") or None
+LEXICO_REVISION = 5
+
+# Caché persistente de resultados por texto (se invalida sola al cambiar modelo o léxico)
+SENTIMIENTO_CACHE_ACTIVA = True
+SENTIMIENTO_CACHE_ARCHIVO = os.path.join(CACHE_DIR, "sentimientos.sqlite3")
+
 # --- MODELO DE EMBEDDINGS ---
 EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
 
+# Caché persistente de vectores por texto (se invalida sola al cambiar EMBEDDING_MODEL)
+EMBEDDINGS_CACHE_ACTIVA = True
+EMBEDDINGS_CACHE_ARCHIVO = os.path.join(CACHE_DIR, "embeddings.sqlite3")
+
 # --- ALMACENAMIENTO GLOBAL ---
 DATA_STORE = {
     'titulares': [],
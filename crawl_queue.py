@@ -0,0 +1,282 @@
+# ================================================================================
+# crawl_queue.py - COLA DURABLE DE TRABAJOS DE CRAWLING (SQLITE)
+# ================================================================================
+#
+# Cola local compartida entre el coordinador y los procesos trabajadores
+# (ver crawl_workers.py). Cada trabajo (listado o artículo) tiene una clave
+# única y pasa por:
+#
+#   pendiente -> en_curso (lease con vencimiento) -> hecho | fallido | cancelado
+#
+# - Lease: quien toma un trabajo lo retiene LEASE segundos. Si el proceso
+#   muere, al vencer el lease otro trabajador lo vuelve a tomar.
+# - Reintentos: un fallo transitorio devuelve el trabajo a pendiente con
+#   espera creciente, hasta MAX_INTENTOS; luego queda como fallido.
+# - Resultados idempotentes: un resultado se escribe una sola vez por clave y
+#   solo si el trabajador todavía es dueño del lease; los duplicados (un
+#   trabajador lento que termina después de perder el lease) se descartan.
+# - Pool por fuente: no se entregan trabajos de una fuente que ya tiene
+#   tantos en curso como su max_concurrencia, sume lo que sumen los procesos.
+#
+# Cada thread abre su propia conexión (SQLite serializa las escrituras entre
+# procesos; las lecturas no bloquean en modo WAL).
+#
+# ================================================================================
+
+import os
+import time
+import pickle
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+# Prioridad de entrega: los listados primero, para descubrir trabajo cuanto antes
+PRIORIDAD = {'listado': 0, 'articulo': 1}
+
+
+class ColaTrabajos:
+    """Cola de trabajos con leases, reintentos y resultados idempotentes"""
+
+    def __init__(self, ruta: str, lease: float = 60.0, max_intentos: int = 3):
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self.ruta = ruta
+        self.lease = lease
+        self.max_intentos = max_intentos
+
+        # Transacciones explícitas: la toma de un trabajo tiene que ser atómica
+        self._conn = sqlite3.connect(ruta, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS trabajos (
+                id INTEGER PRIMARY KEY,
+                clave TEXT UNIQUE NOT NULL,
+                tipo TEXT NOT NULL,
+                fuente TEXT NOT NULL,
+                prioridad INTEGER NOT NULL,
+                datos BLOB NOT NULL,
+                estado TEXT NOT NULL DEFAULT 'pendiente',
+                intentos INTEGER NOT NULL DEFAULT 0,
+                disponible REAL NOT NULL DEFAULT 0,
+                lease_hasta REAL,
+                trabajador TEXT,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_trabajos_estado ON trabajos (estado, prioridad, id);
+            CREATE TABLE IF NOT EXISTS resultados (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                clave TEXT UNIQUE NOT NULL,
+                tipo TEXT NOT NULL,
+                ok INTEGER NOT NULL,
+                datos BLOB
+            );
+            CREATE TABLE IF NOT EXISTS fuentes (
+                nombre TEXT PRIMARY KEY,
+                max_concurrencia INTEGER NOT NULL
+            );
+        """)
+
+    def cerrar(self):
+        self._conn.close()
+
+    # --------------------------------------------------------------------------
+    # Lado del coordinador
+    # --------------------------------------------------------------------------
+
+    def reiniciar(self):
+        """Vacía la cola (al comenzar una corrida nueva)"""
+        self._conn.executescript("""
+            BEGIN IMMEDIATE;
+            DELETE FROM trabajos;
+            DELETE FROM resultados;
+            DELETE FROM fuentes;
+            COMMIT;
+        """)
+
+    def configurar_fuentes(self, limites: Dict[str, int]):
+        """Máximo de trabajos en curso por fuente (entre todos los procesos)"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO fuentes (nombre, max_concurrencia) VALUES (?, ?)",
+            [(nombre, max(int(limite), 1)) for nombre, limite in limites.items()]
+        )
+        self._conn.execute("COMMIT")
+
+    def encolar(self, trabajos: List[Tuple[str, str, str, Dict]]) -> int:
+        """
+        Agrega trabajos (clave, tipo, fuente, datos). Una clave ya encolada se
+        ignora, así que volver a encolar es inocuo.
+
+        Returns:
+            Cantidad de trabajos realmente agregados.
+        """
+        if not trabajos:
+            return 0
+        filas = [(clave, tipo, fuente, PRIORIDAD.get(tipo, 1), pickle.dumps(datos, pickle.HIGHEST_PROTOCOL))
+                 for clave, tipo, fuente, datos in trabajos]
+        self._conn.execute("BEGIN IMMEDIATE")
+        antes = self._conn.total_changes
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO trabajos (clave, tipo, fuente, prioridad, datos) VALUES (?, ?, ?, ?, ?)",
+            filas
+        )
+        agregados = self._conn.total_changes - antes
+        self._conn.execute("COMMIT")
+        return agregados
+
+    def cancelar_fuente(self, fuente: str) -> List[str]:
+        """Cancela los trabajos pendientes de una fuente; devuelve sus claves"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        claves = [fila[0] for fila in self._conn.execute(
+            "SELECT clave FROM trabajos WHERE fuente = ? AND estado = 'pendiente'", (fuente,)
+        )]
+        self._conn.execute(
+            "UPDATE trabajos SET estado = 'cancelado' WHERE fuente = ? AND estado = 'pendiente'", (fuente,)
+        )
+        self._conn.execute("COMMIT")
+        return claves
+
+    def resultados_desde(self, ultimo: int, limite: int = 500) -> List[Tuple[int, str, str, bool, object]]:
+        """Resultados nuevos (id, clave, tipo, ok, datos) en orden de llegada"""
+        filas = self._conn.execute(
+            "SELECT id, clave, tipo, ok, datos FROM resultados WHERE id > ? ORDER BY id LIMIT ?",
+            (ultimo, limite)
+        ).fetchall()
+        return [(i, clave, tipo, bool(ok), pickle.loads(datos) if datos is not None else None)
+                for i, clave, tipo, ok, datos in filas]
+
+    def estadisticas(self) -> Dict:
+        filas = self._conn.execute("SELECT estado, COUNT(*), SUM(intentos) FROM trabajos GROUP BY estado").fetchall()
+        stats = {estado: cantidad for estado, cantidad, _ in filas}
+        stats['intentos'] = sum(intentos or 0 for _, _, intentos in filas)
+        stats['resultados'] = self._conn.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+        return stats
+
+    # --------------------------------------------------------------------------
+    # Lado del trabajador
+    # --------------------------------------------------------------------------
+
+    def tomar(self, trabajador: str) -> Optional[Tuple[int, str, str, object]]:
+        """
+        Toma el próximo trabajo disponible (pendiente o con el lease vencido)
+        de una fuente que no esté saturada.
+
+        Returns:
+            (id, clave, tipo, datos) o None si no hay nada que hacer ahora.
+        """
+        ahora = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Un trabajo que ya tumbó (o colgó) a max_intentos trabajadores no se reparte más
+            agotados = self._conn.execute(
+                "SELECT id, clave, tipo FROM trabajos WHERE estado = 'en_curso' AND lease_hasta < ? "
+                "AND intentos >= ?", (ahora, self.max_intentos)
+            ).fetchall()
+            for id_agotado, clave, tipo in agotados:
+                self._conn.execute(
+                    "UPDATE trabajos SET estado = 'fallido', lease_hasta = NULL, error = ? WHERE id = ?",
+                    ("lease vencido", id_agotado)
+                )
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO resultados (clave, tipo, ok, datos) VALUES (?, ?, 0, ?)",
+                    (clave, tipo, pickle.dumps({'error': "lease vencido"}))
+                )
+
+            saturadas = [fila[0] for fila in self._conn.execute("""
+                SELECT t.fuente FROM trabajos t JOIN fuentes f ON f.nombre = t.fuente
+                WHERE t.estado = 'en_curso' AND t.lease_hasta >= ?
+                GROUP BY t.fuente, f.max_concurrencia
+                HAVING COUNT(*) >= f.max_concurrencia
+            """, (ahora,))]
+            excluir = f"AND fuente NOT IN ({','.join('?' * len(saturadas))})" if saturadas else ""
+            fila = self._conn.execute(f"""
+                SELECT id, clave, tipo, datos FROM trabajos
+                WHERE ((estado = 'pendiente' AND disponible <= ?) OR (estado = 'en_curso' AND lease_hasta < ?))
+                {excluir}
+                ORDER BY prioridad, id LIMIT 1
+            """, (ahora, ahora, *saturadas)).fetchone()
+            if fila is None:
+                self._conn.execute("COMMIT")
+                return None
+
+            id_trabajo, clave, tipo, datos = fila
+            self._conn.execute(
+                "UPDATE trabajos SET estado = 'en_curso', trabajador = ?, lease_hasta = ?, "
+                "intentos = intentos + 1 WHERE id = ?",
+                (trabajador, ahora + self.lease, id_trabajo)
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return id_trabajo, clave, tipo, pickle.loads(datos)
+
+    def completar(self, id_trabajo: int, trabajador: str, clave: str, tipo: str, datos) -> bool:
+        """
+        Escribe el resultado si el trabajador sigue siendo dueño del lease.
+
+        Returns:
+            False si el trabajo ya no le pertenece (el resultado se descarta).
+        """
+        blob = pickle.dumps(datos, pickle.HIGHEST_PROTOCOL)
+        self._conn.execute("BEGIN IMMEDIATE")
+        cursor = self._conn.execute(
+            "UPDATE trabajos SET estado = 'hecho', lease_hasta = NULL "
+            "WHERE id = ? AND trabajador = ? AND estado = 'en_curso'",
+            (id_trabajo, trabajador)
+        )
+        if cursor.rowcount == 0:
+            self._conn.execute("ROLLBACK")
+            return False
+        self._conn.execute(
+            "INSERT OR IGNORE INTO resultados (clave, tipo, ok, datos) VALUES (?, ?, 1, ?)",
+            (clave, tipo, blob)
+        )
+        self._conn.execute("COMMIT")
+        return True
+
+    def fallar(self, id_trabajo: int, trabajador: str, clave: str, tipo: str, error: str) -> bool:
+        """
+        Registra un fallo transitorio: el trabajo vuelve a la cola con espera
+        creciente, o queda como fallido (con un resultado de error) si agotó
+        sus intentos.
+
+        Returns:
+            True si se reintentará.
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        fila = self._conn.execute(
+            "SELECT intentos FROM trabajos WHERE id = ? AND trabajador = ? AND estado = 'en_curso'",
+            (id_trabajo, trabajador)
+        ).fetchone()
+        if fila is None:
+            self._conn.execute("ROLLBACK")
+            return False
+
+        intentos = fila[0]
+        if intentos < self.max_intentos:
+            self._conn.execute(
+                "UPDATE trabajos SET estado = 'pendiente', trabajador = NULL, lease_hasta = NULL, "
+                "disponible = ?, error = ? WHERE id = ?",
+                (time.time() + 2 ** (intentos - 1), error, id_trabajo)
+            )
+            self._conn.execute("COMMIT")
+            return True
+
+        self._conn.execute(
+            "UPDATE trabajos SET estado = 'fallido', lease_hasta = NULL, error = ? WHERE id = ?",
+            (error, id_trabajo)
+        )
+        self._conn.execute(
+            "INSERT OR IGNORE INTO resultados (clave, tipo, ok, datos) VALUES (?, ?, 0, ?)",
+            (clave, tipo, pickle.dumps({'error': error}))
+        )
+        self._conn.execute("COMMIT")
+        return False
+
+    def hay_trabajo(self) -> bool:
+        """Quedan trabajos pendientes o en curso"""
+        return self._conn.execute(
+            "SELECT 1 FROM trabajos WHERE estado IN ('pendiente', 'en_curso') LIMIT 1"
+        ).fetchone() is not None
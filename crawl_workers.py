@@ -0,0 +1,214 @@
+# ================================================================================
+# crawl_workers.py - PROCESOS TRABAJADORES DEL CRAWL DISTRIBUIDO
+# ================================================================================
+#
+# Cada proceso trabajador corre CRAWL_HILOS_POR_PROCESO threads que toman
+# trabajos de la cola durable (crawl_queue.py), descargan y parsean, y
+# escriben el resultado en la misma cola. El coordinador
+# (scraper.CoordinadorCrawl) lee esos resultados en streaming, decide la
+# paginación, encola los artículos y es el único que escribe en las cachés
+# (HTTP, archivo HTML, selectores), así que un trabajador puede morir en
+# cualquier momento sin dejar nada a medias: su trabajo vuelve a la cola al
+# vencer el lease.
+#
+# Los procesos se lanzan con "spawn" y reciben una copia de la configuración
+# del coordinador (ajustes_para_trabajadores) antes de importar el scraper.
+#
+# ================================================================================
+
+import threading
+from typing import Dict
+
+from crawl_queue import ColaTrabajos
+from rate_limiter import capturando_contadores, sumar_contadores
+from telemetry import capturando, medir_etapa
+
+
+class ErrorTransitorio(Exception):
+    """Fallo que vale la pena reintentar (5xx, 429 persistente)"""
+
+
+class RespuestaGuardada:
+    """Lo que usan la caché HTTP y el archivo HTML de una respuesta (sin la conexión)"""
+
+    def __init__(self, content: bytes, headers: Dict[str, str]):
+        self.content = content
+        self.headers = headers
+
+
+def ajustes_para_trabajadores(procesos: int) -> Dict:
+    """
+    Copia de la configuración para los procesos trabajadores. Las tasas del
+    limitador se reparten entre los procesos: cada uno tiene su propio token
+    bucket y entre todos no deben superar la tasa configurada por host.
+    """
+    import config
+
+    procesos = max(procesos, 1)
+    ajustes = {
+        nombre: valor for nombre, valor in vars(config).items()
+        if nombre.isupper() and nombre != 'DATA_STORE'
+    }
+    ajustes['SCRAPER_TASA_POR_HOST'] = config.SCRAPER_TASA_POR_HOST / procesos
+    ajustes['SCRAPER_RAFAGA_POR_HOST'] = max(config.SCRAPER_RAFAGA_POR_HOST // procesos, 1)
+    ajustes['SCRAPER_TASAS_HOSTS'] = {host: tasa / procesos for host, tasa in config.SCRAPER_TASAS_HOSTS.items()}
+
+    fuentes = {}
+    for nombre, opciones in config.FUENTES_CONFIG.items():
+        opciones = dict(opciones)
+        if opciones.get('tasa'):
+            opciones['tasa'] = opciones['tasa'] / procesos
+        if opciones.get('rafaga'):
+            opciones['rafaga'] = max(opciones['rafaga'] // procesos, 1)
+        fuentes[nombre] = opciones
+    ajustes['FUENTES_CONFIG'] = fuentes
+
+    # Dentro de un trabajador se parsea en el mismo thread y nunca se vuelve a distribuir
+    ajustes['PARSEO_PROCESOS'] = 0
+    ajustes['CRAWL_PROCESOS'] = 0
+    return ajustes
+
+
+# ================================================================================
+# TRABAJOS
+# ================================================================================
+
+def _opciones_parseo():
+    from config import PARSER_BACKEND, PARSEO_PARCIAL
+    return PARSER_BACKEND, PARSEO_PARCIAL
+
+
+def _descargar(url: str, timeout: int, headers=None):
+    """
+    → (response, retry_after_excedido). Un 429 que pide esperar más que
+    SCRAPER_MAX_RETRY_AFTER no se reintenta: vuelve como resultado y el
+    coordinador suspende la fuente.
+    """
+    from scraper import descargar, RespuestaLimitada
+
+    try:
+        response = descargar(url, timeout=timeout, headers=headers)
+    except RespuestaLimitada as e:
+        if e.retry_after_excedido:
+            return e.response, True
+        raise ErrorTransitorio(f"429 persistente en {url}") from e
+    if response.status_code >= 500:
+        raise ErrorTransitorio(f"{response.status_code} en {url}")
+    return response, False
+
+
+def trabajo_listado(datos: Dict) -> Dict:
+    """Descarga y parsea una página de listado → {'estado', 'entradas'}"""
+    fuente, url = datos['fuente'], datos['url']
+    response, excedido = _descargar(url, 15)
+    if response.status_code != 200:
+        return {'estado': response.status_code, 'entradas': None, 'retry_after_excedido': excedido}
+
+    backend, parcial = _opciones_parseo()
+    with medir_etapa('parsear_listado'):
+        entradas = fuente.parsear_listado(response.content, response.encoding, backend, parcial)
+    return {'estado': 200, 'entradas': entradas}
+
+
+def trabajo_articulo(datos: Dict) -> Dict:
+    """
+    Descarga un artículo (GET condicional) y extrae su cuerpo. Solo lee las
+    cachés: el cuerpo crudo y los validadores vuelven al coordinador, que los guarda.
+    """
+    from http_cache import obtener_cache_http
+    from selector_cache import obtener_mapa_selectores
+
+    fuente, url = datos['fuente'], datos['enlace']
+    cache = obtener_cache_http()
+    entrada = cache.buscar(url) if cache else None
+    cabeceras = cache.cabeceras_condicionales(entrada) if cache else None
+
+    # Las estadísticas de la caché las lleva el coordinador
+    consulta = {'en_cache': entrada is not None, 'revalidada': bool(cabeceras)} if cache else None
+
+    response, excedido = _descargar(url, 10, cabeceras)
+    if response.status_code == 304 and entrada:
+        return {'estado': 304, 'contenido': entrada['texto'], 'bytes': entrada['bytes'], 'consulta': consulta}
+    if response.status_code != 200:
+        return {'estado': response.status_code, 'contenido': None, 'consulta': consulta,
+                'retry_after_excedido': excedido}
+
+    mapa = obtener_mapa_selectores()
+    preferido = mapa.preferido(url) if mapa is not None else None
+    backend, parcial = _opciones_parseo()
+    with medir_etapa('extraer_cuerpo'):
+        contenido, selector = fuente.extraer_cuerpo(response.content, 'utf-8', preferido, backend, parcial)
+    return {
+        'estado': 200,
+        'contenido': contenido,
+        'selector': selector,
+        'preferido': preferido,
+        'cuerpo': response.content,
+        'consulta': consulta,
+        'cabeceras': {clave: response.headers[clave] for clave in ('ETag', 'Last-Modified')
+                      if clave in response.headers}
+    }
+
+
+TRABAJOS = {
+    'listado': trabajo_listado,
+    'articulo': trabajo_articulo
+}
+
+
+# ================================================================================
+# PROCESO TRABAJADOR
+# ================================================================================
+
+def _bucle(ruta: str, nombre: str, lease: float, max_intentos: int, detener):
+    """Un thread trabajador: toma, ejecuta y reporta hasta que el coordinador diga basta"""
+    cola = ColaTrabajos(ruta, lease, max_intentos)
+    espera = 0.02
+    # Contadores del limitador de intentos fallidos: viajan con el próximo resultado
+    pendientes = {}
+    try:
+        while not detener.is_set():
+            trabajo = cola.tomar(nombre)
+            if trabajo is None:
+                # Cola vacía por ahora: el coordinador puede encolar más al recibir un listado
+                detener.wait(espera)
+                espera = min(espera * 2, 0.5)
+                continue
+
+            espera = 0.02
+            id_trabajo, clave, tipo, datos = trabajo
+            try:
+                # Las mediciones del trabajo y los contadores del limitador viajan con el resultado
+                with capturando() as mediciones, capturando_contadores() as limitador:
+                    resultado = TRABAJOS[tipo](datos)
+            except Exception as e:
+                sumar_contadores(pendientes, limitador)
+                cola.fallar(id_trabajo, nombre, clave, tipo, f"{type(e).__name__}: {e}")
+                continue
+            resultado['telemetria'] = mediciones
+            sumar_contadores(limitador, pendientes)
+            resultado['limitador'] = limitador
+            pendientes = {}
+            cola.completar(id_trabajo, nombre, clave, tipo, resultado)
+    finally:
+        cola.cerrar()
+
+
+def proceso_trabajador(ruta: str, nombre: str, ajustes: Dict, hilos: int,
+                       lease: float, max_intentos: int, detener):
+    """Punto de entrada de cada proceso (se lanza con multiprocessing 'spawn')"""
+    import config
+
+    for clave, valor in ajustes.items():
+        setattr(config, clave, valor)
+
+    import scraper  # noqa: F401  (sesión y limitador con la configuración ya aplicada)
+
+    threads = [
+        threading.Thread(target=_bucle, args=(ruta, f"{nombre}/{i}", lease, max_intentos, detener), daemon=True)
+        for i in range(max(hilos, 1))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
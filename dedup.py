@@ -0,0 +1,252 @@
+# ================================================================================
+# dedup.py - DEDUPLICACIÓN DE NOTICIAS (HASH EXACTO + MINHASH/LSH)
+# ================================================================================
+#
+# Una misma nota suele aparecer en varias secciones (pais y economia, por
+# ejemplo) o republicada con cambios mínimos. Antes de pasar por BERT y por
+# los embeddings se descartan:
+#   - duplicados exactos: misma URL normalizada o mismo hash del contenido
+#   - casi duplicados: firma MinHash sobre shingles de palabras de `contenido`,
+#     con bandas LSH para encontrar candidatos sin comparar contra todo.
+#
+# El duplicado no se pierde del todo: su sección se agrega a la noticia
+# canónica (`secciones`) y su URL queda como alias para no volver a
+# descargarla en el próximo refresco incremental. Las canónicas cuyas
+# secciones cambiaron quedan en `modificadas`: la ingesta las vuelve a
+# guardar en el índice local al terminar (ya se habían guardado antes).
+#
+# ================================================================================
+
+import re
+import zlib
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+
+_PALABRA = re.compile(r'\w+', re.UNICODE)
+
+
+def normalizar_url(url: str) -> str:
+    """URL sin esquema, query, fragmento ni barra final (para comparar)"""
+    partes = urlparse(url.strip())
+    host = partes.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return f"{host}{partes.path.rstrip('/')}"
+
+
+def _palabras(texto: str) -> List[str]:
+    return _PALABRA.findall(texto.lower())
+
+
+def hash_contenido(texto: str) -> str:
+    """Hash del contenido normalizado (minúsculas, solo palabras)"""
+    return hashlib.sha1(" ".join(_palabras(texto)).encode('utf-8')).hexdigest()
+
+
+class FirmadorMinHash:
+    """
+    Calcula firmas MinHash con una familia multiply-shift fija:
+    h(x) = (a*x + b) >> 32 en aritmética de 64 bits (el desborde es intencional
+    y evita el módulo por un primo, que en numpy es mucho más lento).
+    """
+
+    def __init__(self, permutaciones: int = 128, tam_shingle: int = 3, semilla: int = 1):
+        generador = np.random.default_rng(semilla)
+        self.permutaciones = permutaciones
+        self.tam_shingle = tam_shingle
+        self._a = generador.integers(0, 2 ** 64, size=permutaciones, dtype=np.uint64) | np.uint64(1)
+        self._b = generador.integers(0, 2 ** 64, size=permutaciones, dtype=np.uint64)
+
+    def shingles(self, texto: str) -> np.ndarray:
+        """Hashes (32 bits) de los n-gramas de palabras del texto"""
+        palabras = _palabras(texto)
+        k = self.tam_shingle
+        if len(palabras) < k:
+            grupos = {" ".join(palabras)} if palabras else set()
+        else:
+            grupos = {" ".join(palabras[i:i + k]) for i in range(len(palabras) - k + 1)}
+        return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grupos),
+                           dtype=np.uint64, count=len(grupos))
+
+    def firma(self, texto: str) -> Optional[np.ndarray]:
+        hashes = self.shingles(texto)
+        if hashes.size == 0:
+            return None
+        # Matriz permutaciones x shingles; el mínimo por fila es la firma
+        with np.errstate(over='ignore'):
+            valores = (np.outer(self._a, hashes) + self._b[:, None]) >> np.uint64(32)
+        return valores.min(axis=1)
+
+
+def similitud(firma_a: np.ndarray, firma_b: np.ndarray) -> float:
+    """Estimación de Jaccard: fracción de posiciones iguales en las firmas"""
+    return float(np.mean(firma_a == firma_b))
+
+
+class Deduplicador:
+    """
+    Índice de noticias vistas en la ingesta.
+
+    `registrar(noticia)` devuelve None si la noticia es nueva (y la incorpora)
+    o la noticia canónica de la que es duplicado (y le suma su sección). Los
+    pares (url duplicada, url canónica) se acumulan en `alias` y las
+    canónicas con secciones nuevas en `modificadas` (url → noticia).
+    """
+
+    def __init__(self, umbral: float = 0.7, permutaciones: int = 128,
+                 bandas: int = 32, tam_shingle: int = 3):
+        if permutaciones % bandas:
+            raise ValueError("permutaciones debe ser múltiplo de bandas")
+        self.umbral = umbral
+        self.bandas = bandas
+        self.filas = permutaciones // bandas
+        self.firmador = FirmadorMinHash(permutaciones, tam_shingle)
+
+        self._por_url: Dict[str, Dict] = {}
+        self._por_hash: Dict[str, Dict] = {}
+        self._cubetas: List[Dict[bytes, List[int]]] = [{} for _ in range(bandas)]
+        self._firmas: List[np.ndarray] = []
+        self._noticias: List[Dict] = []
+        self.alias: List[Tuple[str, str]] = []
+        self.modificadas: Dict[str, Dict] = {}
+        # URL normalizada → secciones donde se volvió a ver antes de incorporarla
+        self._secciones_pendientes: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self.reiniciar_estadisticas()
+
+    def reiniciar_estadisticas(self):
+        self.stats = {'nuevas': 0, 'url_repetida': 0, 'contenido_identico': 0, 'casi_duplicadas': 0}
+
+    def _claves_lsh(self, firma: np.ndarray) -> List[bytes]:
+        return [firma[i * self.filas:(i + 1) * self.filas].tobytes() for i in range(self.bandas)]
+
+    def _candidata(self, firma: np.ndarray, claves: List[bytes]) -> Optional[Tuple[Dict, float]]:
+        """Mejor candidata LSH cuya similitud estimada supera el umbral"""
+        vistas = set()
+        mejor = None
+        for banda, clave in enumerate(claves):
+            for idx in self._cubetas[banda].get(clave, ()):
+                if idx in vistas:
+                    continue
+                vistas.add(idx)
+                valor = similitud(firma, self._firmas[idx])
+                if valor >= self.umbral and (mejor is None or valor > mejor[1]):
+                    mejor = (self._noticias[idx], valor)
+        return mejor
+
+    def _fusionar(self, canonica: Dict, seccion: Optional[str]):
+        """Suma la sección a la canónica y la anota como modificada (llamar con el lock)"""
+        if fusionar(canonica, {'seccion': seccion}):
+            self.modificadas[canonica.get('url', '')] = canonica
+
+    def _incorporar(self, noticia: Dict, url: str, huella: str, firma, claves):
+        self._por_url[url] = noticia
+        for seccion in self._secciones_pendientes.pop(url, ()):
+            self._fusionar(noticia, seccion)
+        self._por_hash[huella] = noticia
+        if firma is not None:
+            idx = len(self._noticias)
+            self._noticias.append(noticia)
+            self._firmas.append(firma)
+            for banda, clave in enumerate(claves):
+                self._cubetas[banda].setdefault(clave, []).append(idx)
+
+    def sembrar(self, noticias: List[Dict]):
+        """Incorpora noticias ya ingeridas (corpus previo) sin contarlas como nuevas"""
+        for noticia in noticias:
+            contenido = noticia.get('contenido', '')
+            firma = self.firmador.firma(contenido)
+            claves = self._claves_lsh(firma) if firma is not None else []
+            with self._lock:
+                self._incorporar(noticia, normalizar_url(noticia.get('url', '')),
+                                 hash_contenido(contenido), firma, claves)
+
+    def registrar(self, noticia: Dict) -> Optional[Dict]:
+        """Devuelve la noticia canónica si `noticia` es duplicado; si no, la incorpora"""
+        url = normalizar_url(noticia.get('url', ''))
+        contenido = noticia.get('contenido', '')
+        huella = hash_contenido(contenido)
+        # La firma (lo costoso) se calcula fuera del lock
+        firma = self.firmador.firma(contenido)
+        claves = self._claves_lsh(firma) if firma is not None else []
+
+        with self._lock:
+            canonica = self._por_url.get(url)
+            motivo = 'url_repetida'
+            if canonica is None:
+                canonica = self._por_hash.get(huella)
+                motivo = 'contenido_identico'
+            if canonica is None and firma is not None:
+                encontrada = self._candidata(firma, claves)
+                canonica = encontrada[0] if encontrada else None
+                motivo = 'casi_duplicadas'
+
+            if canonica is None:
+                self._incorporar(noticia, url, huella, firma, claves)
+                self.stats['nuevas'] += 1
+                return None
+
+            self.stats[motivo] += 1
+            self._fusionar(canonica, noticia.get('seccion'))
+            if noticia.get('url') and noticia['url'] != canonica.get('url'):
+                self.alias.append((noticia['url'], canonica.get('url', '')))
+            return canonica
+
+    def registrar_url(self, url: str, seccion: str, previa: bool = False) -> Optional[Dict]:
+        """
+        La misma URL listada otra vez en la ingesta (p. ej. en otra sección):
+        no se vuelve a descargar, pero su sección se suma a la canónica. Si
+        la canónica todavía se está descargando, se suma al incorporarla.
+
+        Con `previa=True` la URL es de una corrida anterior (el scraper ya la
+        cuenta como omitida): la sección solo se suma si la noticia está en
+        el corpus sembrado. Las URLs alias de corridas anteriores no se
+        siguen hasta su canónica.
+        """
+        url = normalizar_url(url)
+        with self._lock:
+            canonica = self._por_url.get(url)
+            if previa:
+                if canonica is not None:
+                    self._fusionar(canonica, seccion)
+                return canonica
+            self.stats['url_repetida'] += 1
+            if canonica is None:
+                self._secciones_pendientes.setdefault(url, []).append(seccion)
+                return None
+            self._fusionar(canonica, seccion)
+            return canonica
+
+    def estadisticas(self) -> Dict:
+        with self._lock:
+            return {**self.stats, 'indexadas': len(self._por_hash)}
+
+
+def fusionar(canonica: Dict, duplicada: Dict) -> bool:
+    """
+    Anota en la noticia canónica la sección del duplicado (True si era nueva).
+
+    Solo se agrega a la lista `secciones` ya existente: la canónica puede
+    estar siendo leída por otras etapas y no conviene agregarle claves.
+    """
+    secciones = canonica.get('secciones')
+    if secciones is not None and duplicada.get('seccion') and duplicada['seccion'] not in secciones:
+        secciones.append(duplicada['seccion'])
+        return True
+    return False
+
+
+def crear_deduplicador(previas: Optional[List[Dict]] = None) -> Optional[Deduplicador]:
+    """Deduplicador según config (None si DEDUP_ACTIVO = False), sembrado con el corpus previo"""
+    from config import DEDUP_ACTIVO, DEDUP_UMBRAL, DEDUP_PERMUTACIONES, DEDUP_BANDAS, DEDUP_TAM_SHINGLE
+
+    if not DEDUP_ACTIVO:
+        return None
+    deduplicador = Deduplicador(DEDUP_UMBRAL, DEDUP_PERMUTACIONES, DEDUP_BANDAS, DEDUP_TAM_SHINGLE)
+    if previas:
+        deduplicador.sembrar(previas)
+    return deduplicador
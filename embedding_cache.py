@@ -0,0 +1,77 @@
+# ================================================================================
+# embedding_cache.py - CACHÉ PERSISTENTE DE EMBEDDINGS
+# ================================================================================
+#
+# El embedding de "titulo. resumen" solo depende del texto y del modelo
+# (EMBEDDING_MODEL). Cada vector se guarda con la clave sha1(texto) y el
+# nombre del modelo como versión; al reindexar (o al reiniciar) solo se
+# codifican los textos que no están. Al cambiar de modelo las entradas viejas
+# se borran la primera vez que se usa el nuevo (ver sqlite_cache.py).
+#
+# También se guarda cuánto tarda el modelo por texto (promedio móvil) para
+# estimar el tiempo ahorrado aun cuando una indexación no codifica nada.
+#
+# ================================================================================
+
+import numpy as np
+from typing import Optional, Tuple
+
+from sqlite_cache import CacheSQLite, instancia_compartida
+
+
+class CacheEmbeddings(CacheSQLite):
+    """Caché en disco (SQLite) de vectores float32 por texto y modelo"""
+
+    TABLA = 'vectores'
+    COLUMNAS = (('dimension', 'INTEGER'), ('vector', 'BLOB'))
+    NOMBRE = "Caché de embeddings"
+    DESCARTADOS = "vectores de otro modelo descartados"
+
+    def __init__(self, ruta: str):
+        super().__init__(ruta)
+        # Segundos por texto medidos al codificar, por modelo
+        with self._lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS costo (
+                    modelo TEXT PRIMARY KEY,
+                    segundos_por_texto REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+
+    def _valor(self, fila: Tuple) -> Optional[np.ndarray]:
+        dimension, vector = fila
+        vector = np.frombuffer(vector, dtype=np.float32)
+        return vector if len(vector) == dimension else None
+
+    def _columnas(self, valor) -> Tuple:
+        vector = np.asarray(valor, dtype=np.float32)
+        return len(vector), vector.tobytes()
+
+    def registrar_costo(self, modelo: str, textos: int, segundos: float):
+        """Actualiza el promedio de segundos por texto del modelo (promedio móvil)"""
+        if textos <= 0:
+            return
+        medido = segundos / textos
+        with self._lock:
+            fila = self._conn.execute(
+                "SELECT segundos_por_texto FROM costo WHERE modelo = ?", (modelo,)
+            ).fetchone()
+            # Lotes chicos pesan menos que una indexación completa
+            peso = min(textos / 256, 1.0)
+            promedio = medido if fila is None else fila[0] * (1 - peso) + medido * peso
+            self._conn.execute("INSERT OR REPLACE INTO costo VALUES (?, ?)", (modelo, promedio))
+            self._conn.commit()
+
+    def costo_por_texto(self, modelo: str) -> Optional[float]:
+        """Segundos por texto medidos para el modelo (None si todavía no se codificó nada)"""
+        with self._lock:
+            fila = self._conn.execute(
+                "SELECT segundos_por_texto FROM costo WHERE modelo = ?", (modelo,)
+            ).fetchone()
+        return fila[0] if fila else None
+
+
+def obtener_cache_embeddings() -> Optional[CacheEmbeddings]:
+    """Instancia compartida de la caché (None si está desactivada en config)"""
+    return instancia_compartida(CacheEmbeddings, 'EMBEDDINGS_CACHE_ACTIVA', 'EMBEDDINGS_CACHE_ARCHIVO')
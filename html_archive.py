@@ -0,0 +1,162 @@
+# ================================================================================
+# html_archive.py - ARCHIVO COMPRIMIDO DEL HTML CRUDO DE LAS NOTICIAS
+# ================================================================================
+#
+# Cada cuerpo descargado se agrega (append-only) a un segmento gzip como un
+# miembro independiente; un índice SQLite guarda por URL el segmento, offset y
+# longitud comprimida. Así se puede volver a extraer el texto (nuevos
+# selectores, otro límite de caracteres) sin tocar la red: ver reextraer.py.
+#
+#   cache/html/seg-00001.gz, seg-00002.gz, ...   (miembros gzip concatenados)
+#   cache/html/indice.sqlite3                     (url → segmento, offset, longitud)
+#
+# ================================================================================
+
+import os
+import gzip
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class ArchivoHTML:
+    """Archivo append-only de respuestas HTML en segmentos gzip"""
+
+    def __init__(self, directorio: str, tam_segmento: int = 64 * 1024 * 1024):
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.tam_segmento = tam_segmento
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directorio, "indice.sqlite3"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS paginas (
+                url TEXT PRIMARY KEY,
+                segmento INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                longitud INTEGER NOT NULL,
+                bytes INTEGER NOT NULL,
+                sha1 TEXT NOT NULL,
+                guardado REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+        fila = self._conn.execute("SELECT MAX(segmento) FROM paginas").fetchone()
+        self._segmento = fila[0] or 1
+
+    def ruta_segmento(self, segmento: int) -> str:
+        return os.path.join(self.directorio, f"seg-{segmento:05d}.gz")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM paginas").fetchone()[0]
+
+    def guardar(self, url: str, cuerpo: bytes) -> bool:
+        """
+        Agrega el cuerpo al segmento actual. Si es idéntico al ya archivado
+        para esa URL no se escribe nada.
+
+        Returns:
+            True si se escribió un registro nuevo.
+        """
+        if not cuerpo:
+            return False
+
+        huella = hashlib.sha1(cuerpo).hexdigest()
+        # Compresión fuera del lock: es lo costoso
+        comprimido = gzip.compress(cuerpo, compresslevel=6)
+
+        with self._lock:
+            fila = self._conn.execute("SELECT sha1 FROM paginas WHERE url = ?", (url,)).fetchone()
+            if fila and fila[0] == huella:
+                return False
+
+            ruta = self.ruta_segmento(self._segmento)
+            if os.path.exists(ruta) and os.path.getsize(ruta) >= self.tam_segmento:
+                self._segmento += 1
+                ruta = self.ruta_segmento(self._segmento)
+
+            with open(ruta, 'ab') as f:
+                offset = f.tell()
+                f.write(comprimido)
+
+            # La versión anterior queda en su segmento, pero el índice apunta a la última
+            self._conn.execute(
+                "INSERT OR REPLACE INTO paginas (url, segmento, offset, longitud, bytes, sha1, guardado) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, self._segmento, offset, len(comprimido), len(cuerpo), huella, time.time())
+            )
+            self._conn.commit()
+        return True
+
+    def ubicacion(self, url: str) -> Optional[Tuple[int, int, int]]:
+        """(segmento, offset, longitud) del último cuerpo archivado para la URL"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT segmento, offset, longitud FROM paginas WHERE url = ?", (url,)
+            ).fetchone()
+
+    def leer(self, url: str) -> Optional[bytes]:
+        """Cuerpo crudo archivado para la URL (o None)"""
+        ubicacion = self.ubicacion(url)
+        if ubicacion is None:
+            return None
+        return leer_registro(self.directorio, *ubicacion)
+
+    def entradas(self) -> List[Tuple[str, int, int, int]]:
+        """(url, segmento, offset, longitud) de todo el archivo, ordenado por posición"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT url, segmento, offset, longitud FROM paginas ORDER BY segmento, offset"
+            ).fetchall()
+
+    def estadisticas(self) -> Dict:
+        with self._lock:
+            paginas, crudos, comprimidos = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0), COALESCE(SUM(longitud), 0) FROM paginas"
+            ).fetchone()
+        return {
+            'paginas': paginas,
+            'segmentos': self._segmento,
+            'bytes_crudos': crudos,
+            'bytes_comprimidos': comprimidos,
+            'ratio': round(crudos / comprimidos, 2) if comprimidos else 0.0
+        }
+
+
+def leer_registro(directorio: str, segmento: int, offset: int, longitud: int) -> bytes:
+    """Lee y descomprime un registro (función suelta: se usa desde otros procesos)"""
+    with open(os.path.join(directorio, f"seg-{segmento:05d}.gz"), 'rb') as f:
+        f.seek(offset)
+        return gzip.decompress(f.read(longitud))
+
+
+def iterar_segmento(directorio: str, segmento: int,
+                    registros: List[Tuple[str, int, int]]) -> Iterator[Tuple[str, bytes]]:
+    """Lee varios registros (url, offset, longitud) de un mismo segmento con un solo open"""
+    with open(os.path.join(directorio, f"seg-{segmento:05d}.gz"), 'rb') as f:
+        for url, offset, longitud in registros:
+            f.seek(offset)
+            yield url, gzip.decompress(f.read(longitud))
+
+
+_ARCHIVO = None
+_ARCHIVO_LOCK = threading.Lock()
+
+
+def obtener_archivo_html() -> Optional[ArchivoHTML]:
+    """Instancia compartida del archivo (None si está desactivado)"""
+    global _ARCHIVO
+    import config
+
+    if not config.HTML_ARCHIVO_ACTIVO:
+        return None
+
+    with _ARCHIVO_LOCK:
+        if _ARCHIVO is None:
+            _ARCHIVO = ArchivoHTML(config.HTML_ARCHIVO_DIR, config.HTML_ARCHIVO_TAM_SEGMENTO)
+    return _ARCHIVO
@@ -0,0 +1,159 @@
+# ================================================================================
+# http_cache.py - CACHÉ HTTP CONDICIONAL (ETag / Last-Modified)
+# ================================================================================
+
+import os
+import time
+import zlib
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+
+class CacheHTTP:
+    """
+    Caché en disco (SQLite) de páginas de noticias.
+
+    Guarda los validadores (ETag / Last-Modified), el cuerpo comprimido y el
+    texto ya extraído de cada URL. En la siguiente descarga se envían
+    `If-None-Match` / `If-Modified-Since`; si el servidor responde 304 se
+    reutiliza el texto guardado sin volver a parsear la página.
+    """
+
+    def __init__(self, ruta: str):
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(ruta, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS paginas (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                cuerpo BLOB,
+                bytes INTEGER,
+                texto TEXT,
+                actualizado REAL
+            )
+        """)
+        self._conn.commit()
+        self.reiniciar_estadisticas()
+
+    def reiniciar_estadisticas(self):
+        """Pone a cero los contadores (se llama al inicio de cada refresco)"""
+        with self._lock:
+            self._stats = {
+                'consultas': 0,
+                'hits': 0,            # 304: se reutilizó el texto guardado
+                'misses': 0,          # URL sin entrada en caché
+                'revalidaciones': 0,  # peticiones condicionales enviadas
+                'bytes_descargados': 0,
+                'bytes_ahorrados': 0
+            }
+
+    def buscar(self, url: str) -> Optional[Dict]:
+        """Devuelve la entrada guardada para la URL (o None)"""
+        with self._lock:
+            self._stats['consultas'] += 1
+            fila = self._conn.execute(
+                "SELECT etag, last_modified, bytes, texto FROM paginas WHERE url = ?",
+                (url,)
+            ).fetchone()
+
+            if not fila:
+                self._stats['misses'] += 1
+                return None
+
+        etag, last_modified, num_bytes, texto = fila
+        return {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'bytes': num_bytes or 0,
+            'texto': texto or ""
+        }
+
+    def cabeceras_condicionales(self, entrada: Optional[Dict]) -> Dict[str, str]:
+        """Cabeceras If-None-Match / If-Modified-Since para una entrada"""
+        cabeceras = {}
+        if not entrada:
+            return cabeceras
+
+        if entrada.get('etag'):
+            cabeceras['If-None-Match'] = entrada['etag']
+        if entrada.get('last_modified'):
+            cabeceras['If-Modified-Since'] = entrada['last_modified']
+
+        if cabeceras:
+            with self._lock:
+                self._stats['revalidaciones'] += 1
+        return cabeceras
+
+    def registrar_consulta(self, encontrada: bool, revalidada: bool):
+        """Contabiliza una búsqueda hecha en otro proceso (trabajadores del crawl distribuido)"""
+        with self._lock:
+            self._stats['consultas'] += 1
+            if not encontrada:
+                self._stats['misses'] += 1
+            if revalidada:
+                self._stats['revalidaciones'] += 1
+
+    def registrar_no_modificado(self, entrada: Dict):
+        """Contabiliza un 304 (el cuerpo guardado sigue siendo válido)"""
+        with self._lock:
+            self._stats['hits'] += 1
+            self._stats['bytes_ahorrados'] += entrada.get('bytes', 0)
+
+    def guardar(self, url: str, response, texto: str):
+        """Guarda validadores, cuerpo y texto extraído de una respuesta 200"""
+        cuerpo = response.content or b""
+        with self._lock:
+            self._stats['bytes_descargados'] += len(cuerpo)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO paginas VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                    zlib.compress(cuerpo),
+                    len(cuerpo),
+                    texto,
+                    time.time()
+                )
+            )
+            self._conn.commit()
+
+    def actualizar_texto(self, url: str, texto: str):
+        """Reemplaza el texto extraído guardado (p. ej. tras una re-extracción)"""
+        with self._lock:
+            self._conn.execute("UPDATE paginas SET texto = ? WHERE url = ?", (texto, url))
+            self._conn.commit()
+
+    def estadisticas(self) -> Dict:
+        """Contadores del último refresco"""
+        with self._lock:
+            stats = dict(self._stats)
+        consultas = stats['consultas']
+        stats['tasa_hits'] = round(stats['hits'] / consultas, 3) if consultas else 0.0
+        return stats
+
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+def obtener_cache_http() -> Optional[CacheHTTP]:
+    """Instancia compartida de la caché (None si está desactivada en config)"""
+    global _CACHE
+    import config
+
+    if not config.HTTP_CACHE_ACTIVO:
+        return None
+
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = CacheHTTP(config.HTTP_CACHE_ARCHIVO)
+    return _CACHE
@@ -0,0 +1,173 @@
+# ================================================================================
+# http_fixtures.py - GRABACIÓN / REPRODUCCIÓN DE RESPUESTAS HTTP (MODO OFFLINE)
+# ================================================================================
+
+import os
+import gzip
+import json
+import time
+import base64
+import random
+import atexit
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Cabeceras que vale la pena conservar en el archivo
+CABECERAS_GUARDADAS = ('Content-Type', 'ETag', 'Last-Modified', 'Retry-After')
+
+
+class ArchivoFixtures:
+    """
+    Archivo compacto de respuestas HTTP (JSON lines comprimido con gzip).
+
+    Cada línea guarda url, status, cabeceras relevantes y el cuerpo en base64.
+    Si una URL se graba varias veces, prevalece la última respuesta.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.respuestas: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def cargar(self) -> "ArchivoFixtures":
+        with gzip.open(self.ruta, 'rt', encoding='utf-8') as f:
+            for linea in f:
+                if linea.strip():
+                    registro = json.loads(linea)
+                    self.respuestas[registro['url']] = registro
+        return self
+
+    def agregar(self, url: str, status: int, cabeceras, cuerpo: bytes):
+        registro = {
+            'url': url,
+            'status': status,
+            'headers': {k: cabeceras[k] for k in CABECERAS_GUARDADAS if k in cabeceras},
+            'body': base64.b64encode(cuerpo or b"").decode('ascii')
+        }
+        with self._lock:
+            self.respuestas[url] = registro
+
+    def guardar(self):
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        with self._lock:
+            registros = list(self.respuestas.values())
+        with gzip.open(self.ruta, 'wt', encoding='utf-8') as f:
+            for registro in registros:
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        print(f"💾 Fixtures HTTP: {len(registros)} respuestas guardadas en {self.ruta}")
+
+
+class AdaptadorGrabacion(HTTPAdapter):
+    """HTTPAdapter normal que además guarda cada respuesta en el archivo"""
+
+    def __init__(self, archivo: ArchivoFixtures, **kwargs):
+        super().__init__(**kwargs)
+        self.archivo = archivo
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        # Solo grabamos respuestas completas (un 304 depende de la caché local)
+        if response.status_code != 304:
+            self.archivo.agregar(request.url, response.status_code, response.headers, response.content)
+        return response
+
+
+class AdaptadorReproduccion(BaseAdapter):
+    """
+    Servidor local de reemplazo: responde desde el archivo sin tocar la red.
+
+    Permite simular latencia (media + jitter, en milisegundos) e inyectar
+    errores (503 o fallos de conexión) con una probabilidad dada.
+    """
+
+    def __init__(self, archivo: ArchivoFixtures, latencia_ms: float = 0.0,
+                 jitter_ms: float = 0.0, tasa_error: float = 0.0, semilla: Optional[int] = None):
+        super().__init__()
+        self.archivo = archivo
+        self.latencia_ms = latencia_ms
+        self.jitter_ms = jitter_ms
+        self.tasa_error = tasa_error
+        self._random = random.Random(semilla)
+        self._lock = threading.Lock()
+        self.servidas = 0
+        self.errores_inyectados = 0
+        self.no_encontradas = 0
+
+    def _azar(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if self.latencia_ms or self.jitter_ms:
+            demora = self.latencia_ms + (self._azar() * 2 - 1) * self.jitter_ms
+            time.sleep(max(demora, 0.0) / 1000)
+
+        if self.tasa_error and self._azar() < self.tasa_error:
+            self.errores_inyectados += 1
+            if self._azar() < 0.5:
+                raise requests.ConnectionError(f"Error inyectado en {request.url}")
+            return self._respuesta(request, 503, {}, b"")
+
+        registro = self.archivo.respuestas.get(request.url)
+        if registro is None:
+            self.no_encontradas += 1
+            return self._respuesta(request, 404, {}, b"")
+
+        self.servidas += 1
+        cabeceras = registro.get('headers', {})
+        etag = cabeceras.get('ETag')
+        if etag and request.headers.get('If-None-Match') == etag:
+            return self._respuesta(request, 304, cabeceras, b"")
+
+        return self._respuesta(request, registro['status'], cabeceras, base64.b64decode(registro['body']))
+
+    def _respuesta(self, request, status: int, cabeceras: Dict, cuerpo: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(cabeceras)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = cuerpo
+        response.url = request.url
+        response.request = request
+        response.reason = "Replay"
+        return response
+
+    def close(self):
+        pass
+
+
+def instalar_fixtures(session: requests.Session, modo: str, ruta: str,
+                      latencia_ms: float = 0.0, jitter_ms: float = 0.0,
+                      tasa_error: float = 0.0, **kwargs_adaptador):
+    """
+    Monta el adaptador de grabación o de reproducción en una sesión.
+
+    Args:
+        modo: "grabar" o "reproducir" (cualquier otro valor no hace nada)
+        kwargs_adaptador: parámetros del HTTPAdapter real en modo grabación
+
+    Returns:
+        El adaptador montado (o None)
+    """
+    if modo == "grabar":
+        archivo = ArchivoFixtures(ruta)
+        adaptador = AdaptadorGrabacion(archivo, **kwargs_adaptador)
+        atexit.register(archivo.guardar)
+    elif modo == "reproducir":
+        archivo = ArchivoFixtures(ruta).cargar()
+        adaptador = AdaptadorReproduccion(archivo, latencia_ms, jitter_ms, tasa_error)
+        print(f"📼 Fixtures HTTP: reproduciendo {len(archivo.respuestas)} respuestas de {ruta}")
+    else:
+        return None
+
+    session.mount("https://", adaptador)
+    session.mount("http://", adaptador)
+    return adaptador
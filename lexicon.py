@@ -0,0 +1,205 @@
+# ================================================================================
+# lexicon.py - LÉXICO DE SENTIMIENTO (PALABRAS CLAVE BOLIVIANAS)
+# ================================================================================
+#
+# Las palabras clave del sistema híbrido (sentiment.py) se compilan una sola
+# vez en una expresión regular con forma de trie, y cada texto se recorre en
+# UNA pasada que devuelve cuántos términos negativos y positivos distintos
+# contiene. El conteo es exactamente el de buscar cada término por separado
+# con `\b término \b`:
+#
+#   - La búsqueda va dentro de un lookahead, así que se prueba en cada
+#     posición y los términos que se solapan ("abuso" / "abuso sexual") se
+#     encuentran todos.
+#   - En cada posición el trie devuelve el término más largo; los términos
+#     que son prefijo de él y terminan en límite de palabra
+#     ("violencia" en "violencia de género") se suman con un conjunto
+#     precalculado por término.
+#
+# El léxico se puede recargar en caliente: con LEXICO_ARCHIVO (JSON con
+# "negativas" y "positivas") se relee cuando cambia el archivo, o a mano con
+# recargar_lexico().
+#
+# ================================================================================
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+# Léxico por defecto (si no hay LEXICO_ARCHIVO)
+PALABRAS_NEGATIVAS = {
+    'muerte', 'falleció', 'fallecimiento', 'accidente', 'tragedia',
+    'bloqueo', 'protesta', 'enfrentamiento', 'represión', 'huelga',
+    'inundación', 'desastre', 'crisis', 'delincuencia', 'corrupción',
+    'violencia', 'robo', 'asesinato', 'homicidio', 'secuestro',
+    'pandemia', 'fallece', 'se accidentó', 'muerto', 'herido',
+    'víctima', 'victimas', 'víctimas', 'ataque', 'amenaza', 'denuncia', 'conflicto',
+    'feminicidio', 'abuso', 'abuso sexual', 'violencia de género'
+}
+
+PALABRAS_POSITIVAS = {
+    'ganó', 'triunfo', 'campeón', 'clasificó', 'acuerdo',
+    'celebración', 'inauguración', 'construcción', 'crecimiento',
+    'paz', 'seguridad', 'desarrollo', 'progreso', 'mejora',
+    'éxito', 'victoria', 'inauguró', 'concluyó', 'completó',
+    'superó', 'logro', 'récord', 'premio', 'reconocimiento',
+    'avance', 'beneficio', 'esperanza', 'solución', 'acuerdo'
+}
+
+
+def _patron_trie(terminos: Iterable[str]) -> str:
+    """
+    Alternativa de todos los términos factorizada por prefijos. En cada nodo
+    se prueban primero las continuaciones y al final "terminar aquí", así que
+    gana el término más largo (y si el límite de palabra falla, se retrocede
+    al siguiente más corto).
+    """
+    trie: Dict = {}
+    for termino in terminos:
+        nodo = trie
+        for caracter in termino:
+            nodo = nodo.setdefault(caracter, {})
+        nodo[''] = {}
+
+    def armar(nodo: Dict) -> str:
+        ramas = [re.escape(c) + armar(hijo) for c, hijo in sorted(nodo.items()) if c]
+        if not ramas:
+            return ''
+        cuerpo = ramas[0] if len(ramas) == 1 else '(?:' + '|'.join(ramas) + ')'
+        if '' in nodo:
+            return '(?:' + cuerpo + ')?'
+        return cuerpo
+
+    return armar(trie)
+
+
+class LexicoSentimiento:
+    """Términos negativos y positivos compilados para contarlos en una sola pasada"""
+
+    def __init__(self, negativas: Iterable[str], positivas: Iterable[str]):
+        self.negativas: FrozenSet[str] = frozenset(t.strip().lower() for t in negativas if t.strip())
+        self.positivas: FrozenSet[str] = frozenset(t.strip().lower() for t in positivas if t.strip())
+        terminos = self.negativas | self.positivas
+
+        # Identifica el léxico (claves de la caché de sentimientos, estadísticas)
+        self.version = hashlib.sha1(json.dumps(
+            [sorted(self.negativas), sorted(self.positivas)], ensure_ascii=False
+        ).encode('utf-8')).hexdigest()[:12]
+
+        self._patron = re.compile(r'(?=\b(' + _patron_trie(terminos) + r')\b)') if terminos else None
+
+        # Término más largo encontrado → términos que cuentan (él y sus prefijos de palabra completa)
+        self._implicados: Dict[str, FrozenSet[str]] = {}
+        for termino in terminos:
+            self._implicados[termino] = frozenset(
+                otro for otro in terminos
+                if termino.startswith(otro) and re.match(re.escape(otro) + r'\b', termino)
+            ) | {termino}
+
+    def __len__(self) -> int:
+        return len(self.negativas | self.positivas)
+
+    def __repr__(self) -> str:
+        return f"<LexicoSentimiento {len(self.negativas)} negativas, {len(self.positivas)} positivas ({self.version})>"
+
+    def terminos_en(self, texto_lower: str) -> FrozenSet[str]:
+        """Términos distintos del léxico presentes (como palabra completa) en un texto ya en minúsculas"""
+        if self._patron is None:
+            return frozenset()
+        mas_largos = {m.group(1) for m in self._patron.finditer(texto_lower)}
+        return frozenset().union(*(self._implicados[t] for t in mas_largos))
+
+    def contar(self, texto_lower: str) -> Tuple[int, int]:
+        """(términos negativos, términos positivos) distintos de un texto ya en minúsculas"""
+        encontrados = self.terminos_en(texto_lower)
+        if not encontrados:
+            return 0, 0
+        return len(encontrados & self.negativas), len(encontrados & self.positivas)
+
+
+# ================================================================================
+# LÉXICO ACTIVO (RECARGA EN CALIENTE)
+# ================================================================================
+
+_LEXICO: Optional[LexicoSentimiento] = None
+_ARCHIVO = {'ruta': None, 'mtime': None, 'revisado': 0.0}
+_LOCK = threading.Lock()
+
+
+def _leer_archivo(ruta: str) -> LexicoSentimiento:
+    with open(ruta, 'r', encoding='utf-8') as f:
+        datos = json.load(f)
+    return LexicoSentimiento(datos.get('negativas', []), datos.get('positivas', []))
+
+
+def _revisar_archivo():
+    """Recarga el léxico si LEXICO_ARCHIVO cambió (como mucho cada LEXICO_REVISION segundos)"""
+    global _LEXICO
+    from config import LEXICO_ARCHIVO, LEXICO_REVISION
+
+    ahora = time.monotonic()
+    if LEXICO_ARCHIVO == _ARCHIVO['ruta'] and ahora - _ARCHIVO['revisado'] < LEXICO_REVISION:
+        return
+    _ARCHIVO['revisado'] = ahora
+
+    try:
+        mtime = os.path.getmtime(LEXICO_ARCHIVO)
+    except OSError:
+        mtime = None
+    if LEXICO_ARCHIVO == _ARCHIVO['ruta'] and mtime == _ARCHIVO['mtime']:
+        return
+
+    _ARCHIVO['ruta'], _ARCHIVO['mtime'] = LEXICO_ARCHIVO, mtime
+    if mtime is None:
+        print(f"⚠️ No se encontró el léxico {LEXICO_ARCHIVO}, se usa el léxico por defecto")
+        _LEXICO = LexicoSentimiento(PALABRAS_NEGATIVAS, PALABRAS_POSITIVAS)
+        return
+    try:
+        _LEXICO = _leer_archivo(LEXICO_ARCHIVO)
+        print(f"📖 Léxico de sentimientos cargado: {_LEXICO}")
+    except (OSError, ValueError, AttributeError) as e:
+        # Un archivo a medio escribir o inválido no tumba el análisis: se queda el léxico anterior
+        print(f"⚠️ Léxico inválido en {LEXICO_ARCHIVO}, se mantiene el actual: {e}")
+        if _LEXICO is None:
+            _LEXICO = LexicoSentimiento(PALABRAS_NEGATIVAS, PALABRAS_POSITIVAS)
+
+
+def obtener_lexico() -> LexicoSentimiento:
+    """Léxico activo (el de LEXICO_ARCHIVO si está configurado, recargado si cambió)"""
+    global _LEXICO
+    from config import LEXICO_ARCHIVO
+
+    if LEXICO_ARCHIVO:
+        with _LOCK:
+            _revisar_archivo()
+    elif _LEXICO is None or _ARCHIVO['ruta'] is not None:
+        with _LOCK:
+            _ARCHIVO['ruta'] = None
+            _LEXICO = LexicoSentimiento(PALABRAS_NEGATIVAS, PALABRAS_POSITIVAS)
+    return _LEXICO
+
+
+def recargar_lexico(negativas: Optional[Iterable[str]] = None,
+                    positivas: Optional[Iterable[str]] = None) -> LexicoSentimiento:
+    """
+    Reemplaza el léxico activo. Sin argumentos vuelve a leer LEXICO_ARCHIVO (o
+    el léxico por defecto); con listas, las usa hasta la próxima recarga.
+    """
+    global _LEXICO
+    from config import LEXICO_ARCHIVO
+
+    with _LOCK:
+        if negativas is None and positivas is None:
+            _ARCHIVO['ruta'] = _ARCHIVO['mtime'] = None
+            _ARCHIVO['revisado'] = 0.0
+            if LEXICO_ARCHIVO:
+                _revisar_archivo()
+            else:
+                _LEXICO = LexicoSentimiento(PALABRAS_NEGATIVAS, PALABRAS_POSITIVAS)
+        else:
+            _LEXICO = LexicoSentimiento(negativas or [], positivas or [])
+    return _LEXICO
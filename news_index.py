@@ -0,0 +1,110 @@
+# ================================================================================
+# news_index.py - ÍNDICE PERSISTENTE DE NOTICIAS YA PROCESADAS
+# ================================================================================
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class IndiceNoticias:
+    """
+    Índice en disco (SQLite) de las noticias ya scrapeadas.
+
+    Por cada URL guarda la noticia completa (título, contenido, resumen y
+    campos de sentimiento) para que un refresco incremental solo descargue
+    las entradas nuevas de los listados y el corpus sobreviva a reinicios.
+    """
+
+    def __init__(self, ruta: str):
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(ruta, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS noticias (
+                url TEXT PRIMARY KEY,
+                datos TEXT NOT NULL,
+                agregado REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_agregado ON noticias (agregado)")
+        # URLs descartadas como duplicado de otra noticia del índice
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS alias (
+                url TEXT PRIMARY KEY,
+                canonica TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM noticias").fetchone()[0]
+
+    def urls(self) -> Set[str]:
+        """Conjunto de URLs ya procesadas (incluye las descartadas por duplicadas)"""
+        with self._lock:
+            return {fila[0] for fila in self._conn.execute("SELECT url FROM noticias UNION SELECT url FROM alias")}
+
+    def guardar_alias(self, pares: List[Tuple[str, str]]):
+        """Registra pares (url duplicada, url canónica)"""
+        if not pares:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO alias (url, canonica) VALUES (?, ?)", pares)
+            self._conn.commit()
+
+    def guardar(self, noticias: List[Dict]):
+        """Inserta o actualiza noticias (conserva la fecha de alta original)"""
+        if not noticias:
+            return
+
+        ahora = time.time()
+        with self._lock:
+            for i, noticia in enumerate(noticias):
+                datos = json.dumps(noticia, ensure_ascii=False)
+                # Orden estable: las primeras de la lista quedan como más recientes
+                agregado = ahora - i * 1e-6
+                self._conn.execute(
+                    "INSERT INTO noticias (url, datos, agregado) VALUES (?, ?, ?) "
+                    "ON CONFLICT(url) DO UPDATE SET datos = excluded.datos",
+                    (noticia['url'], datos, agregado)
+                )
+            self._conn.commit()
+
+    def cargar(self, limite: Optional[int] = None) -> List[Dict]:
+        """Devuelve las noticias guardadas, de la más reciente a la más antigua"""
+        consulta = "SELECT datos FROM noticias ORDER BY agregado DESC"
+        parametros = ()
+        if limite:
+            consulta += " LIMIT ?"
+            parametros = (limite,)
+
+        with self._lock:
+            filas = self._conn.execute(consulta, parametros).fetchall()
+        return [json.loads(fila[0]) for fila in filas]
+
+
+_INDICE = None
+_INDICE_LOCK = threading.Lock()
+
+
+def obtener_indice_noticias() -> Optional[IndiceNoticias]:
+    """Instancia compartida del índice (None si el modo incremental está desactivado)"""
+    global _INDICE
+    import config
+
+    if not config.SCRAPING_INCREMENTAL:
+        return None
+
+    with _INDICE_LOCK:
+        if _INDICE is None:
+            _INDICE = IndiceNoticias(config.INDICE_NOTICIAS_ARCHIVO)
+    return _INDICE
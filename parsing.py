@@ -0,0 +1,271 @@
+# ================================================================================
+# parsing.py - ETAPA DE PARSEO HTML (listados y cuerpos de noticias)
+# ================================================================================
+#
+# Funciones puras que reciben los bytes crudos de una respuesta y devuelven
+# registros extraídos. No dependen de la red ni del estado global, así que
+# pueden ejecutarse en un pool de procesos separado del I/O.
+#
+# ================================================================================
+
+from typing import List, Optional, Tuple
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Lista de selectores posibles para el cuerpo de la nota (en orden de prioridad)
+SELECTORES_CUERPO = ['text-editor', 'nota-body', 'cuerpo-nota', 'article-body', 'content-body']
+
+# 'lxml-xpath' extrae el cuerpo con lxml directo (sin construir el árbol de bs4);
+# los listados se siguen parseando con bs4 sobre lxml.
+BACKENDS = ('html.parser', 'lxml', 'lxml-xpath')
+
+# Tags cuyo texto bs4 no incluye en get_text()
+_TAGS_SIN_TEXTO = {'script', 'style', 'template'}
+
+
+def backend_disponible(backend: str) -> str:
+    """Devuelve el backend pedido si está instalado; si no, 'html.parser'"""
+    if backend in ('lxml', 'lxml-xpath'):
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            return 'html.parser'
+    return backend if backend in BACKENDS else 'html.parser'
+
+
+def _clases(attrs) -> List[str]:
+    """Clases de un tag tal como llegan al SoupStrainer (str o lista)"""
+    clases = attrs.get('class', '') if attrs else ''
+    if isinstance(clases, str):
+        return clases.split()
+    return list(clases)
+
+
+def _es_cuerpo(nombre, attrs=None, clases=SELECTORES_CUERPO, article: bool = True) -> bool:
+    """Filtro de parseo parcial: solo <article> y los <div> de los selectores"""
+    if nombre == 'article':
+        return article
+    return nombre == 'div' and any(c in clases for c in _clases(attrs))
+
+
+class _FiltroCuerpo(SoupStrainer):
+    """SoupStrainer que conserva <article> y los <div> de las clases indicadas"""
+
+    def __init__(self, clases=SELECTORES_CUERPO, article: bool = True):
+        self.clases = tuple(clases)
+        self.article = article
+        # bs4 < 4.13 llama a la función con (nombre, attrs)
+        super().__init__(lambda nombre, attrs=None: _es_cuerpo(nombre, attrs, self.clases, self.article))
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        # bs4 >= 4.13 decide qué tags construir con este método
+        return _es_cuerpo(name, attrs, self.clases, self.article)
+
+
+# Se construyen una sola vez por proceso
+FILTRO_LISTADO = SoupStrainer('article', class_='nota')
+FILTRO_CUERPO = _FiltroCuerpo()
+
+# Cadena completa de selectores del cuerpo, en orden ('article' es el último recurso)
+SELECTOR_RESPALDO = 'article'
+CADENA_SELECTORES = list(SELECTORES_CUERPO) + [SELECTOR_RESPALDO]
+_FILTROS_PREFIJO = {}
+
+
+def _prefijo(preferido: str) -> List[str]:
+    """Tramo de la cadena hasta el selector preferido, inclusive (los de mayor prioridad primero)"""
+    return CADENA_SELECTORES[:CADENA_SELECTORES.index(preferido) + 1]
+
+
+def _filtro_prefijo(preferido: str) -> _FiltroCuerpo:
+    """Filtro que solo construye los selectores hasta el preferido (uno por selector y proceso)"""
+    if preferido not in _FILTROS_PREFIJO:
+        _FILTROS_PREFIJO[preferido] = _FiltroCuerpo(_prefijo(preferido), article=False)
+    return _FILTROS_PREFIJO[preferido]
+
+
+def _sopa(html, backend: str, filtro: Optional[SoupStrainer], encoding: Optional[str]) -> BeautifulSoup:
+    opciones = {'parse_only': filtro} if filtro is not None else {}
+    if isinstance(html, bytes) and encoding:
+        opciones['from_encoding'] = encoding
+    backend = backend_disponible(backend)
+    return BeautifulSoup(html, 'lxml' if backend == 'lxml-xpath' else backend, **opciones)
+
+
+def datos_listado(art) -> Optional[Tuple[str, str]]:
+    """Obtiene (titulo, enlace absoluto) de un <article class="nota"> del listado de El Deber"""
+    tag_titulo = art.find('h2', class_='nota__titulo-item')
+
+    if tag_titulo and tag_titulo.find('a'):
+        enlace = tag_titulo.find('a')['href']
+        titulo = tag_titulo.get_text(strip=True)
+
+        if not enlace.startswith('http'):
+            enlace = "https://eldeber.com.bo" + enlace
+
+        return titulo, enlace
+    return None
+
+
+def parsear_listado(html, encoding: Optional[str] = None, backend: str = 'html.parser',
+                    parcial: bool = True) -> List[Tuple[str, str]]:
+    """
+    Devuelve las entradas (titulo, enlace) de una página de listado.
+
+    Args:
+        html: bytes crudos (o str) de la página
+        encoding: codificación declarada por el servidor (None = detectar)
+        backend: 'html.parser' o 'lxml'
+        parcial: construir solo los <article class="nota"> (SoupStrainer)
+    """
+    soup = _sopa(html, backend, FILTRO_LISTADO if parcial else None, encoding)
+    entradas = []
+    for art in soup.find_all('article', class_='nota'):
+        try:
+            datos = datos_listado(art)
+        except Exception:
+            datos = None
+        if datos:
+            entradas.append(datos)
+    return entradas
+
+
+def parsear_enlaces(html, selector_css: str, encoding: Optional[str] = None,
+                    backend: str = 'html.parser') -> List[Tuple[str, str]]:
+    """
+    Entradas (titulo, href tal cual) de los <a> que cumplen un selector CSS
+    (listados de fuentes genéricas, ver sources.FuenteSelectores).
+    """
+    soup = _sopa(html, backend, None, encoding)
+    entradas = []
+    vistos = set()
+    for enlace in soup.select(selector_css):
+        href = enlace.get('href')
+        titulo = enlace.get_text(strip=True)
+        if href and titulo and href not in vistos:
+            vistos.add(href)
+            entradas.append((titulo, href))
+    return entradas
+
+
+def _texto_lxml(elemento) -> str:
+    """Equivalente a bs4 `get_text(strip=True)` sobre un elemento de lxml"""
+    partes = []
+
+    def visitar(nodo):
+        # Comentarios e instrucciones tienen `tag` no textual: solo cuenta su cola
+        if isinstance(nodo.tag, str) and nodo.tag not in _TAGS_SIN_TEXTO:
+            if nodo.text:
+                partes.append(nodo.text)
+            for hijo in nodo:
+                visitar(hijo)
+                if hijo.tail:
+                    partes.append(hijo.tail)
+
+    visitar(elemento)
+    return "".join(t.strip() for t in partes if t.strip())
+
+
+def _limpiar_parrafos(textos) -> str:
+    """Filtra textos muy cortos o irrelevantes y limita a 1500 chars para no exceder contexto"""
+    return " ".join(t for t in textos if len(t) > 30 and "Lee también" not in t)[:1500]
+
+
+def _buscar_lxml(raiz, selectores: List[str]):
+    for selector in selectores:
+        if selector == 'article':
+            encontrados = raiz.xpath('//article')
+        else:
+            encontrados = raiz.xpath(
+                f'//div[contains(concat(" ", normalize-space(@class), " "), " {selector} ")]'
+            )
+        if encontrados:
+            return encontrados[0], selector
+    return None, None
+
+
+def _extraer_cuerpo_lxml(html, encoding: Optional[str], preferido: Optional[str]) -> Tuple[str, Optional[str]]:
+    """Misma extracción que con bs4, con XPath sobre lxml (varias veces más rápida)"""
+    import lxml.html
+
+    if isinstance(html, bytes):
+        parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+        raiz = lxml.html.fromstring(html, parser=parser) if html.strip() else None
+    else:
+        raiz = lxml.html.fromstring(html) if html.strip() else None
+    if raiz is None:
+        return "", None
+
+    # La cadena en orden: el preferido solo corta la búsqueda antes del respaldo
+    prefijo = _prefijo(preferido) if preferido else []
+    cuerpo, selector = _buscar_lxml(raiz, prefijo) if prefijo else (None, None)
+    if cuerpo is None:
+        cuerpo, selector = _buscar_lxml(raiz, CADENA_SELECTORES[len(prefijo):])
+    if cuerpo is None:
+        return "", None
+
+    return _limpiar_parrafos(_texto_lxml(p) for p in cuerpo.iter('p') if p is not cuerpo), selector
+
+
+def _buscar_bs4(soup: BeautifulSoup, selectores: List[str]):
+    for selector in selectores:
+        if selector == 'article':
+            cuerpo = soup.find('article')
+        else:
+            cuerpo = soup.find('div', class_=selector)
+        if cuerpo:
+            return cuerpo, selector
+    return None, None
+
+
+def extraer_cuerpo_con_selector(html, encoding: Optional[str] = 'utf-8', preferido: Optional[str] = None,
+                                backend: str = 'html.parser', parcial: bool = True) -> Tuple[str, Optional[str]]:
+    """
+    Extrae el cuerpo de una noticia y dice qué selector lo encontró.
+
+    Si se indica `preferido` (el que funcionó antes para ese tipo de URL) se
+    prueba la cadena solo hasta él, y con parseo parcial solo se construyen
+    esos selectores (nunca el <article> completo). Como se respeta el orden,
+    el resultado es siempre el de la cadena completa; el resto de la cadena
+    se recorre solo si ninguno aparece.
+
+    Returns:
+        (texto, selector) — selector es None si no se encontró cuerpo.
+    """
+    # Un selector aprendido que ya no está en la cadena (se cambió la lista) se
+    # ignora, y el respaldo no se usa como preferido (coincide en casi toda página)
+    if preferido not in CADENA_SELECTORES or preferido == SELECTOR_RESPALDO:
+        preferido = None
+
+    if backend_disponible(backend) == 'lxml-xpath':
+        return _extraer_cuerpo_lxml(html, encoding, preferido)
+
+    cuerpo = selector = None
+    prefijo = _prefijo(preferido) if preferido else []
+    if prefijo:
+        soup = _sopa(html, backend, _filtro_prefijo(preferido) if parcial else None, encoding)
+        cuerpo, selector = _buscar_bs4(soup, prefijo)
+        if cuerpo is None and parcial:
+            soup = None  # el árbol parcial no sirve para el resto de la cadena
+    else:
+        soup = None
+
+    if cuerpo is None:
+        if soup is None:
+            soup = _sopa(html, backend, FILTRO_CUERPO if parcial else None, encoding)
+        cuerpo, selector = _buscar_bs4(soup, CADENA_SELECTORES[len(prefijo):])
+
+    if cuerpo is None:
+        return "", None
+    return _limpiar_parrafos(p.get_text(strip=True) for p in cuerpo.find_all('p')), selector
+
+
+def extraer_cuerpo(html, encoding: Optional[str] = 'utf-8', backend: str = 'html.parser',
+                   parcial: bool = True) -> str:
+    """
+    Extrae el cuerpo de texto de una noticia a partir de su HTML.
+
+    Con `parcial=True` solo se construyen los <article> y los <div> de
+    SELECTORES_CUERPO (con todo su contenido), que es lo único que se consulta.
+    Con backend 'lxml-xpath' no se usa bs4 (el resultado es el mismo).
+    """
+    return extraer_cuerpo_con_selector(html, encoding, None, backend, parcial)[0]
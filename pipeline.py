@@ -0,0 +1,221 @@
+# ================================================================================
+# pipeline.py - INGESTA EN STREAMING (scraping → sentimiento → embeddings)
+# ================================================================================
+#
+# En lugar de tres barreras sucesivas (scrapear todo, analizar todo, indexar
+# todo), cada noticia que produce el scraper pasa por colas acotadas a una
+# etapa de sentimiento y a una de embeddings, que trabajan por micro-lotes
+# mientras el crawl sigue en marcha. El tiempo total tiende al de la etapa
+# más lenta en lugar de a la suma de las tres.
+#
+# ================================================================================
+
+import time
+import queue
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from config import DATA_STORE, PIPELINE_TAM_LOTE, PIPELINE_TAM_COLA, PIPELINE_ESPERA_LOTE
+from dedup import crear_deduplicador
+from scraper import extraer_todas_las_noticias
+from sentiment import enriquecer_noticias_con_sentimientos
+
+# Marca de fin de flujo entre etapas
+_FIN = object()
+
+
+def _tomar_lote(cola: queue.Queue, tam_lote: int, espera: float) -> Tuple[list, bool]:
+    """
+    Espera al primer elemento y junta hasta `tam_lote` en como mucho `espera` segundos.
+
+    Returns:
+        (lote, fin) donde `fin` indica que llegó la marca de fin de flujo.
+    """
+    primero = cola.get()
+    if primero is _FIN:
+        return [], True
+
+    lote = [primero]
+    limite = time.monotonic() + espera
+    while len(lote) < tam_lote:
+        restante = limite - time.monotonic()
+        if restante <= 0:
+            break
+        try:
+            item = cola.get(timeout=restante)
+        except queue.Empty:
+            break
+        if item is _FIN:
+            return lote, True
+        lote.append(item)
+    return lote, False
+
+
+class PipelineIngesta:
+    """Orquesta las tres etapas con colas acotadas (contrapresión hacia el crawl)"""
+
+    def __init__(self, indice=None, tam_lote: int = PIPELINE_TAM_LOTE,
+                 tam_cola: int = PIPELINE_TAM_COLA, espera_lote: float = PIPELINE_ESPERA_LOTE,
+                 al_indexar: Optional[Callable] = None):
+        """
+        Args:
+            indice: IndiceNoticias donde persistir cada lote analizado (o None)
+            al_indexar: callback (motor_busqueda, noticias) invocado cuando el motor
+                está listo (con lista vacía) y tras cada lote indexado
+        """
+        self.indice = indice
+        self.al_indexar = al_indexar
+        self.tam_lote = tam_lote
+        self.espera_lote = espera_lote
+        self.cola_sentimiento = queue.Queue(maxsize=tam_cola)
+        self.cola_embeddings = queue.Queue(maxsize=max(tam_cola // tam_lote, 2))
+
+        self.motor_busqueda = None
+        self.nuevas: List[Dict] = []
+        self.producidas = 0
+        self.analizadas = 0
+        self.indexadas = 0
+        self.tiempos = {'scraping': 0.0, 'sentimiento': 0.0, 'embeddings': 0.0}
+        # Caché de embeddings de toda la ingesta (se informa una vez al final)
+        self.stats_embeddings: Dict = {}
+        self._scraping_terminado = False
+        self._error: Optional[Exception] = None
+
+    # --------------------------------------------------------------------------
+    # Etapas
+    # --------------------------------------------------------------------------
+
+    def _al_extraer(self, noticia: Dict):
+        """Callback del scraper: bloquea si la etapa de sentimiento va atrasada"""
+        self.producidas += 1
+        self.cola_sentimiento.put(noticia)
+
+    def _etapa_sentimiento(self):
+        try:
+            while True:
+                lote, fin = _tomar_lote(self.cola_sentimiento, self.tam_lote, self.espera_lote)
+                if lote:
+                    try:
+                        inicio = time.perf_counter()
+                        enriquecer_noticias_con_sentimientos(lote, self.analizadas, verbose=False)
+                        self.analizadas += len(lote)
+                        if self.indice is not None:
+                            self.indice.guardar(lote)
+                        self.tiempos['sentimiento'] += time.perf_counter() - inicio
+                        self.cola_embeddings.put(lote)
+                    except Exception as e:
+                        print(f"❌ Error analizando lote de sentimientos: {e}")
+                if fin:
+                    break
+        finally:
+            self.cola_embeddings.put(_FIN)
+
+    def _etapa_embeddings(self, motor_busqueda, existentes: List[Dict]):
+        try:
+            # La carga del modelo y el índice del corpus previo se solapan con el crawl
+            if motor_busqueda is None:
+                from brain import SemanticSearch
+                motor_busqueda = SemanticSearch()
+                self.motor_busqueda = motor_busqueda
+                self._notificar([])
+                # Reemplaza el índice: vacío, se vuelve consultable desde el primer lote;
+                # si ya había uno, se sigue usando hasta el final de la ingesta
+                motor_busqueda.index_documents(existentes, stats=self.stats_embeddings, publicar=False)
+            self.motor_busqueda = motor_busqueda
+            self._notificar([])
+        except Exception as e:
+            print(f"❌ Error cargando el motor de búsqueda: {e}")
+            self._error = e
+
+        while True:
+            lotes, fin = _tomar_lote(self.cola_embeddings, self.tam_lote, self.espera_lote)
+            documentos = [noticia for lote in lotes for noticia in lote]
+
+            # Si el modelo no cargó, igual hay que vaciar la cola para no bloquear al crawl
+            if documentos and self.motor_busqueda is not None:
+                try:
+                    inicio = time.perf_counter()
+                    self.motor_busqueda.add_documents(documentos, verbose=False, stats=self.stats_embeddings)
+                    self.tiempos['embeddings'] += time.perf_counter() - inicio
+                    self.nuevas = documentos + self.nuevas
+                    self.indexadas += len(documentos)
+                    self._notificar(documentos)
+                except Exception as e:
+                    print(f"❌ Error generando embeddings: {e}")
+                self._actualizar_progreso()
+            if fin:
+                break
+
+    def _notificar(self, documentos: List[Dict]):
+        if self.al_indexar is not None:
+            try:
+                self.al_indexar(self.motor_busqueda, documentos)
+            except Exception as e:
+                print(f"⚠️ Error en callback de indexación: {e}")
+
+    def _actualizar_progreso(self):
+        # Durante el crawl la barra la mueve el scraper (0-45%)
+        if not self._scraping_terminado:
+            return
+        total = max(self.producidas, 1)
+        DATA_STORE['current_action'] = f"Analizando e indexando noticias ({self.indexadas}/{self.producidas})..."
+        DATA_STORE['progress'] = 45 + int(54 * self.indexadas / total)
+
+    # --------------------------------------------------------------------------
+    # Ejecución
+    # --------------------------------------------------------------------------
+
+    def ejecutar(self, conocidas: Optional[Set[str]] = None, existentes: Optional[List[Dict]] = None,
+                 motor_busqueda=None, corpus: Optional[List[Dict]] = None,
+                 secciones: Optional[Dict] = None) -> List[Dict]:
+        """
+        Ejecuta la ingesta completa y devuelve las noticias nuevas ya analizadas e indexadas.
+
+        Args:
+            conocidas: URLs que el scraper debe omitir (modo incremental)
+            existentes: corpus previo a indexar junto al modelo (si se crea un índice nuevo)
+            motor_busqueda: índice existente al que agregar las nuevas (None = crear uno)
+            corpus: noticias ya ingeridas contra las que se detectan duplicados
+            secciones: subconjunto de las secciones configuradas a rastrear (None = todas las fuentes)
+        """
+        inicio = time.perf_counter()
+        deduplicador = crear_deduplicador(corpus)
+
+        hilo_sentimiento = threading.Thread(target=self._etapa_sentimiento, daemon=True)
+        hilo_embeddings = threading.Thread(
+            target=self._etapa_embeddings, args=(motor_busqueda, existentes or []), daemon=True
+        )
+        hilo_sentimiento.start()
+        hilo_embeddings.start()
+
+        try:
+            extraer_todas_las_noticias(conocidas, al_extraer=self._al_extraer,
+                                       deduplicador=deduplicador, secciones=secciones)
+        finally:
+            self.tiempos['scraping'] = time.perf_counter() - inicio
+            self._scraping_terminado = True
+            self._actualizar_progreso()
+            self.cola_sentimiento.put(_FIN)
+
+        hilo_sentimiento.join()
+        hilo_embeddings.join()
+        if self.motor_busqueda is not None:
+            self.motor_busqueda.publicar_reconstruccion()
+
+        # Las URLs duplicadas no se vuelven a descargar en el próximo refresco
+        if deduplicador is not None and self.indice is not None:
+            self.indice.guardar_alias(deduplicador.alias)
+            # Canónicas que sumaron secciones después de guardarse (solo las ya analizadas)
+            self.indice.guardar([n for n in deduplicador.modificadas.values() if 'sentimiento' in n])
+
+        total = time.perf_counter() - inicio
+        print(f"⏱️ Ingesta: {self.indexadas} noticias nuevas en {total:.1f}s "
+              f"(scraping {self.tiempos['scraping']:.1f}s, sentimiento {self.tiempos['sentimiento']:.1f}s, "
+              f"embeddings {self.tiempos['embeddings']:.1f}s)")
+        if self.motor_busqueda is not None:
+            self.motor_busqueda.reportar_cache(self.stats_embeddings)
+        print()
+
+        if self._error is not None:
+            raise self._error
+        return self.nuevas
@@ -0,0 +1,209 @@
+# ================================================================================
+# rate_limiter.py - LIMITADOR DE TASA POR HOST (TOKEN BUCKET)
+# ================================================================================
+
+import time
+import asyncio
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+_LOCAL = threading.local()
+
+
+class TokenBucket:
+    """
+    Token bucket con ráfaga y tasa adaptativa.
+
+    Cada petición reserva un token y recibe el tiempo que debe esperar antes
+    de salir. Un 429 vacía el bucket, pausa el host durante `Retry-After` y
+    reduce la tasa a la mitad; cada respuesta correcta la recupera poco a
+    poco hasta la tasa configurada.
+    """
+
+    def __init__(self, tasa: float, rafaga: int, tasa_minima: float = 0.5):
+        self.tasa_maxima = tasa
+        self.tasa = tasa
+        self.tasa_minima = min(tasa_minima, tasa)
+        self.rafaga = max(rafaga, 1)
+        self._tokens = float(self.rafaga)
+        self._ultimo = time.monotonic()
+        self._pausa_hasta = 0.0
+        self._lock = threading.Lock()
+
+    def reservar(self) -> float:
+        """Toma un token y devuelve los segundos que hay que esperar para usarlo"""
+        with self._lock:
+            ahora = time.monotonic()
+            self._tokens = min(self.rafaga, self._tokens + (ahora - self._ultimo) * self.tasa)
+            self._ultimo = ahora
+            self._tokens -= 1
+
+            espera = -self._tokens / self.tasa if self._tokens < 0 else 0.0
+            return max(espera, self._pausa_hasta - ahora)
+
+    def penalizar(self, pausa: float):
+        """Aplica un 429: pausa el host y reduce la tasa (decremento multiplicativo)"""
+        with self._lock:
+            ahora = time.monotonic()
+            self._pausa_hasta = max(self._pausa_hasta, ahora + pausa)
+            self._tokens = min(self._tokens, 0.0)
+            self._ultimo = max(ahora, self._pausa_hasta)
+            self.tasa = max(self.tasa_minima, self.tasa / 2)
+
+    def recompensar(self):
+        """Respuesta correcta: recupera la tasa (incremento aditivo)"""
+        if self.tasa >= self.tasa_maxima:
+            return
+        with self._lock:
+            self.tasa = min(self.tasa_maxima, self.tasa + self.tasa_maxima * 0.05)
+
+
+class LimitadorPorHost:
+    """Un token bucket por host; todas las peticiones del scraper pasan por aquí"""
+
+    def __init__(self, tasa: float, rafaga: int, pausa_429: float = 5.0,
+                 tasas_por_host: Optional[Dict[str, float]] = None,
+                 max_retry_after: Optional[float] = None):
+        self.tasa = tasa
+        self.rafaga = rafaga
+        self.pausa_429 = pausa_429
+        self.max_retry_after = max_retry_after
+        self.tasas_por_host = dict(tasas_por_host or {})
+        self.rafagas_por_host = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.reiniciar_estadisticas()
+
+    def reiniciar_estadisticas(self):
+        """Pone a cero los contadores (se llama al inicio de cada refresco)"""
+        with self._lock:
+            self._stats = {
+                'peticiones': 0,
+                'esperas': 0,              # peticiones que tuvieron que esperar turno
+                'segundos_esperando': 0.0,  # tiempo total de throttling
+                'respuestas_429': 0,
+                'retry_after_excedidos': 0  # 429 con un Retry-After mayor que el tope
+            }
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                tasa = self.tasas_por_host.get(host, self.tasa)
+                rafaga = self.rafagas_por_host.get(host, self.rafaga)
+                self._buckets[host] = TokenBucket(tasa, rafaga)
+            return self._buckets[host]
+
+    def configurar_host(self, host: str, tasa: Optional[float] = None, rafaga: Optional[int] = None):
+        """Fija tasa y/o ráfaga propias de un host (el bucket se rehace si cambian)"""
+        with self._lock:
+            if tasa is not None:
+                self.tasas_por_host[host] = tasa
+            if rafaga is not None:
+                self.rafagas_por_host[host] = rafaga
+            bucket = self._buckets.get(host)
+            if bucket is not None and (bucket.tasa_maxima != self.tasas_por_host.get(host, self.tasa)
+                                       or bucket.rafaga != max(self.rafagas_por_host.get(host, self.rafaga), 1)):
+                del self._buckets[host]
+
+    def _sumar(self, contadores: Dict[str, float]):
+        """Suma a los contadores (y a la captura del thread, si hay una; ver capturando_contadores)"""
+        with self._lock:
+            for clave, valor in contadores.items():
+                self._stats[clave] += valor
+        captura = getattr(_LOCAL, 'captura', None)
+        if captura is not None:
+            sumar_contadores(captura, contadores)
+
+    def incorporar(self, contadores: Optional[Dict[str, float]]):
+        """Suma los contadores capturados en otro proceso (trabajadores del crawl distribuido)"""
+        with self._lock:
+            for clave, valor in (contadores or {}).items():
+                if clave in self._stats:
+                    self._stats[clave] += valor
+
+    def _contabilizar(self, espera: float):
+        if espera > 0:
+            self._sumar({'peticiones': 1, 'esperas': 1, 'segundos_esperando': espera})
+        else:
+            self._sumar({'peticiones': 1})
+
+    def esperar(self, url: str):
+        """Bloquea el thread actual hasta que el host admita otra petición"""
+        espera = self._bucket(url).reservar()
+        self._contabilizar(espera)
+        if espera > 0:
+            time.sleep(espera)
+
+    async def esperar_async(self, url: str):
+        """Igual que `esperar`, pero sin ocupar ningún thread"""
+        espera = self._bucket(url).reservar()
+        self._contabilizar(espera)
+        if espera > 0:
+            await asyncio.sleep(espera)
+
+    def registrar_429(self, url: str, retry_after: Optional[str] = None) -> bool:
+        """
+        Adapta el bucket del host a un 429 (respeta Retry-After si viene).
+
+        Devuelve True si el Retry-After supera `max_retry_after`: el host se
+        pausa solo hasta el tope y el llamador no debería reintentar.
+        """
+        pausa = _segundos_retry_after(retry_after)
+        if pausa is None:
+            pausa = self.pausa_429
+        excedido = self.max_retry_after is not None and pausa > self.max_retry_after
+        self._bucket(url).penalizar(min(pausa, self.max_retry_after) if excedido else pausa)
+        self._sumar({'respuestas_429': 1, 'retry_after_excedidos': int(excedido)})
+        return excedido
+
+    def registrar_exito(self, url: str):
+        self._bucket(url).recompensar()
+
+    def estadisticas(self) -> Dict:
+        """Contadores del último refresco y tasa actual de cada host"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['segundos_esperando'] = round(stats['segundos_esperando'], 2)
+            stats['tasa_por_host'] = {
+                host: round(bucket.tasa, 2) for host, bucket in self._buckets.items()
+            }
+        return stats
+
+
+@contextmanager
+def capturando_contadores():
+    """
+    Junta en un dict lo que el limitador cuente en este thread (además de
+    sumarlo). Como telemetry.capturando: los trabajadores del crawl
+    distribuido lo devuelven con el resultado para que el coordinador lo sume.
+    """
+    captura = {}
+    _LOCAL.captura = captura
+    try:
+        yield captura
+    finally:
+        _LOCAL.captura = None
+
+
+def sumar_contadores(destino: Dict[str, float], contadores: Dict[str, float]):
+    for clave, valor in contadores.items():
+        destino[clave] = destino.get(clave, 0) + valor
+
+
+def _segundos_retry_after(valor: Optional[str]) -> Optional[float]:
+    """Interpreta Retry-After (segundos o fecha HTTP)"""
+    if not valor:
+        return None
+    valor = valor.strip()
+    if valor.isdigit():
+        return float(valor)
+    try:
+        fecha = parsedate_to_datetime(valor)
+        return max((fecha - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
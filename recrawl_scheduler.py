@@ -0,0 +1,225 @@
+# ================================================================================
+# recrawl_scheduler.py - RE-CRAWL PERIÓDICO CON PRIORIDAD POR FRESCURA
+# ================================================================================
+#
+# Cada sección tiene su propio intervalo de refresco, derivado de cuántas
+# noticias nuevas aparecen en ella por hora (media móvil exponencial):
+#
+#     intervalo = RECRAWL_OBJETIVO_NUEVAS / tasa_por_hora   (acotado a [MIN, MAX])
+#
+# Una sección movida (deportes) se visita seguido; una tranquila
+# (educacion-y-sociedad) casi nunca. Cada próxima visita lleva un jitter
+# aleatorio para repartir la carga, las secciones que vencen juntas se
+# rastrean en la misma corrida y nunca hay dos ingestas a la vez (el bot
+# rechaza una ingesta si ya hay otra en curso).
+#
+# ================================================================================
+
+import os
+import json
+import time
+import random
+import threading
+from typing import Dict, List, Optional
+
+from sources import secciones_configuradas
+
+
+class PlanificadorRecrawl:
+    """Decide qué secciones rastrear y cuándo, aprendiendo su ritmo de publicación"""
+
+    def __init__(self, bot, ruta: Optional[str] = None):
+        import config
+
+        self.bot = bot
+        self.ruta = ruta
+        self.intervalo_inicial = config.RECRAWL_INTERVALO_INICIAL
+        self.intervalo_min = config.RECRAWL_INTERVALO_MIN
+        self.intervalo_max = config.RECRAWL_INTERVALO_MAX
+        self.objetivo = config.RECRAWL_OBJETIVO_NUEVAS
+        self.jitter = config.RECRAWL_JITTER
+        self.agrupar = config.RECRAWL_AGRUPAR
+        self.suavizado = config.RECRAWL_SUAVIZADO
+
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._despertar = threading.Event()
+        self._hilo = None
+        self.corridas = 0
+        self.estado: Dict[str, Dict] = {}
+        self._cargar()
+
+        # Secciones nuevas en config (o sin estado previo): primera visita escalonada
+        ahora = time.time()
+        for url in secciones_configuradas():
+            if url not in self.estado:
+                self.estado[url] = {
+                    'tasa_por_hora': None,
+                    'intervalo': self.intervalo_inicial,
+                    'ultima': None,
+                    'proxima': ahora + self._con_jitter(self.intervalo_inicial)
+                }
+
+    # --------------------------------------------------------------------------
+    # Persistencia
+    # --------------------------------------------------------------------------
+
+    def _cargar(self):
+        if not self.ruta or not os.path.exists(self.ruta):
+            return
+        try:
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                self.estado = json.load(f).get('secciones', {})
+        except (OSError, ValueError) as e:
+            print(f"⚠️ No se pudo leer el estado del planificador ({e}), se empieza de cero")
+
+    def _guardar(self):
+        if not self.ruta:
+            return
+        with self._lock:
+            datos = {'secciones': self.estado}
+            texto = json.dumps(datos, indent=2, ensure_ascii=False)
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        temporal = self.ruta + ".tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            f.write(texto)
+        os.replace(temporal, self.ruta)
+
+    # --------------------------------------------------------------------------
+    # Política de intervalos
+    # --------------------------------------------------------------------------
+
+    def _con_jitter(self, segundos: float) -> float:
+        return segundos * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _intervalo(self, tasa_por_hora: Optional[float]) -> float:
+        if not tasa_por_hora:
+            return self.intervalo_max
+        segundos = self.objetivo / tasa_por_hora * 3600
+        return min(max(segundos, self.intervalo_min), self.intervalo_max)
+
+    def registrar_ingesta(self, secciones: List[str], nuevas_por_seccion: Dict[str, int]):
+        """
+        Callback del bot al terminar cualquier ingesta (inicial, manual o programada):
+        actualiza la tasa de cada sección rastreada y reprograma su próxima visita.
+        """
+        ahora = time.time()
+        with self._lock:
+            for url in secciones:
+                estado = self.estado.setdefault(url, {'tasa_por_hora': None, 'ultima': None})
+                nuevas = nuevas_por_seccion.get(url, 0)
+
+                if estado.get('ultima'):
+                    horas = max((ahora - estado['ultima']) / 3600, 1 / 60)
+                    observada = nuevas / horas
+                    previa = estado.get('tasa_por_hora')
+                    estado['tasa_por_hora'] = round(observada if previa is None else
+                                                    self.suavizado * observada + (1 - self.suavizado) * previa, 3)
+
+                estado['intervalo'] = round(self._intervalo(estado['tasa_por_hora'])
+                                            if estado['tasa_por_hora'] is not None else self.intervalo_inicial, 1)
+                estado['ultima'] = ahora
+                estado['proxima'] = ahora + self._con_jitter(estado['intervalo'])
+                estado['ultimas_nuevas'] = nuevas
+        self._guardar()
+        self._despertar.set()
+
+    def vencidas(self, ahora: Optional[float] = None) -> List[str]:
+        """Secciones cuya visita vence ya (o dentro de la ventana de agrupación)"""
+        configuradas = secciones_configuradas()
+        ahora = ahora or time.time()
+        with self._lock:
+            return [url for url, e in self.estado.items()
+                    if url in configuradas and e['proxima'] <= ahora + self.agrupar]
+
+    # --------------------------------------------------------------------------
+    # Hilo del planificador
+    # --------------------------------------------------------------------------
+
+    def _posponer_pendientes(self, secciones: List[str]):
+        """Si la ingesta falló (sin callback) se reintenta en un intervalo, no en bucle"""
+        ahora = time.time()
+        with self._lock:
+            for url in secciones:
+                estado = self.estado[url]
+                if estado['proxima'] <= ahora + self.agrupar:
+                    estado['proxima'] = ahora + self._con_jitter(estado.get('intervalo', self.intervalo_inicial))
+
+    def _bucle(self):
+        while not self._detener.is_set():
+            secciones = self.vencidas()
+            if secciones:
+                configuradas = secciones_configuradas()
+                subconjunto = {url: configuradas[url] for url in secciones if url in configuradas}
+                nombres = ", ".join(url.rstrip('/').split('/')[-1] for url in secciones)
+                if self.bot.ingestar(subconjunto):
+                    self.corridas += 1
+                    print(f"🗓️ Re-crawl programado terminado: {nombres}")
+                    self._posponer_pendientes(secciones)
+                    continue
+                # Otra ingesta en curso: al terminar nos despierta su callback
+                espera = 30
+            else:
+                # Solo las secciones configuradas: una quitada de config conserva su
+                # estado (por si vuelve) pero su 'proxima' vieja no debe despertar el bucle
+                configuradas = secciones_configuradas()
+                with self._lock:
+                    proxima = min((e['proxima'] for url, e in self.estado.items() if url in configuradas),
+                                  default=time.time() + 60)
+                espera = max(proxima - time.time(), 1)
+
+            self._despertar.wait(timeout=espera)
+            self._despertar.clear()
+
+    def iniciar(self):
+        if self._hilo is not None:
+            return
+        self.bot.al_ingerir.append(self.registrar_ingesta)
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+        print(f"🗓️ Planificador de re-crawl activo ({len(self.estado)} secciones)")
+
+    def detener(self):
+        self._detener.set()
+        self._despertar.set()
+
+    def estadisticas(self) -> Dict:
+        ahora = time.time()
+        with self._lock:
+            secciones = {
+                # host/ruta: dos fuentes pueden tener secciones con el mismo nombre
+                url.split('://', 1)[-1].rstrip('/'): {
+                    'tasa_por_hora': e.get('tasa_por_hora'),
+                    'intervalo_min': round(e.get('intervalo', 0) / 60, 1),
+                    'proxima_en_min': round(max(e['proxima'] - ahora, 0) / 60, 1),
+                    'ultimas_nuevas': e.get('ultimas_nuevas')
+                }
+                for url, e in self.estado.items()
+            }
+        return {'corridas': self.corridas, 'secciones': secciones}
+
+
+_PLANIFICADOR = None
+
+
+def iniciar_planificador(bot) -> Optional[PlanificadorRecrawl]:
+    """Arranca el planificador compartido (None si está desactivado o sin modo incremental)"""
+    global _PLANIFICADOR
+    import config
+
+    if not config.RECRAWL_ACTIVO:
+        return None
+    if not config.SCRAPING_INCREMENTAL:
+        print("⚠️ Re-crawl programado desactivado: requiere SCRAPING_INCREMENTAL = True")
+        return None
+
+    if _PLANIFICADOR is None:
+        _PLANIFICADOR = PlanificadorRecrawl(bot, config.RECRAWL_ARCHIVO)
+        _PLANIFICADOR.iniciar()
+    return _PLANIFICADOR
+
+
+def obtener_planificador() -> Optional[PlanificadorRecrawl]:
+    return _PLANIFICADOR
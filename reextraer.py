@@ -0,0 +1,148 @@
+# ================================================================================
+# reextraer.py - RE-EXTRACCIÓN DEL TEXTO DESDE EL ARCHIVO HTML (SIN RED)
+# ================================================================================
+#
+# Vuelve a correr la etapa de parseo/extracción (parsing.extraer_cuerpo) sobre
+# el HTML crudo archivado en HTML_ARCHIVO_DIR, en paralelo y sin tocar la red.
+# Sirve para aplicar cambios en SELECTORES_CUERPO o en el límite de caracteres
+# a todo lo ya descargado.
+#
+# Uso (desde la raíz del proyecto):
+#   python reextraer.py                       # solo mide y cuenta cambios
+#   python reextraer.py --guardar             # actualiza índice de noticias y caché HTTP
+#   python reextraer.py --guardar --sentimientos --procesos 8
+#
+# ================================================================================
+
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from html_archive import ArchivoHTML, iterar_segmento
+from parsing import extraer_cuerpo
+
+
+def _extraer_grupo(directorio: str, segmento: int, registros: List[Tuple[str, int, int]],
+                   backend: str, parcial: bool) -> List[Tuple[str, str]]:
+    """Tarea de un proceso: lee un grupo de registros de un segmento y extrae el texto"""
+    resultados = []
+    for url, cuerpo in iterar_segmento(directorio, segmento, registros):
+        try:
+            resultados.append((url, extraer_cuerpo(cuerpo, 'utf-8', backend, parcial)))
+        except Exception:
+            resultados.append((url, ""))
+    return resultados
+
+
+def _grupos(entradas, tam_grupo: int):
+    """Agrupa las entradas por segmento en tandas de `tam_grupo` (un open por tanda)"""
+    actual, segmento = [], None
+    for url, seg, offset, longitud in entradas:
+        if actual and (seg != segmento or len(actual) >= tam_grupo):
+            yield segmento, actual
+            actual = []
+        segmento = seg
+        actual.append((url, offset, longitud))
+    if actual:
+        yield segmento, actual
+
+
+def reextraer(archivo: ArchivoHTML, procesos: int, backend: str, parcial: bool,
+              tam_grupo: int = 200) -> Dict[str, str]:
+    """Devuelve {url: texto} para todo el archivo; los bytes viajan como offsets, no por pickle"""
+    entradas = archivo.entradas()
+    textos = {}
+    with ProcessPoolExecutor(max_workers=max(procesos, 1)) as pool:
+        futuros = [
+            pool.submit(_extraer_grupo, archivo.directorio, segmento, registros, backend, parcial)
+            for segmento, registros in _grupos(entradas, tam_grupo)
+        ]
+        for futuro in futuros:
+            textos.update(futuro.result())
+    return textos
+
+
+def aplicar(textos: Dict[str, str], sentimientos: bool = False) -> int:
+    """
+    Guarda los textos nuevos en el índice de noticias y en la caché HTTP.
+
+    Los embeddings se regeneran solos en el próximo arranque (se indexa el
+    corpus completo); el sentimiento solo se recalcula con `sentimientos=True`.
+    """
+    from http_cache import obtener_cache_http
+    from news_index import obtener_indice_noticias
+
+    cache = obtener_cache_http()
+    if cache:
+        for url, texto in textos.items():
+            if texto:
+                cache.actualizar_texto(url, texto)
+
+    indice = obtener_indice_noticias()
+    if indice is None:
+        return 0
+
+    cambiadas = []
+    for noticia in indice.cargar():
+        texto = textos.get(noticia['url'])
+        # Una extracción vacía no pisa el contenido que ya teníamos
+        if texto and texto != noticia.get('contenido'):
+            noticia['contenido'] = texto
+            noticia['resumen'] = texto[:200] + "..."  # mismo formato que scraper._armar_noticia
+            cambiadas.append(noticia)
+
+    if cambiadas and sentimientos:
+        from sentiment import enriquecer_noticias_con_sentimientos
+        enriquecer_noticias_con_sentimientos(cambiadas)
+
+    indice.guardar(cambiadas)
+    return len(cambiadas)
+
+
+def main():
+    import config
+
+    parser = argparse.ArgumentParser(description="Re-extrae el texto de las noticias desde el HTML archivado")
+    parser.add_argument('--directorio', default=config.HTML_ARCHIVO_DIR)
+    parser.add_argument('--procesos', type=int, default=max(config.PARSEO_PROCESOS, 1))
+    # Mismo texto que bs4 pero varias veces más rápido (ver parsing._extraer_cuerpo_lxml)
+    parser.add_argument('--backend', default='lxml-xpath')
+    parser.add_argument('--completo', action='store_true', help="parsear el documento completo (sin SoupStrainer)")
+    parser.add_argument('--guardar', action='store_true', help="actualizar índice de noticias y caché HTTP")
+    parser.add_argument('--sentimientos', action='store_true', help="recalcular el sentimiento de las que cambian")
+    parser.add_argument('--salida', help="guardar el resumen en este archivo JSON")
+    args = parser.parse_args()
+
+    archivo = ArchivoHTML(args.directorio)
+    stats = archivo.estadisticas()
+    print(f"🗄️ {stats['paginas']} páginas archivadas en {stats['segmentos']} segmentos "
+          f"({stats['bytes_comprimidos'] / 1024 / 1024:.1f} MB comprimidos, x{stats['ratio']})")
+
+    inicio = time.perf_counter()
+    textos = reextraer(archivo, args.procesos, args.backend, not args.completo)
+    duracion = time.perf_counter() - inicio
+
+    resumen = {
+        'paginas': len(textos),
+        'vacias': sum(1 for t in textos.values() if not t),
+        'segundos': round(duracion, 3),
+        'paginas_por_segundo': round(len(textos) / duracion, 1) if duracion else 0.0,
+        'procesos': args.procesos,
+        'backend': args.backend
+    }
+    print(f"⚡ {resumen['paginas']} páginas re-extraídas en {duracion:.2f}s "
+          f"({resumen['paginas_por_segundo']} páginas/s, {resumen['vacias']} sin texto)")
+
+    if args.guardar:
+        resumen['noticias_actualizadas'] = aplicar(textos, args.sentimientos)
+        print(f"💾 {resumen['noticias_actualizadas']} noticias actualizadas en el índice")
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(resumen, indent=2, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,104 +3,245 @@
 # ================================================================================
 
 import time
-import random
+import atexit
+import asyncio
+import threading
+import multiprocessing
 import requests
-from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List , Optional
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from config import HEADERS
+from config import (
+    HEADERS, SCRAPER_MAX_CONCURRENCIA, SCRAPER_MAX_POR_HOST,
+    SCRAPER_TASA_POR_HOST, SCRAPER_RAFAGA_POR_HOST, SCRAPER_TASAS_HOSTS,
+    SCRAPER_REINTENTOS_429, SCRAPER_PAUSA_429, SCRAPER_MAX_RETRY_AFTER,
+    HTTP_FIXTURES_MODO, HTTP_FIXTURES_ARCHIVO, HTTP_FIXTURES_LATENCIA_MS,
+    HTTP_FIXTURES_JITTER_MS, HTTP_FIXTURES_TASA_ERROR
+)
+from http_cache import obtener_cache_http
+from html_archive import obtener_archivo_html
+from http_fixtures import instalar_fixtures
+from parsing import datos_listado, parsear_listado, extraer_cuerpo_con_selector
+from selector_cache import obtener_mapa_selectores
+from sources import FuenteNoticias, cargar_fuentes, agrupar_por_fuente
+from rate_limiter import LimitadorPorHost
+from telemetry import (
+    SesionMedida, instrumentar_adaptador, obtener_telemetria,
+    ejecutar_medido, medir_etapa, registrar_etapa
+)
+from dedup import Deduplicador, crear_deduplicador
 
 # --- CONFIGURACIÓN DE SESIÓN ROBUSTA ---
 def crear_sesion():
     """Crea una sesión con estrategia de reintentos"""
-    session = requests.Session()
-    
-    # Estrategia de reintentos: 3 intentos, esperando más tiempo entre cada uno
+    # Cada petición deja su medición (DNS, conexión, TTFB, bytes, reintentos): ver telemetry.py
+    session = SesionMedida()
+
+    # Estrategia de reintentos: 3 intentos, esperando más tiempo entre cada uno.
+    # Los 429 no se reintentan aquí: los gestiona el limitador de tasa por host.
     retry_strategy = Retry(
         total=3,
         backoff_factor=1,  # espera 1s, 2s, 4s...
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET"]
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=["GET"],
+        respect_retry_after_header=False  # si no, urllib3 reintentaría los 429 por su cuenta
     )
-    
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+
+    # El pool de conexiones debe admitir tantas conexiones como peticiones por
+    # host (o por fuente, si alguna declara una concurrencia mayor)
+    por_fuente = [f.max_concurrencia for f in cargar_fuentes() if f.max_concurrencia]
+    opciones_adaptador = {
+        'max_retries': retry_strategy,
+        'pool_maxsize': max(SCRAPER_MAX_POR_HOST, 10, *por_fuente)
+    }
+    adapter = HTTPAdapter(**opciones_adaptador)
     session.mount("https://", adapter)
     session.mount("http://", adapter)
     session.headers.update(HEADERS)
+
+    # Modo fixtures (grabación / reproducción offline), si está configurado
+    if HTTP_FIXTURES_MODO:
+        instalar_fixtures(
+            session, HTTP_FIXTURES_MODO, HTTP_FIXTURES_ARCHIVO,
+            latencia_ms=HTTP_FIXTURES_LATENCIA_MS,
+            jitter_ms=HTTP_FIXTURES_JITTER_MS,
+            tasa_error=HTTP_FIXTURES_TASA_ERROR,
+            **opciones_adaptador
+        )
+    for adaptador in session.adapters.values():
+        instrumentar_adaptador(adaptador)
     return session
 
 # Instancia global de sesión para reutilizar conexiones
 SESSION = crear_sesion()
 
-def extraer_contenido_noticia(url: str) -> str:
-    """Extrae el texto de una noticia individual con robustez"""
+# Limitador compartido: todas las peticiones del scraper pasan por un token bucket por host
+LIMITADOR = LimitadorPorHost(
+    SCRAPER_TASA_POR_HOST,
+    SCRAPER_RAFAGA_POR_HOST,
+    pausa_429=SCRAPER_PAUSA_429,
+    tasas_por_host=SCRAPER_TASAS_HOSTS,
+    max_retry_after=SCRAPER_MAX_RETRY_AFTER
+)
+
+
+class RespuestaLimitada(Exception):
+    """
+    El servidor respondió 429; el limitador ya pausó el host. Con
+    `retry_after_excedido` pidió esperar más que SCRAPER_MAX_RETRY_AFTER y
+    no se reintenta.
+    """
+
+    def __init__(self, response: requests.Response, retry_after_excedido: bool = False):
+        motivo = " (Retry-After mayor que SCRAPER_MAX_RETRY_AFTER)" if retry_after_excedido else ""
+        super().__init__(f"429 en {response.url}{motivo}")
+        self.response = response
+        self.retry_after_excedido = retry_after_excedido
+
+
+def _get_http(url: str, timeout: int = 10, headers: Optional[Dict] = None) -> requests.Response:
+    """GET sin esperar turno (el llamador ya pasó por el limitador)"""
+    response = SESSION.get(url, timeout=timeout, headers=headers)
+    if response.status_code == 429:
+        excedido = LIMITADOR.registrar_429(url, response.headers.get('Retry-After'))
+        raise RespuestaLimitada(response, excedido)
+    LIMITADOR.registrar_exito(url)
+    return response
+
+
+def descargar(url: str, timeout: int = 10, headers: Optional[Dict] = None) -> requests.Response:
+    """Punto único de acceso HTTP (síncrono): espera turno en el limitador y reintenta los 429"""
+    for _ in range(SCRAPER_REINTENTOS_429 + 1):
+        LIMITADOR.esperar(url)
+        try:
+            return _get_http(url, timeout, headers)
+        except RespuestaLimitada as e:
+            if e.retry_after_excedido:
+                raise
+            response = e.response
+    return response
+
+
+def _opciones_parseo() -> Tuple[str, bool]:
+    """Backend y modo de parseo configurados"""
+    from config import PARSER_BACKEND, PARSEO_PARCIAL
+    return PARSER_BACKEND, PARSEO_PARCIAL
+
+
+def _descargar_articulo(url: str, obtener=descargar) -> Tuple[Optional[str], Optional[requests.Response]]:
+    """
+    Descarga una noticia con GET condicional (sin parsearla).
+
+    Returns:
+        (texto_guardado, None) si el servidor respondió 304,
+        (None, response) si hay un cuerpo nuevo que parsear,
+        (None, None) si la descarga falló.
+    """
     try:
-        # Pequeña pausa aleatoria para no saturar el servidor
-        time.sleep(random.uniform(0.1, 0.5))
-        
-        response = SESSION.get(url, timeout=10)
-        response.encoding = 'utf-8'
-        
+        # GET condicional: si la página no cambió, reutilizamos el texto guardado
+        cache = obtener_cache_http()
+        entrada = cache.buscar(url) if cache else None
+        cabeceras = cache.cabeceras_condicionales(entrada) if cache else None
+
+        response = obtener(url, timeout=10, headers=cabeceras)
+
+        if response.status_code == 304 and entrada:
+            cache.registrar_no_modificado(entrada)
+            return entrada['texto'], None
+
         if response.status_code != 200:
-            return ""
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Lista de selectores posibles (fallback)
-        selectores = ['text-editor', 'nota-body', 'cuerpo-nota', 'article-body', 'content-body']
-        cuerpo = None
-        
-        for clase in selectores:
-            cuerpo = soup.find('div', class_=clase)
-            if cuerpo:
-                break
-        
-        # Intento final: buscar cualquier article
-        if not cuerpo:
-            cuerpo = soup.find('article')
-        
-        if cuerpo:
-            # Extraer párrafos y limpiar
-            parrafos = cuerpo.find_all('p')
-            textos = []
-            for p in parrafos:
-                texto = p.get_text(strip=True)
-                # Filtrar textos muy cortos o irrelevantes
-                if len(texto) > 30 and "Lee también" not in texto:
-                    textos.append(texto)
-            
-            return " ".join(textos)[:1500] # Limitamos a 1500 chars para no exceder contexto
-            
-        return ""
+            return None, None
+
+        return None, response
+    except RespuestaLimitada:
+        raise
+    except Exception as e:
+        print(f"   ⚠️ Error extrayendo {url[:30]}...: {e}")
+        return None, None
+
+
+def _guardar_en_cache(url: str, response: requests.Response, texto: str):
+    with medir_etapa('cache'):
+        cache = obtener_cache_http()
+        if cache:
+            cache.guardar(url, response, texto)
+        # HTML crudo: permite volver a extraer el texto sin red (reextraer.py)
+        archivo = obtener_archivo_html()
+        if archivo is not None:
+            archivo.guardar(url, response.content)
+
+
+def _selector_preferido(url: str) -> Optional[str]:
+    mapa = obtener_mapa_selectores()
+    return mapa.preferido(url) if mapa is not None else None
+
+
+def _registrar_selector(url: str, preferido: Optional[str], selector: Optional[str]):
+    mapa = obtener_mapa_selectores()
+    if mapa is not None:
+        mapa.registrar(url, preferido, selector)
+
+
+def _obtener_contenido(url: str) -> str:
+    """Descarga y extrae el texto de una noticia (parseo en el thread actual)"""
+    texto, response = _descargar_articulo(url)
+    if response is None:
+        return texto or ""
+
+    try:
+        backend, parcial = _opciones_parseo()
+        preferido = _selector_preferido(url)
+        texto, selector = extraer_cuerpo_con_selector(response.content, 'utf-8', preferido, backend, parcial)
+        _registrar_selector(url, preferido, selector)
     except Exception as e:
         print(f"   ⚠️ Error extrayendo {url[:30]}...: {e}")
         return ""
 
+    _guardar_en_cache(url, response, texto)
+    return texto
+
+
+def extraer_contenido_noticia(url: str) -> str:
+    """Extrae el texto de una noticia individual con robustez"""
+    # El ritmo de peticiones lo marca el limitador por host (sin pausas aleatorias)
+    return _obtener_contenido(url)
+
+
+def _armar_noticia(titulo: str, enlace: str, contenido: str, seccion: str = "", fuente: str = "") -> Dict:
+    """Construye el diccionario de noticia que consume el resto del sistema"""
+    return {
+        'titulo': titulo,
+        'url': enlace,
+        'contenido': contenido,
+        'resumen': contenido[:200] + "...",
+        'seccion': seccion,
+        'secciones': [seccion] if seccion else [],
+        'fuente': fuente
+    }
+
+
+def _nombre_seccion(seccion_url: str) -> str:
+    return seccion_url.rstrip('/').split('/')[-1]
+
+
+def _url_pagina(url_base: str, pagina: int) -> str:
+    return url_base if pagina == 1 else f"{url_base}/{pagina}"
+
 
 def procesar_articulo(art) -> Optional[Dict]:
     """Procesa un artículo individual"""
     try:
-        tag_titulo = art.find('h2', class_='nota__titulo-item')
-        
-        if tag_titulo and tag_titulo.find('a'):
-            enlace = tag_titulo.find('a')['href']
-            titulo = tag_titulo.get_text(strip=True)
-            
-            if not enlace.startswith('http'):
-                enlace = "https://eldeber.com.bo" + enlace
-            
+        datos = datos_listado(art)
+
+        if datos:
+            titulo, enlace = datos
             contenido = extraer_contenido_noticia(enlace)
-            
+
             # Solo devolvemos si logramos extraer contenido real
             if contenido:
-                return {
-                    'titulo': titulo,
-                    'url': enlace,
-                    'contenido': contenido,
-                    'resumen': contenido[:200] + "..."
-                }
+                return _armar_noticia(titulo, enlace, contenido)
     except Exception as e:
         # Errores puntuales no detienen el proceso
         pass
@@ -108,76 +249,872 @@ def procesar_articulo(art) -> Optional[Dict]:
 
 
 def extraer_titulares_pagina(url_base: str, pagina: int) -> List[Dict]:
-    """Extrae titulares de una página específica de una sección"""
-    url = url_base if pagina == 1 else f"{url_base}/{pagina}"
+    """Extrae titulares de una página específica de una sección (modo síncrono)"""
+    url = _url_pagina(url_base, pagina)
     titulares = []
-    
+
     try:
         print(f"   ...leyendo {url}")
-        response = SESSION.get(url, timeout=15)
-        
+        response = descargar(url, timeout=15)
+
         if response.status_code != 200:
             print(f"   ❌ Error {response.status_code} en {url}")
             return []
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        articulos = soup.find_all('article', class_='nota')
-        
+        seccion = _nombre_seccion(url_base)
+        backend, parcial = _opciones_parseo()
+        entradas = parsear_listado(response.content, response.encoding, backend, parcial)
+
         # Procesar artículos en paralelo
         with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = [executor.submit(procesar_articulo, art) for art in articulos]
-            
-            for future in as_completed(futures):
-                resultado = future.result()
-                if resultado:
-                    titulares.append(resultado)
-        
+            futures = [executor.submit(extraer_contenido_noticia, enlace) for _, enlace in entradas]
+
+            for (titulo, enlace), future in zip(entradas, futures):
+                contenido = future.result()
+                if contenido:
+                    titulares.append(_armar_noticia(titulo, enlace, contenido, seccion))
+
         return titulares
-    
+
     except Exception as e:
         print(f"   ❌ Error crítico en {url}: {e}")
         return []
 
 
-def extraer_todas_las_noticias() -> List[Dict]:
-    """Función principal de scraping multi-sección"""
-    from config import SECCIONES_CONFIG, DATA_STORE
-    
-    print(f"\n🔄 Iniciando scraping robusto de {len(SECCIONES_CONFIG)} secciones...")
+# ================================================================================
+# MOTOR DE CRAWLING ASÍNCRONO
+# ================================================================================
+
+class FuenteSuspendida(Exception):
+    """La fuente acumuló demasiados fallos seguidos y se dejó de rastrear en este refresco"""
+
+
+class MotorCrawl:
+    """
+    Motor de crawling basado en asyncio.
+
+    Todas las páginas de listado y todos los artículos de todas las secciones
+    de todas las fuentes se programan a la vez; los frenos son un límite
+    global de peticiones en vuelo y el pool propio de cada fuente (ver
+    sources.py). Las llamadas bloqueantes de `requests` se ejecutan en un
+    pool de threads del mismo tamaño que el límite global.
+
+    Cada fuente lleva su contabilidad de fallos: tras FUENTES_MAX_FALLOS_SEGUIDOS
+    peticiones fallidas seguidas se suspende hasta el próximo refresco, sin
+    afectar a las demás.
+    """
+
+    def __init__(self, max_concurrencia: int = SCRAPER_MAX_CONCURRENCIA,
+                 max_por_host: int = SCRAPER_MAX_POR_HOST,
+                 conocidas: Optional[Set[str]] = None,
+                 al_extraer: Optional[Callable[[Dict], None]] = None,
+                 deduplicador: Optional[Deduplicador] = None,
+                 max_fallos_seguidos: Optional[int] = None):
+        from config import FUENTES_MAX_FALLOS_SEGUIDOS
+
+        self.max_concurrencia = max_concurrencia
+        # Concurrencia de una fuente que no declara la suya
+        self.max_por_host = max_por_host
+        self.max_fallos_seguidos = (max_fallos_seguidos if max_fallos_seguidos is not None
+                                    else FUENTES_MAX_FALLOS_SEGUIDOS)
+        # URLs ya procesadas en refrescos anteriores: no se vuelven a descargar
+        self.conocidas = conocidas if conocidas is not None else set()
+        # URLs ya encoladas en esta corrida: si aparecen en otra sección solo se anota la sección
+        self._en_corrida: Set[str] = set()
+        # Se llama con cada noticia en cuanto se extrae (ingesta en streaming).
+        # Puede bloquear (colas acotadas): corre en un thread de red, no en el loop.
+        self.al_extraer = al_extraer
+        # Descarta duplicados exactos y casi duplicados antes de entregarlos
+        self.deduplicador = deduplicador
+        self.omitidas = 0
+        self.paginas_leidas = {}
+        self.fuentes = {}
+        self._noticias = []
+        self._total_paginas = 1
+        self._paginas_procesadas = 0
+        self._limite_global = None
+        self._limites_fuente = {}
+        self._executor = None
+        self._pool_parseo = None
+
+    # --------------------------------------------------------------------------
+    # Contabilidad por fuente
+    # --------------------------------------------------------------------------
+
+    def _preparar_fuente(self, fuente: FuenteNoticias):
+        self._limites_fuente[fuente.nombre] = asyncio.Semaphore(fuente.max_concurrencia or self.max_por_host)
+        self.fuentes[fuente.nombre] = {
+            'secciones': 0,
+            'listados': 0,
+            'listados_fallidos': 0,
+            'articulos': 0,
+            'articulos_fallidos': 0,
+            'respuestas_429': 0,
+            'fallos_seguidos': 0,
+            'suspendida': False,
+            'noticias': 0
+        }
+
+    def _anotar(self, fuente: FuenteNoticias, tipo: str, correcto: bool):
+        """Registra el resultado de una petición ('listados' o 'articulos') de la fuente"""
+        stats = self.fuentes[fuente.nombre]
+        stats[tipo] += 1
+        if correcto:
+            stats['fallos_seguidos'] = 0
+            return
+        stats[f"{tipo}_fallidos"] += 1
+        stats['fallos_seguidos'] += 1
+        if stats['fallos_seguidos'] >= self.max_fallos_seguidos:
+            self._suspender(fuente, f"{stats['fallos_seguidos']} fallos seguidos")
+
+    def _suspender(self, fuente: FuenteNoticias, motivo: str):
+        stats = self.fuentes[fuente.nombre]
+        if not stats['suspendida']:
+            stats['suspendida'] = True
+            print(f"   🛑 {fuente.nombre}: {motivo}, se suspende hasta el próximo refresco")
+
+    def _suspendida(self, fuente: FuenteNoticias) -> bool:
+        return self.fuentes[fuente.nombre]['suspendida']
+
+    # --------------------------------------------------------------------------
+    # Etapas
+    # --------------------------------------------------------------------------
+
+    async def _en_executor(self, fuente: FuenteNoticias, url: str, funcion, *args):
+        """
+        Ejecuta una llamada de red respetando el limitador de tasa, el límite
+        global y el pool de la fuente. La espera de turno es asíncrona (no
+        ocupa threads) y los 429 se reintentan tras la pausa que impone el limitador.
+        Si el servidor pide esperar más que SCRAPER_MAX_RETRY_AFTER, la fuente
+        se suspende en este refresco en lugar de esperar.
+        """
+        for intento in range(SCRAPER_REINTENTOS_429 + 1):
+            if self._suspendida(fuente):
+                raise FuenteSuspendida(fuente.nombre)
+            await LIMITADOR.esperar_async(url)
+            async with self._limite_global, self._limites_fuente[fuente.nombre]:
+                loop = asyncio.get_running_loop()
+                try:
+                    return await loop.run_in_executor(self._executor, funcion, *args)
+                except RespuestaLimitada as e:
+                    self.fuentes[fuente.nombre]['respuestas_429'] += 1
+                    if e.retry_after_excedido:
+                        self._suspender(fuente, "pide un Retry-After mayor que SCRAPER_MAX_RETRY_AFTER")
+                        raise FuenteSuspendida(fuente.nombre) from e
+                    if intento == SCRAPER_REINTENTOS_429:
+                        raise
+
+    async def _parsear(self, funcion, *args):
+        """
+        Etapa de parseo (CPU), separada del I/O: corre en el pool de procesos.
+        En la telemetría queda el tiempo de parseo y, aparte, el de espera en el pool.
+        """
+        backend, parcial = _opciones_parseo()
+        loop = asyncio.get_running_loop()
+        inicio = time.perf_counter()
+        for intento in range(2):
+            ejecutor = self._pool_parseo or self._executor
+            try:
+                resultado, segundos = await loop.run_in_executor(
+                    ejecutor, ejecutar_medido, funcion, *args, backend, parcial
+                )
+                break
+            except BrokenProcessPool:
+                # Murió un proceso de parseo (OOM, segfault en lxml): el pool no sirve más
+                self._reemplazar_pool_parseo(ejecutor, reconstruir=intento == 0)
+            except RuntimeError:
+                # Otro parseo ya descartó este pool (cerrado): se reintenta con el nuevo
+                if ejecutor is self._pool_parseo or ejecutor is self._executor:
+                    raise
+        else:
+            resultado, segundos = await loop.run_in_executor(
+                self._executor, ejecutar_medido, funcion, *args, backend, parcial
+            )
+        registrar_etapa(funcion.__name__, segundos)
+        registrar_etapa('espera_parseo', max(time.perf_counter() - inicio - segundos, 0.0))
+        return resultado
+
+    def _reemplazar_pool_parseo(self, roto, reconstruir: bool = True):
+        """Descarta un pool de parseo roto y usa uno nuevo (o, si no se puede, los threads de red)"""
+        if roto is not self._pool_parseo:
+            return  # ya lo reemplazó otro parseo
+        descartar_pool_parseo(roto)
+        nuevo = None
+        if reconstruir:
+            try:
+                nuevo = obtener_pool_parseo()
+            except Exception as e:
+                print(f"   ⚠️ No se pudo recrear el pool de parseo ({e})")
+        print(f"   ⚠️ Pool de parseo roto, se sigue {'con uno nuevo' if nuevo else 'en los threads de red'}")
+        self._pool_parseo = nuevo
+
+    async def _procesar_articulo(self, fuente: FuenteNoticias, titulo: str, enlace: str,
+                                 seccion: str) -> Optional[Dict]:
+        try:
+            contenido, response = await self._en_executor(fuente, enlace, _descargar_articulo, enlace, _get_http)
+        except FuenteSuspendida:
+            return None
+        except RespuestaLimitada:
+            print(f"   ⚠️ 429 persistente en {enlace[:30]}..., se omite")
+            self._anotar(fuente, 'articulos', False)
+            return None
+        self._anotar(fuente, 'articulos', contenido is not None or response is not None)
+
+        if response is not None:
+            # El selector aprendido para este tipo de URL se prueba primero
+            preferido = _selector_preferido(enlace)
+            try:
+                contenido, selector = await self._parsear(
+                    fuente.extraer_cuerpo, response.content, 'utf-8', preferido
+                )
+            except Exception as e:
+                print(f"   ⚠️ Error extrayendo {enlace[:30]}...: {e}")
+                return None
+            _registrar_selector(enlace, preferido, selector)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, _guardar_en_cache, enlace, response, contenido)
+
+        return await self._entregar(fuente, titulo, enlace, seccion, contenido)
+
+    async def _entregar(self, fuente: FuenteNoticias, titulo: str, enlace: str, seccion: str,
+                        contenido: Optional[str]) -> Optional[Dict]:
+        """Arma la noticia, descarta duplicados y la pasa al callback de streaming"""
+        if not contenido:
+            return None
+        noticia = _armar_noticia(titulo, enlace, contenido, seccion, fuente.nombre)
+        if self.deduplicador is not None:
+            with medir_etapa('dedup'):
+                canonica = self.deduplicador.registrar(noticia)
+            if canonica is not None:
+                return None
+        if self.al_extraer:
+            # Incluye la espera por contrapresión de las colas del pipeline
+            loop = asyncio.get_running_loop()
+            with medir_etapa('entrega'):
+                await loop.run_in_executor(self._executor, self.al_extraer, noticia)
+        self.fuentes[fuente.nombre]['noticias'] += 1
+        return noticia
+
+    async def _leer_listado(self, fuente: FuenteNoticias, seccion_url: str,
+                            pagina: int) -> Optional[List[Tuple[str, str]]]:
+        """
+        Lee una página de listado y devuelve solo las entradas no vistas.
+
+        Returns:
+            Lista (posiblemente vacía) de entradas nuevas, o None si la página falló.
+        """
+        from config import DATA_STORE
+
+        url = fuente.url_pagina(seccion_url, pagina)
+        seccion = fuente.nombre_seccion(seccion_url)
+
+        try:
+            print(f"   ...leyendo {url}")
+            DATA_STORE['current_action'] = f"Leyendo sección: {seccion.capitalize()}..."
+            response = await self._en_executor(fuente, url, _get_http, url, 15)
+
+            if response.status_code != 200:
+                print(f"   ❌ Error {response.status_code} en {url}")
+                self._anotar(fuente, 'listados', False)
+                return None
+
+            entradas = await self._parsear(fuente.parsear_listado, response.content, response.encoding)
+        except FuenteSuspendida:
+            return None
+        except Exception as e:
+            print(f"   ❌ Error crítico en {url}: {e}")
+            self._anotar(fuente, 'listados', False)
+            return None
+
+        self._anotar(fuente, 'listados', True)
+        self.paginas_leidas[seccion] = self.paginas_leidas.get(seccion, 0) + 1
+        return self._filtrar_conocidas(entradas, seccion)
+
+    def _filtrar_conocidas(self, entradas: List[Tuple[str, str]], seccion: str) -> List[Tuple[str, str]]:
+        """
+        Solo las entradas que no vimos antes. Una URL que ya salió en esta
+        corrida (otra sección u otra página) no se descarga de nuevo: pasa al
+        deduplicador, que suma la sección a la noticia canónica. Las ya
+        ingeridas en corridas anteriores también, por si aparecen en otra
+        sección.
+        """
+        nuevas = []
+        for titulo, enlace in entradas:
+            if enlace in self._en_corrida:
+                if self.deduplicador is not None:
+                    self.deduplicador.registrar_url(enlace, seccion)
+            elif enlace in self.conocidas:
+                self.omitidas += 1
+                if self.deduplicador is not None:
+                    self.deduplicador.registrar_url(enlace, seccion, previa=True)
+            else:
+                self.conocidas.add(enlace)
+                self._en_corrida.add(enlace)
+                nuevas.append((titulo, enlace))
+        return nuevas
+
+    async def _procesar_entradas(self, fuente: FuenteNoticias, entradas: List[Tuple[str, str]], seccion: str):
+        """Descarga los artículos de una página y registra la página como completada"""
+        resultados = await asyncio.gather(
+            *(self._procesar_articulo(fuente, titulo, enlace, seccion) for titulo, enlace in entradas)
+        )
+        self._registrar_paginas([r for r in resultados if r])
+
+    async def _procesar_seccion(self, fuente: FuenteNoticias, seccion_url: str, minimo: int, maximo: int):
+        """
+        Paginación adaptativa de una sección.
+
+        Las primeras `minimo` páginas se leen en paralelo; a partir de ahí se
+        sigue bajando mientras la última página tenga URLs nuevas, hasta `maximo`.
+        Los artículos de cada página se descargan mientras se lee la siguiente.
+        """
+        seccion = fuente.nombre_seccion(seccion_url)
+        tareas = []
+
+        listados = await asyncio.gather(
+            *(self._leer_listado(fuente, seccion_url, pag) for pag in range(1, minimo + 1))
+        )
+        for entradas in listados:
+            tareas.append(asyncio.ensure_future(self._procesar_entradas(fuente, entradas or [], seccion)))
+
+        pagina = minimo
+        ultima = listados[-1] if listados else None
+        while ultima and pagina < maximo:
+            pagina += 1
+            ultima = await self._leer_listado(fuente, seccion_url, pagina)
+            tareas.append(asyncio.ensure_future(self._procesar_entradas(fuente, ultima or [], seccion)))
+
+        if pagina < maximo:
+            if self._suspendida(fuente):
+                motivo = "fuente suspendida"
+            else:
+                motivo = "error" if ultima is None else "sin novedades"
+            print(f"   ⏹️ {seccion}: {motivo} en la página {pagina}, se omiten {maximo - pagina} páginas")
+            self._registrar_paginas([], maximo - pagina)
+
+        await asyncio.gather(*tareas)
+
+    async def _procesar_fuente(self, fuente: FuenteNoticias, secciones: Dict):
+        """Todas las secciones de una fuente, en paralelo dentro de su pool"""
+        self.fuentes[fuente.nombre]['secciones'] = len(secciones)
+        await asyncio.gather(*(
+            self._procesar_seccion(fuente, seccion_url, *limites_paginas(valor))
+            for seccion_url, valor in secciones.items()
+        ))
+
+    def _registrar_paginas(self, noticias: List[Dict], cantidad: int = 1):
+        """Acumula resultados y actualiza la barra de progreso"""
+        from config import DATA_STORE
+
+        if noticias:
+            self._noticias.extend(noticias)
+            DATA_STORE['titulares'].extend(noticias)
+
+        # Actualizar progreso
+        self._paginas_procesadas += cantidad
+        # El scraping es el 45% del proceso total
+        DATA_STORE['progress'] = int((self._paginas_procesadas / self._total_paginas) * 45)
+
+    async def ejecutar(self, grupos: List[Tuple[FuenteNoticias, Dict]]) -> List[Dict]:
+        """Rastrea todas las fuentes (pares fuente, secciones) y devuelve las noticias extraídas"""
+        self._limite_global = asyncio.Semaphore(self.max_concurrencia)
+        self._limites_fuente = {}
+        self.fuentes = {}
+        self._noticias = []
+        self.paginas_leidas = {}
+
+        for fuente, _ in grupos:
+            self._preparar_fuente(fuente)
+
+        # Calcular total de tareas para la barra de progreso (con el techo de cada sección)
+        self._total_paginas = max(sum(limites_paginas(valor)[1]
+                                      for _, secciones in grupos for valor in secciones.values()), 1)
+        self._paginas_procesadas = 0
+
+        self._pool_parseo = obtener_pool_parseo()
+        with ThreadPoolExecutor(max_workers=self.max_concurrencia) as executor:
+            self._executor = executor
+            await asyncio.gather(*(
+                self._procesar_fuente(fuente, secciones) for fuente, secciones in grupos
+            ))
+
+        self._executor = None
+        return self._noticias
+
+
+class CoordinadorCrawl(MotorCrawl):
+    """
+    Crawl repartido entre procesos trabajadores (ver crawl_workers.py).
+
+    El coordinador encola los listados en la cola durable, recibe los
+    resultados en streaming, decide la paginación adaptativa y encola los
+    artículos nuevos. Deduplicación, callback de streaming, contabilidad por
+    fuente y escrituras en las cachés se hacen aquí, igual que en MotorCrawl;
+    los trabajadores solo descargan y parsean (y devuelven con cada resultado
+    su telemetría y los contadores de su limitador). Si un trabajador muere
+    se lanza otro y su trabajo en curso se reintenta al vencer el lease.
+    """
+
+    def __init__(self, procesos: int, hilos: Optional[int] = None, ruta: Optional[str] = None,
+                 lease: Optional[float] = None, max_intentos: Optional[int] = None, **opciones):
+        import config
+
+        super().__init__(**opciones)
+        self.procesos = max(procesos, 1)
+        self.hilos = hilos if hilos is not None else config.CRAWL_HILOS_POR_PROCESO
+        self.ruta = ruta or config.CRAWL_COLA_ARCHIVO
+        self.lease = lease if lease is not None else config.CRAWL_LEASE
+        self.max_intentos = max_intentos if max_intentos is not None else config.CRAWL_MAX_INTENTOS
+        self.reinicios = 0
+        self.cola_stats = {}
+        self._cola = None
+        self._trabajadores = []
+        self._detener = None
+        self._ajustes = None
+        self._esperando = {}
+        self._secciones = {}
+        self._paginas = {}
+
+    # --------------------------------------------------------------------------
+    # Procesos trabajadores
+    # --------------------------------------------------------------------------
+
+    def _lanzar_trabajador(self, indice: int):
+        import multiprocessing
+        from crawl_workers import proceso_trabajador
+
+        contexto = multiprocessing.get_context('spawn')
+        proceso = contexto.Process(
+            target=proceso_trabajador,
+            args=(self.ruta, f"trabajador-{indice}", self._ajustes, self.hilos,
+                  self.lease, self.max_intentos, self._detener),
+            daemon=True
+        )
+        proceso.start()
+        return proceso
+
+    def _arrancar_trabajadores(self):
+        import multiprocessing
+        from crawl_workers import ajustes_para_trabajadores
+
+        self._ajustes = ajustes_para_trabajadores(self.procesos)
+        self._detener = multiprocessing.get_context('spawn').Event()
+        self._trabajadores = [self._lanzar_trabajador(i) for i in range(self.procesos)]
+        print(f"   👷 {self.procesos} procesos trabajadores x {self.hilos} threads")
+
+    def _vigilar_trabajadores(self):
+        """Reemplaza a los trabajadores caídos (su trabajo vuelve a la cola al vencer el lease)"""
+        for i, proceso in enumerate(self._trabajadores):
+            if proceso.is_alive():
+                continue
+            if self.reinicios >= 3 * self.procesos:
+                raise RuntimeError("los procesos trabajadores se caen una y otra vez, se aborta el crawl")
+            print(f"   ⚠️ Trabajador {i} terminó (código {proceso.exitcode}), se lanza otro")
+            self.reinicios += 1
+            self._trabajadores[i] = self._lanzar_trabajador(i)
+
+    def _detener_trabajadores(self):
+        if self._detener is not None:
+            self._detener.set()
+        for proceso in self._trabajadores:
+            proceso.join(timeout=5)
+            if proceso.is_alive():
+                proceso.terminate()
+        self._trabajadores = []
+
+    # --------------------------------------------------------------------------
+    # Trabajos
+    # --------------------------------------------------------------------------
+
+    def _encolar_listado(self, fuente: FuenteNoticias, seccion_url: str, pagina: int):
+        url = fuente.url_pagina(seccion_url, pagina)
+        clave = f"listado:{url}"
+        print(f"   ...leyendo {url}")
+        self._esperando[clave] = {'tipo': 'listado', 'fuente': fuente, 'seccion_url': seccion_url, 'pagina': pagina}
+        self._cola.encolar([(clave, 'listado', fuente.nombre, {'fuente': fuente, 'url': url})])
+
+    def _encolar_articulos(self, fuente: FuenteNoticias, seccion: str, pagina: str,
+                           entradas: List[Tuple[str, str]]):
+        trabajos = []
+        for titulo, enlace in entradas:
+            clave = f"articulo:{enlace}"
+            self._esperando[clave] = {'tipo': 'articulo', 'fuente': fuente, 'titulo': titulo,
+                                      'enlace': enlace, 'seccion': seccion, 'pagina': pagina}
+            trabajos.append((clave, 'articulo', fuente.nombre, {'fuente': fuente, 'enlace': enlace}))
+        self._cola.encolar(trabajos)
+
+    def _cerrar_pagina(self, pagina: str, noticia: Optional[Dict] = None):
+        """Cuenta un artículo terminado; la página se registra al terminar el último"""
+        estado = self._paginas[pagina]
+        if noticia:
+            estado['noticias'].append(noticia)
+        estado['pendientes'] -= 1
+        if estado['pendientes'] <= 0:
+            self._registrar_paginas(estado['noticias'])
+            del self._paginas[pagina]
+
+    def _seguir_paginando(self, trabajo: Dict, nuevas: Optional[List]):
+        """Misma política que MotorCrawl._procesar_seccion, decidida al llegar cada listado"""
+        fuente, seccion_url, pagina = trabajo['fuente'], trabajo['seccion_url'], trabajo['pagina']
+        seccion = self._secciones[seccion_url]
+        if pagina != seccion['frontera']:
+            return
+
+        maximo = seccion['maximo']
+        if nuevas and pagina < maximo and not self._suspendida(fuente):
+            seccion['frontera'] = pagina + 1
+            self._encolar_listado(fuente, seccion_url, pagina + 1)
+        elif pagina < maximo:
+            if self._suspendida(fuente):
+                motivo = "fuente suspendida"
+            else:
+                motivo = "error" if nuevas is None else "sin novedades"
+            print(f"   ⏹️ {fuente.nombre_seccion(seccion_url)}: {motivo} en la página {pagina}, "
+                  f"se omiten {maximo - pagina} páginas")
+            self._registrar_paginas([], maximo - pagina)
+
+    def _limitada_por_retry_after(self, fuente: FuenteNoticias, ok: bool, datos: Dict):
+        """Un trabajador recibió un 429 con Retry-After mayor que el tope: se suspende la fuente"""
+        if ok and datos.get('retry_after_excedido'):
+            self.fuentes[fuente.nombre]['respuestas_429'] += 1
+            self._suspender(fuente, "pide un Retry-After mayor que SCRAPER_MAX_RETRY_AFTER")
+
+    def _cancelar_fuente(self, fuente: FuenteNoticias):
+        """Fuente suspendida: sus trabajos pendientes se cancelan y se dan por terminados"""
+        for clave in self._cola.cancelar_fuente(fuente.nombre):
+            trabajo = self._esperando.pop(clave, None)
+            if trabajo is None:
+                continue
+            if trabajo['tipo'] == 'listado':
+                self._registrar_paginas([])
+                self._seguir_paginando(trabajo, None)
+            else:
+                self._cerrar_pagina(trabajo['pagina'])
+
+    def _atender_listado(self, clave: str, trabajo: Dict, ok: bool, datos: Dict):
+        from config import DATA_STORE
+
+        fuente = trabajo['fuente']
+        seccion = fuente.nombre_seccion(trabajo['seccion_url'])
+        telemetria = obtener_telemetria()
+        DATA_STORE['current_action'] = f"Leyendo sección: {seccion.capitalize()}..."
+
+        nuevas = None
+        if ok and telemetria is not None:
+            telemetria.incorporar(datos.get('telemetria'))
+        if ok:
+            LIMITADOR.incorporar(datos.get('limitador'))
+        if not ok:
+            print(f"   ❌ Error crítico en {clave[len('listado:'):]}: {datos.get('error')}")
+        elif datos['entradas'] is None:
+            print(f"   ❌ Error {datos['estado']} en {clave[len('listado:'):]}")
+        else:
+            nuevas = self._filtrar_conocidas(datos['entradas'], seccion)
+            self.paginas_leidas[seccion] = self.paginas_leidas.get(seccion, 0) + 1
+
+        self._anotar(fuente, 'listados', nuevas is not None)
+        if not ok and '429' in str(datos.get('error')):
+            self.fuentes[fuente.nombre]['respuestas_429'] += 1
+        self._limitada_por_retry_after(fuente, ok, datos)
+
+        if nuevas:
+            self._paginas[clave] = {'pendientes': len(nuevas), 'noticias': []}
+            self._encolar_articulos(fuente, seccion, clave, nuevas)
+        else:
+            self._registrar_paginas([])
+        self._seguir_paginando(trabajo, nuevas)
+        if self._suspendida(fuente):
+            self._cancelar_fuente(fuente)
+
+    async def _atender_articulo(self, trabajo: Dict, ok: bool, datos: Dict):
+        fuente, enlace = trabajo['fuente'], trabajo['enlace']
+        contenido = None
+        telemetria = obtener_telemetria()
+        if ok and telemetria is not None:
+            telemetria.incorporar(datos.get('telemetria'))
+        if ok:
+            LIMITADOR.incorporar(datos.get('limitador'))
+        cache = obtener_cache_http()
+        if cache and ok and datos.get('consulta'):
+            cache.registrar_consulta(datos['consulta']['en_cache'], datos['consulta']['revalidada'])
+
+        if not ok:
+            print(f"   ⚠️ Error extrayendo {enlace[:30]}...: {datos.get('error')}")
+            if '429' in str(datos.get('error')):
+                self.fuentes[fuente.nombre]['respuestas_429'] += 1
+        elif datos['estado'] == 304:
+            if cache:
+                cache.registrar_no_modificado({'bytes': datos['bytes']})
+            contenido = datos['contenido']
+        elif datos['estado'] == 200:
+            contenido = datos['contenido']
+            _registrar_selector(enlace, datos['preferido'], datos['selector'])
+            from crawl_workers import RespuestaGuardada
+            respuesta = RespuestaGuardada(datos['cuerpo'], datos['cabeceras'])
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, _guardar_en_cache, enlace, respuesta, contenido)
+
+        self._anotar(fuente, 'articulos', ok and datos['estado'] in (200, 304))
+        self._limitada_por_retry_after(fuente, ok, datos)
+        noticia = await self._entregar(fuente, trabajo['titulo'], enlace, trabajo['seccion'], contenido)
+        self._cerrar_pagina(trabajo['pagina'], noticia)
+        if self._suspendida(fuente):
+            self._cancelar_fuente(fuente)
+
+    # --------------------------------------------------------------------------
+    # Corrida
+    # --------------------------------------------------------------------------
+
+    async def ejecutar(self, grupos: List[Tuple[FuenteNoticias, Dict]]) -> List[Dict]:
+        """Rastrea todas las fuentes con los procesos trabajadores y devuelve las noticias extraídas"""
+        from crawl_queue import ColaTrabajos
+
+        self.fuentes = {}
+        self._noticias = []
+        self.paginas_leidas = {}
+        self._esperando = {}
+        self._secciones = {}
+        self._paginas = {}
+        for fuente, _ in grupos:
+            self._preparar_fuente(fuente)
+
+        self._total_paginas = max(sum(limites_paginas(valor)[1]
+                                      for _, secciones in grupos for valor in secciones.values()), 1)
+        self._paginas_procesadas = 0
+
+        self._cola = ColaTrabajos(self.ruta, self.lease, self.max_intentos)
+        self._cola.reiniciar()
+        self._cola.configurar_fuentes({f.nombre: f.max_concurrencia or self.max_por_host for f, _ in grupos})
+
+        for fuente, secciones in grupos:
+            self.fuentes[fuente.nombre]['secciones'] = len(secciones)
+            for seccion_url, valor in secciones.items():
+                minimo, maximo = limites_paginas(valor)
+                self._secciones[seccion_url] = {'frontera': minimo, 'maximo': maximo}
+                for pagina in range(1, minimo + 1):
+                    self._encolar_listado(fuente, seccion_url, pagina)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            self._executor = executor
+            self._arrancar_trabajadores()
+            try:
+                ultimo = 0
+                while self._esperando:
+                    resultados = self._cola.resultados_desde(ultimo)
+                    if not resultados:
+                        self._vigilar_trabajadores()
+                        await asyncio.sleep(0.02)
+                        continue
+                    for id_resultado, clave, tipo, ok, datos in resultados:
+                        ultimo = id_resultado
+                        trabajo = self._esperando.pop(clave, None)
+                        if trabajo is None:
+                            continue
+                        if tipo == 'listado':
+                            self._atender_listado(clave, trabajo, ok, datos)
+                        else:
+                            await self._atender_articulo(trabajo, ok, datos)
+            finally:
+                self._detener_trabajadores()
+                self.cola_stats = self._cola.estadisticas()
+                self._cola.cerrar()
+                self._cola = None
+                self._executor = None
+
+        return self._noticias
+
+
+_POOL_PARSEO = None
+_POOL_PARSEO_LOCK = threading.Lock()
+
+
+def obtener_pool_parseo() -> Optional[ProcessPoolExecutor]:
+    """
+    Pool de procesos compartido para la etapa de parseo (se crea una vez, o
+    de nuevo si se descartó por roto).
+
+    Devuelve None si PARSEO_PROCESOS = 0: en ese caso se parsea en los
+    threads de red, como antes. Los procesos se crean con "spawn": para
+    entonces ya hay threads cargando BERT y el modelo de embeddings, y un
+    fork los copiaría a medio estado.
+    """
+    global _POOL_PARSEO
+    from config import PARSEO_PROCESOS
+
+    if PARSEO_PROCESOS <= 0:
+        return None
+    with _POOL_PARSEO_LOCK:
+        if _POOL_PARSEO is None:
+            _POOL_PARSEO = ProcessPoolExecutor(
+                max_workers=PARSEO_PROCESOS, mp_context=multiprocessing.get_context('spawn')
+            )
+            atexit.register(_POOL_PARSEO.shutdown, wait=False, cancel_futures=True)
+        return _POOL_PARSEO
+
+
+def descartar_pool_parseo(pool: ProcessPoolExecutor):
+    """Un pool roto (murió un proceso) se reemplaza en el próximo obtener_pool_parseo()"""
+    global _POOL_PARSEO
+    with _POOL_PARSEO_LOCK:
+        if _POOL_PARSEO is pool:
+            _POOL_PARSEO = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def limites_paginas(valor) -> Tuple[int, int]:
+    """
+    Normaliza un valor de SECCIONES_CONFIG a (piso, techo) de páginas.
+
+    Acepta un entero (techo; el piso es PAGINAS_MINIMAS) o un diccionario
+    {"max": n, "min": m}.
+    """
+    from config import PAGINAS_MINIMAS
+
+    if isinstance(valor, dict):
+        maximo = int(valor.get('max', 1))
+        minimo = int(valor.get('min', PAGINAS_MINIMAS))
+    else:
+        maximo = int(valor)
+        minimo = PAGINAS_MINIMAS
+
+    maximo = max(maximo, 1)
+    return min(max(minimo, 1), maximo), maximo
+
+
+def extraer_todas_las_noticias(conocidas: Optional[Set[str]] = None,
+                               al_extraer: Optional[Callable[[Dict], None]] = None,
+                               deduplicador: Optional[Deduplicador] = None,
+                               secciones: Optional[Dict] = None) -> List[Dict]:
+    """
+    Función principal de scraping multi-sección.
+
+    Args:
+        conocidas: URLs ya procesadas (modo incremental). Las entradas de los
+            listados que estén aquí no se descargan ni se devuelven.
+        al_extraer: callback opcional que recibe cada noticia apenas se extrae.
+        deduplicador: índice de deduplicación a usar (p. ej. sembrado con el
+            corpus previo); si es None se crea uno vacío según config.
+        secciones: subconjunto de las secciones configuradas (de cualquier
+            fuente) a rastrear (None = todas las de todas las fuentes).
+    """
+    from config import CRAWL_PROCESOS
+
+    fuentes = cargar_fuentes()
+    if secciones is None:
+        secciones = {url: valor for fuente in fuentes for url, valor in fuente.secciones.items()}
+    grupos = agrupar_por_fuente(secciones, fuentes)
+    print(f"\n🔄 Iniciando scraping asíncrono de {len(secciones)} secciones "
+          f"en {len(grupos)} fuente{'s' if len(grupos) != 1 else ''}...")
     start_time = time.time()
-    
-    todas_las_noticias = []
-    
-    # Calcular total de tareas para la barra de progreso
-    total_paginas = sum(SECCIONES_CONFIG.values())
-    paginas_procesadas = 0
-    
-    # Iterar sobre cada sección configurada
-    for seccion_url, num_paginas in SECCIONES_CONFIG.items():
-        nombre_seccion = seccion_url.split('/')[-1].capitalize()
-        print(f"\n📂 Procesando sección: {seccion_url} ({num_paginas} páginas)")
-        
-        DATA_STORE['current_action'] = f"Leyendo sección: {nombre_seccion}..."
-        
-        # Procesamos páginas de esta sección
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            futures = {
-                executor.submit(extraer_titulares_pagina, seccion_url, pag): pag 
-                for pag in range(1, num_paginas + 1)
-            }
-            
-            for future in as_completed(futures):
-                noticias_pagina = future.result()
-                if noticias_pagina:
-                    todas_las_noticias.extend(noticias_pagina)
-                    DATA_STORE['titulares'].extend(noticias_pagina)
-                
-                # Actualizar progreso
-                paginas_procesadas += 1
-                # El scraping es el 45% del proceso total
-                progreso_actual = int((paginas_procesadas / total_paginas) * 45)
-                DATA_STORE['progress'] = progreso_actual
-    
+    _configurar_limites_fuentes(fuentes)
+
+    cache = obtener_cache_http()
+    if cache:
+        cache.reiniciar_estadisticas()
+    LIMITADOR.reiniciar_estadisticas()
+    telemetria = obtener_telemetria()
+    if telemetria is not None:
+        telemetria.reiniciar()
+    mapa = obtener_mapa_selectores()
+    if mapa is not None:
+        mapa.reiniciar_estadisticas()
+
+    if deduplicador is None:
+        deduplicador = crear_deduplicador()
+
+    opciones = {
+        'conocidas': set(conocidas) if conocidas is not None else None,
+        'al_extraer': al_extraer,
+        'deduplicador': deduplicador
+    }
+    if CRAWL_PROCESOS > 0:
+        motor = CoordinadorCrawl(CRAWL_PROCESOS, **opciones)
+    else:
+        motor = MotorCrawl(**opciones)
+    todas_las_noticias = asyncio.run(motor.ejecutar(grupos))
+    _ULTIMO_REFRESCO['fuentes'] = motor.fuentes
+
     duration = time.time() - start_time
-    print(f"\n✅ Scraping completado: {len(todas_las_noticias)} noticias en {duration:.1f}s\n")
+    print(f"\n✅ Scraping completado: {len(todas_las_noticias)} noticias en {duration:.1f}s")
+    if conocidas is not None:
+        print(f"   ♻️ Incremental: {motor.omitidas} entradas ya conocidas omitidas")
+    if deduplicador is not None:
+        dup = deduplicador.stats
+        print(f"   🧬 Duplicados descartados: {dup['url_repetida']} por URL, "
+              f"{dup['contenido_identico']} por contenido idéntico, {dup['casi_duplicadas']} casi idénticos")
+        _ULTIMO_REFRESCO['dedup'] = dict(dup)
+    if cache:
+        stats = cache.estadisticas()
+        print(f"   💾 Caché HTTP: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['revalidaciones']} revalidaciones, {stats['bytes_ahorrados'] / 1024:.0f} KB ahorrados")
+    if mapa is not None:
+        mapa.guardar()
+        sel = mapa.estadisticas()
+        if sel['intentos_preferido']:
+            print(f"   🎯 Selector aprendido: {sel['aciertos_preferido']}/{sel['intentos_preferido']} aciertos "
+                  f"({sel['tasa_aciertos']:.0%}) en {sel['patrones']} patrones de URL")
+    for nombre, stats in motor.fuentes.items():
+        fallos = stats['listados_fallidos'] + stats['articulos_fallidos']
+        estado = " (suspendida)" if stats['suspendida'] else ""
+        print(f"   📰 {nombre}: {stats['noticias']} noticias, {stats['listados']} listados, "
+              f"{stats['articulos']} artículos, {fallos} fallos, {stats['respuestas_429']} respuestas 429{estado}")
+    if isinstance(motor, CoordinadorCrawl):
+        cola = motor.cola_stats
+        print(f"   👷 Cola: {cola.get('hecho', 0)} trabajos hechos, {cola.get('fallido', 0)} fallidos, "
+              f"{cola['intentos']} intentos, {motor.reinicios} trabajadores reemplazados")
+    limites = LIMITADOR.estadisticas()
+    print(f"   🚦 Limitador: {limites['esperas']}/{limites['peticiones']} peticiones esperaron turno "
+          f"({limites['segundos_esperando']:.1f}s en total), {limites['respuestas_429']} respuestas 429"
+          + (f" ({limites['retry_after_excedidos']} con Retry-After sobre el tope)"
+             if limites['retry_after_excedidos'] else ""))
+    if telemetria is not None:
+        _resumir_telemetria(telemetria)
+    print()
     return todas_las_noticias
+
+
+def _resumir_telemetria(telemetria):
+    """Imprime las latencias y etapas del refresco y lo vuelca a disco si corresponde"""
+    from config import TELEMETRIA_DIR, TELEMETRIA_MAX_VOLCADOS
+
+    resumen = telemetria.resumen()
+    latencias = resumen['latencias']
+    estados = ", ".join(f"{clase}: {n}" for clase, n in sorted(resumen['estados'].items()))
+    print(f"   📈 Telemetría: {resumen['peticiones']} peticiones ({estados}), "
+          f"{resumen['bytes'] / 1024:.0f} KB, {resumen['reintentos']} reintentos; "
+          f"total p50/p90 {latencias['total']['p50_ms']}/{latencias['total']['p90_ms']} ms, "
+          f"TTFB p50 {latencias['ttfb']['p50_ms']} ms")
+    if resumen['etapas']:
+        etapas = ", ".join(f"{nombre} {datos['segundos']:.2f}s" for nombre, datos in resumen['etapas'].items())
+        print(f"   ⏱️ Etapas: {etapas}")
+    if TELEMETRIA_DIR:
+        print(f"   📝 Telemetría guardada en {telemetria.volcar(TELEMETRIA_DIR, TELEMETRIA_MAX_VOLCADOS)}")
+
+
+def _configurar_limites_fuentes(fuentes: List[FuenteNoticias]):
+    """Tasa y ráfaga propias de cada fuente en sus hosts (SCRAPER_TASAS_HOSTS manda)"""
+    for fuente in fuentes:
+        if fuente.tasa is None and fuente.rafaga is None:
+            continue
+        for host in fuente.hosts():
+            tasa = None if host in SCRAPER_TASAS_HOSTS else fuente.tasa
+            LIMITADOR.configurar_host(host, tasa, fuente.rafaga)
+
+
+# Estadísticas de deduplicación y por fuente del último refresco
+_ULTIMO_REFRESCO = {}
+
+
+def estadisticas_scraper() -> Dict:
+    """Métricas del último refresco del scraper (para la API)"""
+    cache = obtener_cache_http()
+    mapa = obtener_mapa_selectores()
+    telemetria = obtener_telemetria()
+    return {
+        'http_cache': cache.estadisticas() if cache else None,
+        'limitador': LIMITADOR.estadisticas(),
+        'dedup': _ULTIMO_REFRESCO.get('dedup'),
+        'fuentes': _ULTIMO_REFRESCO.get('fuentes'),
+        'selectores': mapa.estadisticas() if mapa is not None else None,
+        'telemetria': telemetria.resumen() if telemetria is not None else None
+    }
@@ -0,0 +1,147 @@
+# ================================================================================
+# selector_cache.py - SELECTOR DE CUERPO APRENDIDO POR SECCIÓN / PATRÓN DE URL
+# ================================================================================
+#
+# Para cada patrón de URL (host + ruta sin el slug final, p. ej.
+# "eldeber.com.bo/pais/*") recuerda qué selector de SELECTORES_CUERPO encontró
+# el cuerpo la última vez. El parseo prueba la cadena solo hasta ese selector
+# (así uno de mayor prioridad sigue ganando) y recorre el resto si no aparece.
+# El respaldo genérico ('article') nunca se aprende. El mapa se guarda en JSON
+# entre ejecuciones.
+#
+# ================================================================================
+
+import os
+import re
+import json
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+_DIGITOS = re.compile(r'\d+')
+
+
+def patron_url(url: str) -> str:
+    """Patrón de una URL de noticia: host + segmentos de ruta sin el último (slug)"""
+    partes = urlparse(url)
+    host = partes.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    segmentos = [s for s in partes.path.split('/') if s]
+    # Números en los segmentos intermedios (fechas, ids) no distinguen secciones
+    directorios = [_DIGITOS.sub('#', s) for s in segmentos[:-1]]
+    return "/".join([host] + directorios + ['*'])
+
+
+class MapaSelectores:
+    """Mapa persistente patrón → selector, con tasas de acierto por selector"""
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._mapa: Dict[str, str] = {}
+        self._cambios = False
+        if os.path.exists(ruta):
+            try:
+                with open(ruta, 'r', encoding='utf-8') as f:
+                    self._mapa = json.load(f).get('patrones', {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️ No se pudo leer el mapa de selectores ({e}), se empieza de cero")
+        self.reiniciar_estadisticas()
+
+    def reiniciar_estadisticas(self):
+        with self._lock:
+            # Por selector: veces que se probó primero, aciertos de esa prueba
+            # y veces que terminó siendo el que encontró el cuerpo
+            self._stats: Dict[str, Dict[str, int]] = {}
+            self._sin_cuerpo = 0
+
+    def preferido(self, url: str) -> Optional[str]:
+        """Selector a probar primero para la URL (None = cadena completa)"""
+        from parsing import SELECTOR_RESPALDO
+
+        with self._lock:
+            selector = self._mapa.get(patron_url(url))
+        # Mapas guardados por versiones que aprendían el respaldo
+        return None if selector == SELECTOR_RESPALDO else selector
+
+    def registrar(self, url: str, preferido: Optional[str], selector: Optional[str]):
+        """Anota el resultado de un parseo y aprende el selector ganador"""
+        from parsing import SELECTOR_RESPALDO
+
+        with self._lock:
+            if preferido:
+                stats = self._stats.setdefault(preferido, {'intentos': 0, 'aciertos': 0, 'encontrados': 0})
+                stats['intentos'] += 1
+                if selector == preferido:
+                    stats['aciertos'] += 1
+
+            if selector is None:
+                self._sin_cuerpo += 1
+                return
+
+            self._stats.setdefault(selector, {'intentos': 0, 'aciertos': 0, 'encontrados': 0})['encontrados'] += 1
+            patron = patron_url(url)
+            if selector == SELECTOR_RESPALDO:
+                # Una página sin cuerpo específico no dice nada del patrón
+                if self._mapa.get(patron) == SELECTOR_RESPALDO:
+                    del self._mapa[patron]
+                    self._cambios = True
+            elif self._mapa.get(patron) != selector:
+                # Nuevo, o uno de mayor prioridad le ganó al aprendido: se reaprende
+                self._mapa[patron] = selector
+                self._cambios = True
+
+    def guardar(self):
+        """Escribe el mapa si cambió (archivo temporal + rename: nunca queda a medias)"""
+        with self._lock:
+            if not self._cambios:
+                return
+            datos = {'patrones': dict(sorted(self._mapa.items()))}
+            self._cambios = False
+
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        temporal = self.ruta + ".tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False)
+        os.replace(temporal, self.ruta)
+
+    def estadisticas(self) -> Dict:
+        with self._lock:
+            selectores = {}
+            for selector, stats in self._stats.items():
+                intentos = stats['intentos']
+                selectores[selector] = {
+                    **stats,
+                    'tasa_aciertos': round(stats['aciertos'] / intentos, 3) if intentos else None
+                }
+            intentos = sum(s['intentos'] for s in self._stats.values())
+            aciertos = sum(s['aciertos'] for s in self._stats.values())
+            return {
+                'patrones': len(self._mapa),
+                'intentos_preferido': intentos,
+                'aciertos_preferido': aciertos,
+                'tasa_aciertos': round(aciertos / intentos, 3) if intentos else 0.0,
+                'sin_cuerpo': self._sin_cuerpo,
+                'selectores': selectores
+            }
+
+
+_MAPA = None
+_MAPA_LOCK = threading.Lock()
+
+
+def obtener_mapa_selectores() -> Optional[MapaSelectores]:
+    """Instancia compartida del mapa (None si el aprendizaje está desactivado)"""
+    global _MAPA
+    import config
+
+    if not config.SELECTORES_APRENDIDOS:
+        return None
+
+    with _MAPA_LOCK:
+        if _MAPA is None:
+            _MAPA = MapaSelectores(config.SELECTORES_ARCHIVO)
+    return _MAPA
@@ -2,44 +2,169 @@
 # sentiment.py - ANÁLISIS DE SENTIMIENTOS HÍBRIDO (BERT + PALABRAS CLAVE)
 # ================================================================================
 
-from transformers import pipeline
-from typing import List, Dict, Tuple
-import re
+import os
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple
+
+from sentiment_cache import obtener_cache_sentimientos
 
 # ================================================================================
 # 1. CONFIGURACIÓN DEL MODELO BERT MULTILINGUAL
 # ================================================================================
+#
+# El modelo NO se carga al importar: importar transformers y levantar BERT
+# tarda varios segundos y cualquier proceso que importe `chatbot` (el bot de
+# Telegram, los scripts) lo pagaría antes de hacer nada. Se carga en la
+# primera noticia que lo necesita, o antes en background con
+# precargar_modelo_sentimiento(). Mientras tanto el paso de palabras clave
+# funciona igual; estado_modelo_sentimiento() dice si ya está listo.
+#
+# ================================================================================
+
+_MODELO = {'pipeline': None, 'estado': 'sin_cargar', 'error': None}
+_MODELO_LISTO = threading.Event()  # se activa al terminar la carga (con éxito o no)
+_LOCK_MODELO = threading.Lock()
+
+
+# Backends de inferencia: "fp32" (PyTorch tal cual), "int8" (cuantización
+# dinámica de las capas Linear con torch) y "onnx" (grafo exportado, ejecutado
+# con onnxruntime vía optimum). Las etiquetas ("N stars") y su mapeo a
+# sentimiento son los mismos; ver benchmarks/concordancia_backends.py.
+BACKENDS_SENTIMIENTO = ('fp32', 'int8', 'onnx')
+
+
+_BACKENDS_AVISADOS = set()
+
+
+def backend_sentimiento_disponible(backend: str) -> str:
+    """Devuelve el backend pedido si se puede usar; si no, 'fp32'"""
+    if backend == 'onnx':
+        try:
+            import onnxruntime  # noqa: F401
+            import optimum.onnxruntime  # noqa: F401
+        except ImportError:
+            if backend not in _BACKENDS_AVISADOS:
+                _BACKENDS_AVISADOS.add(backend)
+                print("⚠️ Backend 'onnx' requiere onnxruntime y optimum; se usa 'fp32'")
+            return 'fp32'
+    return backend if backend in BACKENDS_SENTIMIENTO else 'fp32'
+
+
+def _modelo_onnx(modelo: str):
+    """Modelo ONNX exportado una vez y guardado en SENTIMIENTO_ONNX_DIR"""
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from config import SENTIMIENTO_ONNX_DIR
+
+    # Mismos threads intra-op que torch (los fija el pool de procesos, sección 3.1)
+    opciones = onnxruntime.SessionOptions()
+    opciones.intra_op_num_threads = int(os.environ.get('OMP_NUM_THREADS', 0))
+
+    directorio = os.path.join(SENTIMIENTO_ONNX_DIR, modelo.replace('/', '__'))
+    if os.path.exists(os.path.join(directorio, 'model.onnx')):
+        return ORTModelForSequenceClassification.from_pretrained(directorio, session_options=opciones)
+
+    print(f"📦 Exportando {modelo} a ONNX (solo la primera vez)...")
+    exportado = ORTModelForSequenceClassification.from_pretrained(modelo, export=True)
+    exportado.save_pretrained(directorio)
+    return ORTModelForSequenceClassification.from_pretrained(directorio, session_options=opciones)
+
+
+def crear_pipeline_sentimiento(backend: Optional[str] = None, modelo: Optional[str] = None):
+    """Pipeline de clasificación con el backend indicado (por defecto, el de config)"""
+    import config
+    from transformers import pipeline
+
+    modelo = modelo or config.SENTIMIENTO_MODELO
+    backend = backend_sentimiento_disponible(backend or config.SENTIMIENTO_BACKEND)
+
+    if backend == 'fp32':
+        return pipeline("sentiment-analysis", model=modelo, device=-1)  # CPU
+
+    from transformers import AutoTokenizer
+    tokenizer = AutoTokenizer.from_pretrained(modelo)
+    if backend == 'int8':
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        base = AutoModelForSequenceClassification.from_pretrained(modelo)
+        cuantizado = torch.quantization.quantize_dynamic(base, {torch.nn.Linear}, dtype=torch.qint8)
+        return pipeline("sentiment-analysis", model=cuantizado, tokenizer=tokenizer, device=-1)
+    return pipeline("sentiment-analysis", model=_modelo_onnx(modelo), tokenizer=tokenizer)
+
+
+def _cargar_modelo():
+    """Carga el pipeline de BERT (una sola vez por proceso; con error no se reintenta)"""
+    with _LOCK_MODELO:
+        if _MODELO_LISTO.is_set():
+            return
+        from config import SENTIMIENTO_BACKEND
+
+        _MODELO['estado'] = 'cargando'
+        print(f"🔄 Cargando modelo BERT multilingual para análisis de sentimientos ({SENTIMIENTO_BACKEND})...")
+        try:
+            _MODELO['pipeline'] = crear_pipeline_sentimiento()
+            _MODELO['estado'] = 'listo'
+            print("✅ Modelo BERT cargado correctamente\n")
+        except Exception as e:
+            _MODELO['estado'] = 'error'
+            _MODELO['error'] = f"{type(e).__name__}: {e}"
+            print(f"❌ No se pudo cargar el modelo BERT: {e}")
+        finally:
+            _MODELO_LISTO.set()
+
+
+def precargar_modelo_sentimiento() -> threading.Event:
+    """
+    Empieza a cargar BERT en un thread de fondo; devuelve el evento que indica
+    que terminó. Con SENTIMIENTO_PROCESOS > 0 el modelo se carga en cada
+    proceso del pool (ver sección 3.1), no en este.
+    """
+    from config import SENTIMIENTO_PROCESOS
+
+    if SENTIMIENTO_PROCESOS > 0:
+        return _precargar_pool()
+    if _MODELO['estado'] == 'sin_cargar':
+        # Se marca antes de lanzar el thread para no lanzar dos
+        _MODELO['estado'] = 'cargando'
+        threading.Thread(target=_cargar_modelo, name="carga-bert", daemon=True).start()
+    return _MODELO_LISTO
+
+
+def estado_modelo_sentimiento() -> Dict:
+    """'sin_cargar', 'cargando', 'listo' o 'error' (con el motivo), del pool si se usa"""
+    from config import SENTIMIENTO_PROCESOS
+
+    estado = _POOL_ESTADO if SENTIMIENTO_PROCESOS > 0 else _MODELO
+    return {'estado': estado['estado'], 'error': estado['error']}
+
+
+def modelo_sentimiento_listo() -> bool:
+    return estado_modelo_sentimiento()['estado'] == 'listo'
+
+
+def obtener_modelo_sentimiento(esperar: bool = True):
+    """
+    Pipeline de BERT, cargándolo si hace falta. Con `esperar=False` no
+    bloquea: devuelve None mientras se carga (o si la carga falló).
+    """
+    if not _MODELO_LISTO.is_set():
+        if not esperar:
+            precargar_modelo_sentimiento()
+            return None
+        _cargar_modelo()
+    return _MODELO['pipeline']
 
-print("🔄 Cargando modelo BERT multilingual para análisis de sentimientos...")
-sentiment_pipeline = pipeline(
-    "sentiment-analysis",
-    model="nlptown/bert-base-multilingual-uncased-sentiment",
-    device=-1  # CPU
-)
-print("✅ Modelo BERT cargado correctamente\n")
 
 # ================================================================================
 # 2. PALABRAS CLAVE BOLIVIANAS (SISTEMA HÍBRIDO - PRIORIDAD MÁXIMA)
 # ================================================================================
 
-PALABRAS_NEGATIVAS = {
-    'muerte', 'falleció', 'fallecimiento', 'accidente', 'tragedia',
-    'bloqueo', 'protesta', 'enfrentamiento', 'represión', 'huelga',
-    'inundación', 'desastre', 'crisis', 'delincuencia', 'corrupción',
-    'violencia', 'robo', 'asesinato', 'homicidio', 'secuestro',
-    'pandemia', 'fallece', 'se accidentó', 'muerto', 'herido',
-    'víctima', 'victimas', 'víctimas', 'ataque', 'amenaza', 'denuncia', 'conflicto',
-    'feminicidio', 'abuso', 'abuso sexual', 'violencia de género'
-}
-
-PALABRAS_POSITIVAS = {
-    'ganó', 'triunfo', 'campeón', 'clasificó', 'acuerdo',
-    'celebración', 'inauguración', 'construcción', 'crecimiento',
-    'paz', 'seguridad', 'desarrollo', 'progreso', 'mejora',
-    'éxito', 'victoria', 'inauguró', 'concluyó', 'completó',
-    'superó', 'logro', 'récord', 'premio', 'reconocimiento',
-    'avance', 'beneficio', 'esperanza', 'solución', 'acuerdo'
-}
+# Los términos viven en lexicon.py, compilados en un solo patrón (recargable en caliente)
+from lexicon import PALABRAS_NEGATIVAS, PALABRAS_POSITIVAS, obtener_lexico
 
 # Colores para cada sentimiento
 COLORES = {
@@ -52,47 +177,20 @@ COLORES = {
 # 3. FUNCIÓN PRINCIPAL: analizar_sentimiento_noticia()
 # ================================================================================
 
-def analizar_sentimiento_noticia(texto: str) -> Tuple[str, str, str, str]:
+def analizar_por_palabras(texto: str, lexico=None):
     """
-    Analiza el sentimiento de una noticia usando sistema híbrido.
-    
-    PRIORIDAD:
-    1. Sistema de palabras clave bolivianas (SOBREESCRIBE BERT)
-    2. Modelo BERT multilingual (respaldo)
-    
-    Args:
-        texto: Título + contenido de la noticia
-    
+    Paso 1 del sistema híbrido: palabras clave bolivianas (con el léxico
+    indicado o el activo).
+
     Returns:
-        (emocion, color, nivel, descripcion)
-        Ejemplos:
-        - ("Negativo", "#FF6B6B", "Alto", "5 términos negativos")
-        - ("Positivo", "#4CAF50", "Alto", "3 términos positivos")
-        - ("Neutral", "#95A5A6", "Medio", "Score BERT: 0.82")
+        (emocion, color, nivel, descripcion), o None si el texto no tiene
+        ninguna palabra clave y hay que recurrir a BERT.
     """
-    
     if not texto or not texto.strip():
         return ("Neutral", COLORES['Neutral'], "Bajo", "Sin contenido")
     
-    texto_lower = texto.lower()
-    
-    # ========================================================================
-    # PASO 1: SISTEMA DE PALABRAS CLAVE BOLIVIANAS (PRIORIDAD MÁXIMA)
-    # ========================================================================
-    
-    score_negativo = 0
-    score_positivo = 0
-    
-    # Contar palabras negativas
-    for palabra in PALABRAS_NEGATIVAS:
-        # Usar búsqueda de palabra completa (word boundary)
-        if re.search(r'\b' + re.escape(palabra) + r'\b', texto_lower):
-            score_negativo += 1
-    
-    # Contar palabras positivas
-    for palabra in PALABRAS_POSITIVAS:
-        if re.search(r'\b' + re.escape(palabra) + r'\b', texto_lower):
-            score_positivo += 1
+    # Términos distintos de cada lista, en una sola pasada sobre el texto (lexicon.py)
+    score_negativo, score_positivo = (lexico or obtener_lexico()).contar(texto.lower())
     
     # Aplicar reglas del sistema híbrido
     # Priorizar palabras negativas: si se detecta al menos una palabra negativa, clasificar como Negativo.
@@ -112,50 +210,402 @@ def analizar_sentimiento_noticia(texto: str) -> Tuple[str, str, str, str]:
             "Alto",
             f"{score_positivo} término{'s' if score_positivo > 1 else ''} positivo{'s' if score_positivo > 1 else ''}"
         )
+    return None
+
+
+def _texto_bert(texto: str) -> str:
+    # Limitar texto para no exceder el límite del modelo
+    return texto[:512]
+
+
+def _sentimiento_bert(resultado: Dict) -> Tuple[str, str, str, str]:
+    """Paso 2: traduce la salida de BERT ({'label': 'N stars', 'score'}) al formato del sistema"""
+    label = resultado['label']  # Formato: "1 star", "2 stars", etc.
+    score = resultado['score']
+    
+    # Extraer número de estrellas
+    estrellas = int(label.split()[0])
+    
+    # Mapear estrellas a sentimiento
+    if estrellas <= 2:
+        emocion = "Negativo"
+    elif estrellas == 3:
+        emocion = "Neutral"
+    else:  # 4-5 estrellas
+        emocion = "Positivo"
+    
+    # Determinar nivel según score
+    nivel = "Alto" if score > 0.7 else "Medio"
+    
+    return (
+        emocion,
+        COLORES[emocion],
+        nivel,
+        f"BERT: {estrellas}★ (confianza: {score:.2f})"
+    )
+
+
+def analizar_con_modelo(modelo, texto: str) -> Tuple[str, str, str, str]:
+    """Solo el paso 2 (BERT) con un pipeline dado: para comparar backends sin el léxico"""
+    return _sentimiento_bert(modelo(_texto_bert(texto))[0])
+
+
+_ERROR_BERT = ("Neutral", COLORES['Neutral'], "Bajo", "Error en análisis")
+_MODELO_NO_DISPONIBLE = ("Neutral", COLORES['Neutral'], "Bajo", "Modelo BERT no disponible")
+_MODELO_CARGANDO = ("Neutral", COLORES['Neutral'], "Bajo", "Modelo BERT cargando")
+
+
+def analizar_sentimiento_noticia(texto: str, esperar_modelo: bool = True) -> Tuple[str, str, str, str]:
+    """
+    Analiza el sentimiento de una noticia usando sistema híbrido.
+    
+    PRIORIDAD:
+    1. Sistema de palabras clave bolivianas (SOBREESCRIBE BERT)
+    2. Modelo BERT multilingual (respaldo)
+    
+    Args:
+        texto: Título + contenido de la noticia
+        esperar_modelo: Si BERT todavía se está cargando, esperarlo. Con False
+            se responde ya con las palabras clave y, si no alcanzan, Neutral/Bajo.
+    
+    Returns:
+        (emocion, color, nivel, descripcion)
+        Ejemplos:
+        - ("Negativo", "#FF6B6B", "Alto", "5 términos negativos")
+        - ("Positivo", "#4CAF50", "Alto", "3 términos positivos")
+        - ("Neutral", "#95A5A6", "Medio", "Score BERT: 0.82")
+    """
+    
+    # ========================================================================
+    # PASO 1: SISTEMA DE PALABRAS CLAVE BOLIVIANAS (PRIORIDAD MÁXIMA)
+    # ========================================================================
+    
+    resultado = analizar_por_palabras(texto)
+    if resultado is not None:
+        return resultado
     
     # ========================================================================
     # PASO 2: MODELO BERT MULTILINGUAL (RESPALDO)
     # ========================================================================
     
+    if obtener_pool_sentimientos() is not None:
+        # Con pool, BERT corre solo en los trabajadores: este proceso no carga el modelo
+        if not esperar_modelo and not modelo_sentimiento_listo():
+            precargar_modelo_sentimiento()
+            return _MODELO_NO_DISPONIBLE if _POOL_ESTADO['estado'] == 'error' else _MODELO_CARGANDO
+        for _, resultados in _bert_en_procesos([texto], 1):
+            return resultados[0]
+
+    modelo = obtener_modelo_sentimiento(esperar_modelo)
+    if modelo is None:
+        return _MODELO_NO_DISPONIBLE if _MODELO['estado'] == 'error' else _MODELO_CARGANDO
     try:
-        # Limitar texto para no exceder el límite del modelo
-        texto_analisis = texto[:512]
-        
-        resultado = sentiment_pipeline(texto_analisis)[0]
-        label = resultado['label']  # Formato: "1 star", "2 stars", etc.
-        score = resultado['score']
-        
-        # Extraer número de estrellas
-        estrellas = int(label.split()[0])
-        
-        # Mapear estrellas a sentimiento
-        if estrellas <= 2:
-            emocion = "Negativo"
-        elif estrellas == 3:
-            emocion = "Neutral"
-        else:  # 4-5 estrellas
-            emocion = "Positivo"
-        
-        # Determinar nivel según score
-        nivel = "Alto" if score > 0.7 else "Medio"
-        
-        return (
-            emocion,
-            COLORES[emocion],
-            nivel,
-            f"BERT: {estrellas}★ (confianza: {score:.2f})"
-        )
-    
+        return _sentimiento_bert(modelo(_texto_bert(texto))[0])
     except Exception as e:
         print(f"⚠️ Error en BERT: {e}")
-        return ("Neutral", COLORES['Neutral'], "Bajo", "Error en análisis")
+        return _ERROR_BERT
+
+
+def _longitudes_tokens(modelo, textos: List[str]) -> List[int]:
+    """Largo en tokens de cada texto (o en caracteres si el tokenizer no está a mano)"""
+    try:
+        return [len(ids) for ids in modelo.tokenizer(textos)['input_ids']]
+    except Exception:
+        return [len(t) for t in textos]
+
+
+def _bert_por_lotes(textos: List[str], tam_lote: int):
+    """
+    Pasa los textos por BERT en lotes de largo parecido (poco padding) y va
+    devolviendo (posiciones, resultados) de cada lote terminado.
+
+    Cada texto recibe lo mismo que en el camino de a uno (`_texto_bert`); el
+    padding dentro del lote puede mover el score en los últimos decimales y,
+    cerca de un umbral, el nivel o la descripción. benchmarks/bench_sentimiento
+    compara ambos caminos sobre el corpus y reporta las diferencias. Si un
+    lote falla, se repite de a uno para que el error quede solo en la noticia
+    que lo causa.
+    """
+    if not textos:
+        return
+    modelo = obtener_modelo_sentimiento()
+    if modelo is None:
+        yield list(range(len(textos))), [_MODELO_NO_DISPONIBLE] * len(textos)
+        return
+
+    entradas = [_texto_bert(t) for t in textos]
+    longitudes = _longitudes_tokens(modelo, entradas)
+    orden = sorted(range(len(entradas)), key=lambda i: longitudes[i])
+
+    for inicio in range(0, len(orden), tam_lote):
+        posiciones = orden[inicio:inicio + tam_lote]
+        lote = [entradas[i] for i in posiciones]
+        try:
+            salidas = modelo(lote, batch_size=len(lote))
+            resultados = [_sentimiento_bert(salida) for salida in salidas]
+        except Exception:
+            resultados = [analizar_sentimiento_noticia(textos[i]) for i in posiciones]
+        yield posiciones, resultados
+
+
+# Resultados de un fallo pasajero: no se guardan en la caché
+_NO_CACHEABLES = {_ERROR_BERT, _MODELO_NO_DISPONIBLE, _MODELO_CARGANDO}
+
+
+def version_sentimiento(lexico=None) -> str:
+    """Versión de los resultados: cambia con el modelo, su backend o el léxico de palabras clave"""
+    from config import SENTIMIENTO_MODELO, SENTIMIENTO_BACKEND
+
+    backend = backend_sentimiento_disponible(SENTIMIENTO_BACKEND)
+    return f"{SENTIMIENTO_MODELO}|{backend}|{(lexico or obtener_lexico()).version}"
+
+
+def _analizar_textos(textos: List[str], tam_lote: int, al_resolver) -> int:
+    """
+    Núcleo común del análisis por lotes: caché de sentimientos → palabras
+    clave → BERT en lotes. Llama a `al_resolver(posicion, resultado)` a medida
+    que se resuelve cada texto y devuelve cuántos salieron de la caché.
+    """
+    lexico = obtener_lexico()
+    cache = obtener_cache_sentimientos()
+    version = version_sentimiento(lexico)
+    claves = [cache.clave(t) for t in textos] if cache is not None else None
+    guardados = cache.buscar(claves, version) if cache is not None else {}
+    nuevos = []
+
+    def resolver(i: int, resultado: Tuple[str, str, str, str]):
+        al_resolver(i, resultado)
+        if cache is not None and resultado not in _NO_CACHEABLES:
+            emocion, _, nivel, descripcion = resultado
+            nuevos.append((claves[i], (emocion, nivel, descripcion)))
+
+    def guardar_nuevos():
+        if nuevos:
+            cache.guardar(nuevos, version)
+            nuevos.clear()
+
+    pendientes = []
+    for i, texto in enumerate(textos):
+        if guardados and claves[i] in guardados:
+            emocion, nivel, descripcion = guardados[claves[i]]
+            al_resolver(i, (emocion, COLORES[emocion], nivel, descripcion))
+            continue
+        resultado = analizar_por_palabras(texto, lexico)
+        if resultado is None:
+            pendientes.append(i)
+        else:
+            resolver(i, resultado)
+    guardar_nuevos()
+
+    # Con pool de procesos todo lo que va a BERT se reparte; si no, en este proceso
+    textos_bert = [textos[i] for i in pendientes]
+    if textos_bert and obtener_pool_sentimientos() is not None:
+        lotes = _bert_en_procesos(textos_bert, tam_lote)
+    else:
+        lotes = _bert_por_lotes(textos_bert, tam_lote)
+
+    # Se guarda lote por lote: si se corta la ingesta no se pierde lo ya calculado
+    for posiciones, resultados in lotes:
+        for j, resultado in zip(posiciones, resultados):
+            resolver(pendientes[j], resultado)
+        guardar_nuevos()
+
+    return sum(1 for c in claves if c in guardados) if guardados else 0
+
+
+def analizar_sentimientos(textos: List[str], tam_lote: int = None) -> List[Tuple[str, str, str, str]]:
+    """
+    Versión por lotes de `analizar_sentimiento_noticia` (mismo resultado, en el mismo orden):
+    primero la caché y las palabras clave, luego BERT en lotes para los textos que quedan.
+    """
+    from config import SENTIMIENTO_TAM_LOTE
+
+    resultados = [None] * len(textos)
+
+    def al_resolver(i, resultado):
+        resultados[i] = resultado
+
+    _analizar_textos(textos, tam_lote or SENTIMIENTO_TAM_LOTE, al_resolver)
+    return resultados
+
+
+# ================================================================================
+# 3.1 ANÁLISIS REPARTIDO EN PROCESOS (SENTIMIENTO_PROCESOS > 0)
+# ================================================================================
+#
+# Un solo pipeline de transformers no aprovecha bien varios núcleos. Con
+# SENTIMIENTO_PROCESOS > 0 todos los textos que van a BERT se reparten entre
+# procesos trabajadores ("spawn": nunca se hace fork de un proceso con torch
+# cargado), en fragmentos de ceil(n / procesos) textos (como mucho
+# SENTIMIENTO_TAM_LOTE), así que hasta un micro-lote chico del pipeline usa
+# todos los procesos. Cada proceso carga su propio modelo al arrancar y usa
+# SENTIMIENTO_HILOS_POR_PROCESO threads intra-op (por defecto, los núcleos
+# repartidos entre los procesos). Las palabras clave y la caché se resuelven
+# antes, en el proceso principal, que nunca carga BERT: si el pool se rompe
+# se reemplaza y los fragmentos fallidos se reintentan una vez en el nuevo.
+#
+# ================================================================================
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+_POOL_ESTADO = {'estado': 'sin_cargar', 'error': None, 'listo': threading.Event()}
+
+
+def _hilos_por_proceso(procesos: int) -> int:
+    from config import SENTIMIENTO_HILOS_POR_PROCESO
+    return SENTIMIENTO_HILOS_POR_PROCESO or max((os.cpu_count() or 1) // procesos, 1)
+
+
+def _iniciar_trabajador(modelo: str, backend: str, hilos: int):
+    """Inicializador de cada proceso: threads de torch y carga del modelo en background"""
+    # OpenMP/MKL leen estas variables al cargarse torch
+    os.environ['OMP_NUM_THREADS'] = str(hilos)
+    os.environ['MKL_NUM_THREADS'] = str(hilos)
+
+    import config
+    config.SENTIMIENTO_MODELO = modelo
+    config.SENTIMIENTO_BACKEND = backend
+    config.SENTIMIENTO_PROCESOS = 0  # dentro del trabajador se analiza en el mismo proceso
+
+    try:
+        import torch
+        torch.set_num_threads(hilos)
+    except ImportError:
+        pass
+    precargar_modelo_sentimiento()
+
+
+def _estado_trabajador() -> Dict:
+    """Espera a que el modelo del trabajador termine de cargar"""
+    obtener_modelo_sentimiento()
+    return estado_modelo_sentimiento()
+
+
+def _analizar_fragmento(textos: List[str], tam_lote: int) -> List[Tuple[str, str, str, str]]:
+    """Tarea de un trabajador: BERT por lotes sobre un fragmento, en el orden recibido"""
+    resultados = [None] * len(textos)
+    for posiciones, lote in _bert_por_lotes(textos, tam_lote):
+        for j, resultado in zip(posiciones, lote):
+            resultados[j] = resultado
+    return resultados
+
+
+def obtener_pool_sentimientos() -> Optional[ProcessPoolExecutor]:
+    """Pool de procesos compartido para BERT (None si SENTIMIENTO_PROCESOS = 0)"""
+    global _POOL
+    from config import SENTIMIENTO_PROCESOS, SENTIMIENTO_MODELO, SENTIMIENTO_BACKEND
+
+    if SENTIMIENTO_PROCESOS <= 0:
+        return None
+    with _POOL_LOCK:
+        if _POOL is None:
+            hilos = _hilos_por_proceso(SENTIMIENTO_PROCESOS)
+            print(f"🧵 Pool de sentimientos: {SENTIMIENTO_PROCESOS} procesos x {hilos} threads")
+            _POOL = ProcessPoolExecutor(
+                max_workers=SENTIMIENTO_PROCESOS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_iniciar_trabajador,
+                initargs=(SENTIMIENTO_MODELO, SENTIMIENTO_BACKEND, hilos)
+            )
+            atexit.register(_POOL.shutdown, wait=False, cancel_futures=True)
+    return _POOL
+
+
+def _descartar_pool(pool: ProcessPoolExecutor):
+    """Un pool roto (un trabajador murió) se reemplaza en el próximo uso"""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+            _POOL_ESTADO['estado'] = 'sin_cargar'
+            _POOL_ESTADO['listo'] = threading.Event()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _precargar_pool() -> threading.Event:
+    """Arranca los procesos del pool (cada uno carga su modelo) y avisa cuando terminan"""
+    from config import SENTIMIENTO_PROCESOS
+
+    with _POOL_LOCK:
+        if _POOL_ESTADO['estado'] != 'sin_cargar':
+            return _POOL_ESTADO['listo']
+        _POOL_ESTADO['estado'] = 'cargando'
+        listo = _POOL_ESTADO['listo']
+
+    pool = obtener_pool_sentimientos()
+    futuros = [pool.submit(_estado_trabajador) for _ in range(SENTIMIENTO_PROCESOS)]
+
+    def esperar():
+        errores = []
+        for futuro in futuros:
+            try:
+                estado = futuro.result()
+                if estado['error']:
+                    errores.append(estado['error'])
+            except Exception as e:
+                errores.append(f"{type(e).__name__}: {e}")
+        _POOL_ESTADO['estado'] = 'error' if errores else 'listo'
+        _POOL_ESTADO['error'] = errores[0] if errores else None
+        listo.set()
+
+    threading.Thread(target=esperar, name="carga-bert-pool", daemon=True).start()
+    return listo
+
+
+def _bert_en_procesos(textos: List[str], tam_lote: int):
+    """
+    Igual que `_bert_por_lotes`, pero con los fragmentos repartidos en el pool:
+    va devolviendo (posiciones, resultados) a medida que termina cada uno.
+    """
+    from config import SENTIMIENTO_PROCESOS
+
+    if not textos:
+        return
+    # Fragmentos de largo parecido (cada trabajador vuelve a ordenar por tokens),
+    # al menos uno por proceso
+    orden = sorted(range(len(textos)), key=lambda i: len(textos[i]))
+    tam = max(min(tam_lote, -(-len(orden) // max(SENTIMIENTO_PROCESOS, 1))), 1)
+    fragmentos = [orden[i:i + tam] for i in range(0, len(orden), tam)]
+
+    for intento in range(2):
+        _precargar_pool()  # no hace nada si el pool ya se está cargando o está listo
+        pool = obtener_pool_sentimientos()
+        futuros, fallidos = {}, []
+        for k, posiciones in enumerate(fragmentos):
+            try:
+                futuros[pool.submit(_analizar_fragmento, [textos[i] for i in posiciones], tam_lote)] = posiciones
+            except RuntimeError:
+                # Pool roto o cerrado: lo que falta se reintenta en uno nuevo
+                fallidos = fragmentos[k:]
+                break
+
+        for futuro in as_completed(futuros):
+            posiciones = futuros[futuro]
+            try:
+                resultados = futuro.result()
+            except Exception:
+                fallidos.append(posiciones)
+                continue
+            yield posiciones, resultados
+
+        if not fallidos:
+            return
+        print(f"⚠️ Fallo en el pool de sentimientos: {sum(len(f) for f in fallidos)} noticias"
+              f"{', se reintenta con un pool nuevo' if intento == 0 else ' quedan sin analizar'}")
+        _descartar_pool(pool)
+        fragmentos = fallidos
+
+    # Sin guardar en la caché: se vuelven a intentar en la próxima ingesta
+    for posiciones in fragmentos:
+        yield posiciones, [_ERROR_BERT] * len(posiciones)
 
 
 # ================================================================================
 # 4. FUNCIÓN: enriquecer_noticias_con_sentimientos()
 # ================================================================================
 
-def enriquecer_noticias_con_sentimientos(noticias: List[Dict]) -> List[Dict]:
+def enriquecer_noticias_con_sentimientos(noticias: List[Dict], analizadas_previas: int = 0,
+                                         verbose: bool = True) -> List[Dict]:
     """
     Añade campos de sentimiento a cada noticia.
     
@@ -167,24 +617,28 @@ def enriquecer_noticias_con_sentimientos(noticias: List[Dict]) -> List[Dict]:
     
     Args:
         noticias: Lista de diccionarios con noticias
+        analizadas_previas: Noticias ya contadas en DATA_STORE['noticias_analizadas']
+            (cuando se analiza por micro-lotes)
+        verbose: Mostrar cabecera y progreso en consola
     
     Returns:
         Lista de noticias enriquecidas con sentimientos
     """
     from config import DATA_STORE
     
-    print(f"\n{'='*60}")
-    print(f"🎭 ANALIZANDO SENTIMIENTOS DE {len(noticias)} NOTICIAS")
-    print(f"{'='*60}\n")
+    if verbose:
+        print(f"\n{'='*60}")
+        print(f"🎭 ANALIZANDO SENTIMIENTOS DE {len(noticias)} NOTICIAS")
+        print(f"{'='*60}\n")
     
+    from config import SENTIMIENTO_TAM_LOTE
+
     total = len(noticias)
-    
-    for i, noticia in enumerate(noticias, 1):
-        # Combinar título y contenido para análisis más preciso
-        texto_completo = f"{noticia.get('titulo', '')} {noticia.get('contenido', '')}"
-        
-        # Analizar sentimiento
-        emocion, color, nivel, descripcion = analizar_sentimiento_noticia(texto_completo)
+    hechas = 0
+
+    def asignar(noticia: Dict, resultado: Tuple[str, str, str, str]):
+        nonlocal hechas
+        emocion, color, nivel, descripcion = resultado
         
         # Añadir campos a la noticia
         noticia['sentimiento'] = emocion
@@ -193,13 +647,23 @@ def enriquecer_noticias_con_sentimientos(noticias: List[Dict]) -> List[Dict]:
         noticia['descripcion_sentimiento'] = descripcion
         
         # Actualizar contador en DATA_STORE
-        DATA_STORE['noticias_analizadas'] = i
+        hechas += 1
+        DATA_STORE['noticias_analizadas'] = analizadas_previas + hechas
         
         # Mostrar progreso cada 50 noticias
-        if i % 50 == 0 or i == total:
-            print(f"   Procesadas: {i}/{total} noticias ({(i/total)*100:.1f}%)")
+        if verbose and (hechas % 50 == 0 or hechas == total):
+            print(f"   Procesadas: {hechas}/{total} noticias ({(hechas/total)*100:.1f}%)")
+    
+    # Combinar título y contenido para análisis más preciso
+    textos = [f"{noticia.get('titulo', '')} {noticia.get('contenido', '')}" for noticia in noticias]
+    
+    # Caché y palabras clave para todas; las que no se resuelven van a BERT por lotes
+    desde_cache = _analizar_textos(textos, SENTIMIENTO_TAM_LOTE, lambda i, resultado: asignar(noticias[i], resultado))
+    if verbose and desde_cache:
+        print(f"   💾 {desde_cache}/{total} desde la caché de sentimientos")
     
-    print(f"\n✅ Análisis de sentimientos completado\n")
+    if verbose:
+        print(f"\n✅ Análisis de sentimientos completado\n")
     return noticias
 
 
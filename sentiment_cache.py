@@ -0,0 +1,29 @@
+# ================================================================================
+# sentiment_cache.py - CACHÉ PERSISTENTE DE SENTIMIENTOS
+# ================================================================================
+#
+# El sentimiento de un texto (título + contenido) solo cambia si cambia el
+# modelo o el léxico de palabras clave. Cada resultado se guarda con la
+# clave sha1(texto) y la versión "modelo|léxico"; al cambiar la versión las
+# entradas viejas dejan de servir y se borran la primera vez que se usa la
+# nueva (ver sqlite_cache.py).
+#
+# ================================================================================
+
+from typing import Optional
+
+from sqlite_cache import CacheSQLite, instancia_compartida
+
+
+class CacheSentimientos(CacheSQLite):
+    """Caché en disco (SQLite) de (emocion, nivel, descripcion) por texto analizado"""
+
+    TABLA = 'sentimientos'
+    COLUMNAS = (('emocion', 'TEXT'), ('nivel', 'TEXT'), ('descripcion', 'TEXT'))
+    NOMBRE = "Caché de sentimientos"
+    DESCARTADOS = "entradas de otra versión del modelo/léxico descartadas"
+
+
+def obtener_cache_sentimientos() -> Optional[CacheSentimientos]:
+    """Instancia compartida de la caché (None si está desactivada en config)"""
+    return instancia_compartida(CacheSentimientos, 'SENTIMIENTO_CACHE_ACTIVA', 'SENTIMIENTO_CACHE_ARCHIVO')
@@ -0,0 +1,147 @@
+# ================================================================================
+# sentiment_index.py - ÍNDICE DE SENTIMIENTOS DEL CORPUS EN MEMORIA
+# ================================================================================
+#
+# Conteos, porcentajes y listas ya ordenadas por sentimiento, mantenidos al
+# agregar o quitar noticias (no al consultar). Así las consultas del chat
+# ("noticias positivas", el panorama que recibe Groq) no recorren todo el
+# corpus en cada pregunta:
+#
+#   - estadisticas(): O(1), mismo formato que calcular_estadisticas_sentimientos
+#   - pagina(): O(tamaño de la página), por recencia o por confianza
+#
+# La confianza se ordena por nivel (Alto > Medio > Bajo) y, dentro del
+# nivel, por recencia: el número de la descripción no sirve para comparar
+# porque mezcla escalas (términos encontrados por palabras clave contra la
+# probabilidad de BERT).
+#
+# Cada lista se guarda en orden ascendente de su clave (bisect); agregar o
+# quitar una noticia cuesta una búsqueda binaria más el corrimiento de la lista.
+#
+# ================================================================================
+
+import bisect
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+SENTIMIENTOS = ('Positivo', 'Negativo', 'Neutral')
+ORDENES = ('recencia', 'confianza')
+
+_RANGO_NIVEL = {'Alto': 2, 'Medio': 1, 'Bajo': 0}
+
+
+def sentimiento_de(noticia: Dict) -> str:
+    """Sentimiento de una noticia (lo desconocido o ausente cuenta como Neutral)"""
+    sentimiento = noticia.get('sentimiento', 'Neutral')
+    return sentimiento if sentimiento in SENTIMIENTOS else 'Neutral'
+
+
+def confianza_de(noticia: Dict) -> int:
+    """Clave de confianza: el nivel (Alto > Medio > Bajo); los empates se ordenan por recencia"""
+    return _RANGO_NIVEL.get(noticia.get('nivel_sentimiento'), 0)
+
+
+class IndiceSentimientos:
+    """Noticias agrupadas por sentimiento, con conteos y listas ordenadas"""
+
+    def __init__(self, noticias: Iterable[Dict] = ()):
+        self._lock = threading.Lock()
+        self.vaciar()
+        self.agregar(noticias)
+
+    def vaciar(self):
+        with self._lock:
+            self._secuencia = 0
+            # url → (noticia, secuencia, sentimiento, confianza)
+            self._entradas: Dict[str, Tuple[Dict, int, str, int]] = {}
+            self._conteo = {s: 0 for s in SENTIMIENTOS}
+            # Por sentimiento, ascendentes: [secuencia] y [(confianza, secuencia)]
+            self._por_recencia: Dict[str, List[int]] = {s: [] for s in SENTIMIENTOS}
+            self._por_confianza: Dict[str, List[Tuple[int, int]]] = {s: [] for s in SENTIMIENTOS}
+            self._por_secuencia: Dict[int, Dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    # --------------------------------------------------------------------------
+    # Actualización
+    # --------------------------------------------------------------------------
+
+    def agregar(self, noticias: Iterable[Dict]):
+        """
+        Agrega (o reemplaza, por URL) noticias. La lista viene como la del
+        corpus: la primera es la más reciente.
+        """
+        noticias = list(noticias)
+        with self._lock:
+            for noticia in reversed(noticias):
+                url = noticia.get('url') or id(noticia)
+                if url in self._entradas:
+                    self._quitar(url)
+                self._secuencia += 1
+                secuencia = self._secuencia
+                sentimiento = sentimiento_de(noticia)
+                confianza = confianza_de(noticia)
+
+                self._entradas[url] = (noticia, secuencia, sentimiento, confianza)
+                self._por_secuencia[secuencia] = noticia
+                self._conteo[sentimiento] += 1
+                # La secuencia siempre crece: va al final
+                self._por_recencia[sentimiento].append(secuencia)
+                bisect.insort(self._por_confianza[sentimiento], (confianza, secuencia))
+
+    def quitar(self, urls: Iterable[str]):
+        """Quita noticias por URL (las que no están se ignoran), p. ej. las que salen del corpus"""
+        with self._lock:
+            for url in urls:
+                if url in self._entradas:
+                    self._quitar(url)
+
+    def _quitar(self, url: str):
+        _, secuencia, sentimiento, confianza = self._entradas.pop(url)
+        del self._por_secuencia[secuencia]
+        self._conteo[sentimiento] -= 1
+
+        recencia = self._por_recencia[sentimiento]
+        del recencia[bisect.bisect_left(recencia, secuencia)]
+        por_confianza = self._por_confianza[sentimiento]
+        del por_confianza[bisect.bisect_left(por_confianza, (confianza, secuencia))]
+
+    # --------------------------------------------------------------------------
+    # Consultas
+    # --------------------------------------------------------------------------
+
+    def total(self, sentimiento: str) -> int:
+        return self._conteo.get(sentimiento, 0)
+
+    def estadisticas(self) -> Dict:
+        """Conteos y porcentajes (mismo formato que calcular_estadisticas_sentimientos)"""
+        with self._lock:
+            conteo = dict(self._conteo)
+        total = sum(conteo.values())
+        return {
+            'total': total,
+            'conteo': conteo,
+            'porcentajes': {k: (v / total * 100 if total else 0.0) for k, v in conteo.items()}
+        }
+
+    def pagina(self, sentimiento: str, pagina: int = 1, por_pagina: int = 5,
+               orden: str = 'recencia') -> Tuple[List[Dict], int]:
+        """
+        Noticias de un sentimiento, de la más reciente (o la de mayor
+        confianza) hacia atrás → (noticias de la página, total del sentimiento).
+        """
+        if sentimiento not in SENTIMIENTOS:
+            return [], 0
+        inicio = max(pagina - 1, 0) * por_pagina
+        with self._lock:
+            if orden == 'confianza':
+                claves = self._por_confianza[sentimiento]
+            else:
+                claves = self._por_recencia[sentimiento]
+            # Las listas son ascendentes: la página se toma desde el final
+            fin = max(len(claves) - inicio, 0)
+            tramo = claves[max(fin - por_pagina, 0):fin]
+            secuencias = [c[1] for c in tramo] if orden == 'confianza' else tramo
+            noticias = [self._por_secuencia[s] for s in reversed(secuencias)]
+            return noticias, self._conteo[sentimiento]
@@ -0,0 +1,189 @@
+# ================================================================================
+# sources.py - FUENTES DE NOTICIAS (ADAPTADORES POR MEDIO)
+# ================================================================================
+#
+# Cada medio se describe con un adaptador que sabe tres cosas:
+#
+#   - descubrir noticias: URL de cada página de listado y cómo parsearla
+#   - extraer el cuerpo de un artículo
+#   - normalizar las URLs del medio (enlaces relativos, fragmentos)
+#
+# Además declara sus propios límites (tasa, ráfaga, concurrencia). El motor de
+# crawling rastrea todas las fuentes a la vez, pero cada una con su pool y su
+# contabilidad de fallos: un medio lento o caído no frena a los demás.
+#
+# Los métodos de parseo corren en el pool de procesos, así que un adaptador
+# solo guarda datos simples (se envía por pickle junto con cada tarea).
+#
+# ================================================================================
+
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urldefrag, urlparse
+
+from parsing import parsear_listado, parsear_enlaces, extraer_cuerpo_con_selector
+
+
+class FuenteNoticias:
+    """Interfaz de un medio: listados, cuerpo de los artículos y URLs"""
+
+    tipo = ""
+
+    def __init__(self, nombre: str, base_url: str, secciones: Optional[Dict] = None,
+                 tasa: Optional[float] = None, rafaga: Optional[int] = None,
+                 max_concurrencia: Optional[int] = None):
+        self.nombre = nombre
+        self.base_url = base_url
+        # Formato de SECCIONES_CONFIG: "URL": techo  o  "URL": {"max": techo, "min": piso}
+        self.secciones = dict(secciones or {})
+        # None = valores globales del scraper
+        self.tasa = tasa
+        self.rafaga = rafaga
+        self.max_concurrencia = max_concurrencia
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.nombre} ({len(self.secciones)} secciones)>"
+
+    def hosts(self) -> List[str]:
+        """Hosts a los que se hacen peticiones (los de las secciones y el base)"""
+        hosts = {urlparse(url).netloc for url in self.secciones}
+        hosts.add(urlparse(self.base_url).netloc)
+        return sorted(h for h in hosts if h)
+
+    # --------------------------------------------------------------------------
+    # Descubrimiento
+    # --------------------------------------------------------------------------
+
+    def nombre_seccion(self, seccion_url: str) -> str:
+        return seccion_url.rstrip('/').split('/')[-1]
+
+    def url_pagina(self, seccion_url: str, pagina: int) -> str:
+        return seccion_url if pagina == 1 else f"{seccion_url}/{pagina}"
+
+    def normalizar_url(self, enlace: str, base: Optional[str] = None) -> str:
+        """URL absoluta y sin fragmento (#...) para un enlace del medio"""
+        return urldefrag(urljoin(base or self.base_url, enlace.strip()))[0]
+
+    def parsear_listado(self, html, encoding: Optional[str], backend: str,
+                        parcial: bool) -> List[Tuple[str, str]]:
+        """Entradas (titulo, enlace absoluto) de una página de listado"""
+        raise NotImplementedError
+
+    # --------------------------------------------------------------------------
+    # Extracción
+    # --------------------------------------------------------------------------
+
+    def extraer_cuerpo(self, html, encoding: Optional[str], preferido: Optional[str],
+                       backend: str, parcial: bool) -> Tuple[str, Optional[str]]:
+        """(texto, selector) del cuerpo de un artículo (cadena SELECTORES_CUERPO por defecto)"""
+        return extraer_cuerpo_con_selector(html, encoding, preferido, backend, parcial)
+
+
+class FuenteElDeber(FuenteNoticias):
+    """El Deber (eldeber.com.bo): listados de <article class="nota">"""
+
+    tipo = "eldeber"
+
+    def __init__(self, nombre: str = "eldeber", base_url: str = "https://eldeber.com.bo", **opciones):
+        super().__init__(nombre, base_url, **opciones)
+
+    def parsear_listado(self, html, encoding, backend, parcial):
+        return [(titulo, self.normalizar_url(enlace))
+                for titulo, enlace in parsear_listado(html, encoding, backend, parcial)]
+
+
+class FuenteSelectores(FuenteNoticias):
+    """
+    Medio genérico descrito solo con configuración: un selector CSS para los
+    enlaces del listado y un patrón de paginación, p. ej.
+
+        {"tipo": "selectores", "base_url": "https://medio.com",
+         "listado": "article h2 a", "paginacion": "{url}/page/{pagina}",
+         "secciones": {"https://medio.com/politica": 2}}
+    """
+
+    tipo = "selectores"
+
+    def __init__(self, nombre: str, base_url: str, listado: str = "article h2 a",
+                 paginacion: str = "{url}/{pagina}", **opciones):
+        super().__init__(nombre, base_url, **opciones)
+        self.listado = listado
+        self.paginacion = paginacion
+
+    def url_pagina(self, seccion_url, pagina):
+        if pagina == 1:
+            return seccion_url
+        return self.paginacion.format(url=seccion_url.rstrip('/'), pagina=pagina)
+
+    def parsear_listado(self, html, encoding, backend, parcial):
+        return [(titulo, self.normalizar_url(enlace))
+                for titulo, enlace in parsear_enlaces(html, self.listado, encoding, backend)]
+
+
+TIPOS_FUENTE = {
+    FuenteElDeber.tipo: FuenteElDeber,
+    FuenteSelectores.tipo: FuenteSelectores
+}
+
+
+def cargar_fuentes() -> List[FuenteNoticias]:
+    """
+    Instancia las fuentes de FUENTES_CONFIG. Se lee en cada llamada (es barato)
+    para que los cambios en config se apliquen sin reiniciar. El Deber usa
+    SECCIONES_CONFIG si no trae sus propias secciones.
+    """
+    import config
+
+    fuentes = []
+    for nombre, opciones in config.FUENTES_CONFIG.items():
+        opciones = dict(opciones)
+        tipo = opciones.pop('tipo', nombre)
+        if tipo not in TIPOS_FUENTE:
+            print(f"⚠️ Fuente '{nombre}' ignorada: tipo desconocido '{tipo}'")
+            continue
+        if tipo == FuenteElDeber.tipo and 'secciones' not in opciones:
+            opciones['secciones'] = config.SECCIONES_CONFIG
+        fuentes.append(TIPOS_FUENTE[tipo](nombre=nombre, **opciones))
+    return fuentes
+
+
+def secciones_configuradas() -> Dict:
+    """Todas las secciones de todas las fuentes (URL → límites de páginas)"""
+    secciones = {}
+    for fuente in cargar_fuentes():
+        secciones.update(fuente.secciones)
+    return secciones
+
+
+def agrupar_por_fuente(secciones: Dict,
+                       fuentes: Optional[List[FuenteNoticias]] = None) -> List[Tuple[FuenteNoticias, Dict]]:
+    """
+    Reparte un conjunto de secciones entre las fuentes que las declaran
+    (o, si ninguna la declara, la que comparte host con ella).
+    """
+    fuentes = fuentes if fuentes is not None else cargar_fuentes()
+    grupos = {fuente.nombre: {} for fuente in fuentes}
+
+    for url, valor in secciones.items():
+        fuente = _fuente_de_seccion(url, fuentes)
+        if fuente is None:
+            print(f"⚠️ Sección sin fuente configurada, se omite: {url}")
+            continue
+        grupos[fuente.nombre][url] = valor
+
+    return [(fuente, grupos[fuente.nombre]) for fuente in fuentes if grupos[fuente.nombre]]
+
+
+def _fuente_de_seccion(url: str, fuentes: List[FuenteNoticias]) -> Optional[FuenteNoticias]:
+    for fuente in fuentes:
+        if url in fuente.secciones:
+            return fuente
+    host = urlparse(url).netloc
+    for fuente in fuentes:
+        if host in fuente.hosts():
+            return fuente
+    return None
+
+
+def fuente_de_seccion(url: str) -> Optional[FuenteNoticias]:
+    """Fuente configurada a la que pertenece una URL de sección"""
+    return _fuente_de_seccion(url, cargar_fuentes())
@@ -0,0 +1,143 @@
+# ================================================================================
+# sqlite_cache.py - BASE DE LAS CACHÉS PERSISTENTES POR TEXTO (SQLITE)
+# ================================================================================
+#
+# Las cachés de sentimientos (sentiment_cache.py) y de embeddings
+# (embedding_cache.py) guardan un valor por texto: clave sha1(texto) y la
+# versión de lo que lo calculó (modelo, léxico). Al pasar a otra versión las
+# entradas viejas dejan de servir y se borran la primera vez que se usa la
+# nueva. Cada subclase define su tabla, sus columnas de valor y cómo
+# convertir una fila en el valor que devuelve `buscar`.
+#
+# ================================================================================
+
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Máximo de parámetros por consulta IN (...) (límite de SQLite)
+_TAM_CONSULTA = 500
+
+
+class CacheSQLite:
+    """Tabla clave → valores de una versión, con estadísticas de aciertos"""
+
+    TABLA = ''
+    COLUMNAS: Sequence[Tuple[str, str]] = ()  # columnas de valor: (nombre, tipo SQL)
+    NOMBRE = "Caché"
+    DESCARTADOS = "entradas de otra versión descartadas"
+
+    def __init__(self, ruta: str):
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(ruta, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columnas = "".join(f"{nombre} {tipo} NOT NULL, " for nombre, tipo in self.COLUMNAS)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.TABLA} "
+            f"(clave TEXT PRIMARY KEY, version TEXT NOT NULL, {columnas}guardado REAL)"
+        )
+        self._conn.commit()
+        self._version = None
+        self.reiniciar_estadisticas()
+
+    @staticmethod
+    def clave(texto: str) -> str:
+        return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.TABLA}").fetchone()[0]
+
+    def reiniciar_estadisticas(self):
+        with self._lock:
+            self._stats = {'consultas': 0, 'hits': 0, 'misses': 0, 'guardados': 0, 'invalidados': 0}
+
+    # Conversión entre el valor de la subclase y sus columnas
+    def _valor(self, fila: Tuple) -> Optional[Any]:
+        """Fila (columnas de valor) → valor devuelto por buscar (None = descartar)"""
+        return fila
+
+    def _columnas(self, valor: Any) -> Tuple:
+        """Valor recibido por guardar → columnas de valor"""
+        return tuple(valor)
+
+    def _usar_version(self, version: str):
+        """Al pasar a otra versión se borra lo calculado con las anteriores (llamar con el lock)"""
+        if version == self._version:
+            return
+        cursor = self._conn.execute(f"DELETE FROM {self.TABLA} WHERE version != ?", (version,))
+        self._conn.commit()
+        if cursor.rowcount > 0:
+            self._stats['invalidados'] += cursor.rowcount
+            print(f"🧹 {self.NOMBRE}: {cursor.rowcount} {self.DESCARTADOS}")
+        self._version = version
+
+    def buscar(self, claves: List[str], version: str) -> Dict[str, Any]:
+        """Valores guardados para las claves de esta versión → {clave: valor}"""
+        nombres = ", ".join(nombre for nombre, _ in self.COLUMNAS)
+        encontrados = {}
+        with self._lock:
+            self._usar_version(version)
+            unicas = list(dict.fromkeys(claves))
+            for i in range(0, len(unicas), _TAM_CONSULTA):
+                grupo = unicas[i:i + _TAM_CONSULTA]
+                filas = self._conn.execute(
+                    f"SELECT clave, {nombres} FROM {self.TABLA} "
+                    f"WHERE version = ? AND clave IN ({','.join('?' * len(grupo))})",
+                    [version] + grupo
+                ).fetchall()
+                for clave, *fila in filas:
+                    valor = self._valor(tuple(fila))
+                    if valor is not None:
+                        encontrados[clave] = valor
+            self._stats['consultas'] += len(claves)
+            self._stats['hits'] += sum(1 for c in claves if c in encontrados)
+            self._stats['misses'] += sum(1 for c in claves if c not in encontrados)
+        return encontrados
+
+    def guardar(self, pares: Iterable[Tuple[str, Any]], version: str):
+        """Guarda pares (clave, valor) de esta versión"""
+        ahora = time.time()
+        filas = [(clave, version, *self._columnas(valor), ahora) for clave, valor in pares]
+        if not filas:
+            return
+        with self._lock:
+            self._usar_version(version)
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.TABLA} VALUES ({','.join('?' * len(filas[0]))})", filas
+            )
+            self._conn.commit()
+            self._stats['guardados'] += len(filas)
+
+    def estadisticas(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats['tasa_hits'] = round(stats['hits'] / stats['consultas'], 3) if stats['consultas'] else 0.0
+        return stats
+
+
+_INSTANCIAS: Dict[type, CacheSQLite] = {}
+_INSTANCIAS_LOCK = threading.Lock()
+
+
+def instancia_compartida(clase: type, activa: str, archivo: str) -> Optional[CacheSQLite]:
+    """
+    Instancia única de una caché por proceso, o None si está desactivada.
+    `activa` y `archivo` son nombres de config (se leen en cada llamada).
+    """
+    import config
+
+    if not getattr(config, activa):
+        return None
+
+    with _INSTANCIAS_LOCK:
+        if clase not in _INSTANCIAS:
+            _INSTANCIAS[clase] = clase(getattr(config, archivo))
+        return _INSTANCIAS[clase]
@@ -28,7 +28,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_text = update.message.text
     
     # Verificar si el bot está listo
-    if not bot.initialized:
+    if not bot.listo:
         if bot.initializing:
             await update.message.reply_text("⏳ Me estoy inicializando y leyendo las noticias... Dame unos segundos.")
         else:
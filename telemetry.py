@@ -0,0 +1,408 @@
+# ================================================================================
+# telemetry.py - TELEMETRÍA DEL SCRAPER (LATENCIAS, BYTES, REINTENTOS, ETAPAS)
+# ================================================================================
+#
+# Cada petición que pasa por la sesión del scraper (SesionMedida) deja una
+# medición con:
+#
+#   dns_ms, conexion_ms, tls_ms   - solo si abrió una conexión nueva
+#   ttfb_ms                       - desde que se envió la petición hasta las cabeceras
+#   total_ms                      - petición completa, cuerpo incluido (y reintentos)
+#   bytes, intentos (reintentos de urllib3 Retry), estado o clase de error
+#
+# Las fases de red se miden en las conexiones de urllib3 (ConexionHTTPMedida /
+# ConexionHTTPSMedida), que escriben en la medición del thread actual. Las
+# etapas del pipeline (parseo, caché, deduplicación, entrega) se miden con
+# `medir_etapa`. Todo se agrega en histogramas de buckets fijos, se consulta
+# en /api/scraper/telemetry y se vuelca a JSON al terminar cada refresco.
+#
+# ================================================================================
+
+import os
+import json
+import time
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import allowed_gai_family
+
+# Bordes superiores de los buckets de latencia (ms); el último bucket es "más que eso"
+BORDES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+FASES = ('dns', 'conexion', 'tls', 'ttfb', 'total')
+
+
+class Histograma:
+    """Histograma de buckets fijos (ms) con percentiles aproximados"""
+
+    def __init__(self, bordes=BORDES_MS):
+        self.bordes = tuple(bordes)
+        self.conteos = [0] * (len(self.bordes) + 1)
+        self.n = 0
+        self.suma = 0.0
+        self.minimo = None
+        self.maximo = None
+
+    def registrar(self, valor: float):
+        indice = len(self.bordes)
+        for i, borde in enumerate(self.bordes):
+            if valor <= borde:
+                indice = i
+                break
+        self.conteos[indice] += 1
+        self.n += 1
+        self.suma += valor
+        self.minimo = valor if self.minimo is None else min(self.minimo, valor)
+        self.maximo = valor if self.maximo is None else max(self.maximo, valor)
+
+    def percentil(self, p: float) -> Optional[float]:
+        """Percentil interpolado linealmente dentro de su bucket (acotado a min/max)"""
+        if not self.n:
+            return None
+        objetivo = p * self.n
+        acumulado = 0
+        for i, conteo in enumerate(self.conteos):
+            if conteo and acumulado + conteo >= objetivo:
+                inferior = self.bordes[i - 1] if i > 0 else 0.0
+                # El bucket abierto del final se acota con el máximo observado
+                superior = self.bordes[i] if i < len(self.bordes) else self.maximo
+                valor = inferior + (superior - inferior) * (objetivo - acumulado) / conteo
+                return round(min(max(valor, self.minimo), self.maximo), 2)
+            acumulado += conteo
+        return self.maximo
+
+    def resumen(self) -> Dict:
+        etiquetas = [f"<={b}" for b in self.bordes] + [f">{self.bordes[-1]}"]
+        return {
+            'n': self.n,
+            'media_ms': round(self.suma / self.n, 2) if self.n else None,
+            'min_ms': round(self.minimo, 2) if self.minimo is not None else None,
+            'max_ms': round(self.maximo, 2) if self.maximo is not None else None,
+            'p50_ms': self.percentil(0.5),
+            'p90_ms': self.percentil(0.9),
+            'p99_ms': self.percentil(0.99),
+            'buckets': {e: c for e, c in zip(etiquetas, self.conteos) if c}
+        }
+
+
+class TelemetriaScraper:
+    """Agregado de mediciones de un refresco del scraper"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Pone todo a cero (se llama al inicio de cada refresco)"""
+        with self._lock:
+            self._inicio = time.time()
+            self._fases = {fase: Histograma() for fase in FASES}
+            self._etapas: Dict[str, Histograma] = {}
+            self._estados: Dict[str, int] = {}
+            self._errores: Dict[str, int] = {}
+            self._hosts: Dict[str, Dict] = {}
+            self._totales = {
+                'peticiones': 0,
+                'bytes': 0,
+                'intentos': 0,
+                'reintentos': 0,
+                'conexiones_nuevas': 0,
+                'conexiones_reutilizadas': 0
+            }
+
+    def registrar_peticion(self, medicion: Dict):
+        with self._lock:
+            for fase in FASES:
+                valor = medicion.get(f"{fase}_ms")
+                if valor is not None:
+                    self._fases[fase].registrar(valor)
+
+            intentos = medicion.get('intentos') or 1
+            totales = self._totales
+            totales['peticiones'] += 1
+            totales['bytes'] += medicion.get('bytes', 0)
+            totales['intentos'] += intentos
+            totales['reintentos'] += intentos - 1
+            if medicion.get('conexiones'):
+                totales['conexiones_nuevas'] += medicion['conexiones']
+            elif 'error' not in medicion:
+                totales['conexiones_reutilizadas'] += 1
+
+            if 'error' in medicion:
+                clase = 'error'
+                self._errores[medicion['error']] = self._errores.get(medicion['error'], 0) + 1
+            else:
+                clase = f"{medicion['estado'] // 100}xx"
+            self._estados[clase] = self._estados.get(clase, 0) + 1
+
+            host = self._hosts.setdefault(medicion.get('host', ''), {
+                'peticiones': 0, 'bytes': 0, 'errores': 0, 'reintentos': 0, 'total': Histograma()
+            })
+            host['peticiones'] += 1
+            host['bytes'] += medicion.get('bytes', 0)
+            host['reintentos'] += intentos - 1
+            host['errores'] += clase in ('error', '5xx')
+            if medicion.get('total_ms') is not None:
+                host['total'].registrar(medicion['total_ms'])
+
+    def registrar_etapa(self, nombre: str, segundos: float):
+        with self._lock:
+            self._etapas.setdefault(nombre, Histograma()).registrar(segundos * 1000)
+
+    def incorporar(self, capturadas: Optional[List[Tuple[str, object]]]):
+        """Suma las mediciones capturadas en otro proceso (ver `capturando`)"""
+        for tipo, dato in capturadas or ():
+            if tipo == 'peticion':
+                self.registrar_peticion(dato)
+            else:
+                self.registrar_etapa(*dato)
+
+    def resumen(self) -> Dict:
+        with self._lock:
+            etapas = {}
+            for nombre, histograma in sorted(self._etapas.items()):
+                etapas[nombre] = {**histograma.resumen(), 'segundos': round(histograma.suma / 1000, 3)}
+            return {
+                'inicio': self._inicio,
+                'duracion_s': round(time.time() - self._inicio, 3),
+                **self._totales,
+                'estados': dict(self._estados),
+                'errores': dict(self._errores),
+                'latencias': {fase: h.resumen() for fase, h in self._fases.items()},
+                'etapas': etapas,
+                'hosts': {
+                    host: {**{k: v for k, v in datos.items() if k != 'total'}, 'total': datos['total'].resumen()}
+                    for host, datos in self._hosts.items()
+                }
+            }
+
+    def volcar(self, directorio: str, max_volcados: int = 50) -> str:
+        """Escribe el resumen del refresco en `directorio` y poda los volcados más viejos"""
+        os.makedirs(directorio, exist_ok=True)
+        resumen = self.resumen()
+        nombre = time.strftime("telemetria-%Y%m%d-%H%M%S", time.localtime(resumen['inicio']))
+        ruta = os.path.join(directorio, f"{nombre}.json")
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(resumen, f, indent=2, ensure_ascii=False)
+
+        volcados = sorted(n for n in os.listdir(directorio) if n.startswith("telemetria-") and n.endswith(".json"))
+        for viejo in volcados[:max(len(volcados) - max_volcados, 0)]:
+            os.remove(os.path.join(directorio, viejo))
+        return ruta
+
+
+_TELEMETRIA = None
+_TELEMETRIA_LOCK = threading.Lock()
+
+
+def obtener_telemetria() -> Optional[TelemetriaScraper]:
+    """Instancia compartida (None si la telemetría está desactivada)"""
+    global _TELEMETRIA
+    import config
+
+    if not config.TELEMETRIA_ACTIVA:
+        return None
+
+    with _TELEMETRIA_LOCK:
+        if _TELEMETRIA is None:
+            _TELEMETRIA = TelemetriaScraper()
+    return _TELEMETRIA
+
+
+# ================================================================================
+# REGISTRO (thread actual)
+# ================================================================================
+
+_LOCAL = threading.local()
+
+
+def _ms(desde: float) -> float:
+    return round((time.perf_counter() - desde) * 1000, 3)
+
+
+def _medicion_actual() -> Optional[Dict]:
+    return getattr(_LOCAL, 'medicion', None)
+
+
+def registrar_peticion(medicion: Dict):
+    captura = getattr(_LOCAL, 'captura', None)
+    if captura is not None:
+        captura.append(('peticion', medicion))
+        return
+    telemetria = obtener_telemetria()
+    if telemetria is not None:
+        telemetria.registrar_peticion(medicion)
+
+
+def registrar_etapa(nombre: str, segundos: float):
+    captura = getattr(_LOCAL, 'captura', None)
+    if captura is not None:
+        captura.append(('etapa', (nombre, segundos)))
+        return
+    telemetria = obtener_telemetria()
+    if telemetria is not None:
+        telemetria.registrar_etapa(nombre, segundos)
+
+
+@contextmanager
+def medir_etapa(nombre: str):
+    """Mide el bloque como una ejecución de la etapa `nombre`"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar_etapa(nombre, time.perf_counter() - inicio)
+
+
+@contextmanager
+def capturando():
+    """
+    Junta en una lista (en vez de agregar) lo que se registre en este thread.
+    Lo usan los trabajadores del crawl distribuido para devolver sus
+    mediciones al coordinador junto con el resultado.
+    """
+    captura = []
+    _LOCAL.captura = captura
+    try:
+        yield captura
+    finally:
+        _LOCAL.captura = None
+
+
+def ejecutar_medido(funcion, *args):
+    """(resultado, segundos) de `funcion(*args)`; se usa en el pool de parseo"""
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+# ================================================================================
+# INSTRUMENTACIÓN DE requests / urllib3
+# ================================================================================
+
+class _ConexionMedida:
+    """Mide DNS, conexión TCP y TLS al abrir, y TTFB e intentos en cada petición"""
+
+    def _new_conn(self):
+        medicion = _medicion_actual()
+        if medicion is None:
+            return super()._new_conn()
+
+        host = self._dns_host
+        inicio = time.perf_counter()
+        try:
+            direcciones = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except OSError:
+            return super()._new_conn()  # urllib3 arma el error de resolución
+        self._dns_ms = _ms(inicio)
+
+        # Ya resuelto: se conecta directo a la primera dirección para no medir el DNS dos veces
+        inicio = time.perf_counter()
+        self._dns_host = direcciones[0][4][0]
+        try:
+            sock = super()._new_conn()
+        except Exception:
+            self._dns_host = host
+            sock = super()._new_conn()  # las demás direcciones, como siempre
+        finally:
+            self._dns_host = host
+        self._conexion_ms = _ms(inicio)
+        return sock
+
+    def connect(self):
+        medicion = _medicion_actual()
+        self._dns_ms = self._conexion_ms = None
+        inicio = time.perf_counter()
+        super().connect()
+        if medicion is None:
+            return
+
+        total = _ms(inicio)
+        medicion['conexiones'] = medicion.get('conexiones', 0) + 1
+        if self._dns_ms is not None:
+            medicion['dns_ms'] = self._dns_ms
+            medicion['conexion_ms'] = self._conexion_ms
+            if isinstance(self, HTTPSConnection):
+                medicion['tls_ms'] = round(max(total - self._dns_ms - self._conexion_ms, 0.0), 3)
+
+    def request(self, *args, **kwargs):
+        medicion = _medicion_actual()
+        if medicion is not None:
+            # Cada reintento de urllib3 (Retry) vuelve a pasar por aquí
+            medicion['intentos'] = medicion.get('intentos', 0) + 1
+        self._enviado = time.perf_counter()
+        return super().request(*args, **kwargs)
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        medicion = _medicion_actual()
+        if medicion is not None:
+            medicion['ttfb_ms'] = _ms(self._enviado)
+        return response
+
+
+class ConexionHTTPMedida(_ConexionMedida, HTTPConnection):
+    pass
+
+
+class ConexionHTTPSMedida(_ConexionMedida, HTTPSConnection):
+    pass
+
+
+class _PoolHTTPMedido(HTTPConnectionPool):
+    ConnectionCls = ConexionHTTPMedida
+
+
+class _PoolHTTPSMedido(HTTPSConnectionPool):
+    ConnectionCls = ConexionHTTPSMedida
+
+
+def instrumentar_adaptador(adaptador):
+    """Hace que un HTTPAdapter abra conexiones medidas (los que no tienen pool se ignoran)"""
+    poolmanager = getattr(adaptador, 'poolmanager', None)
+    if poolmanager is not None:
+        poolmanager.pool_classes_by_scheme = {'http': _PoolHTTPMedido, 'https': _PoolHTTPSMedido}
+
+
+class SesionMedida(requests.Session):
+    """Sesión de requests que deja una medición por cada petición"""
+
+    def send(self, request, **kwargs):
+        # Las redirecciones vuelven a entrar aquí: cuentan dentro de la petición original
+        if _medicion_actual() is not None or obtener_telemetria() is None:
+            return super().send(request, **kwargs)
+
+        medicion = {'host': urlparse(request.url).netloc}
+        _LOCAL.medicion = medicion
+        inicio = time.perf_counter()
+        try:
+            # Sin stream, requests ya leyó el cuerpo al volver
+            response = super().send(request, **kwargs)
+            medicion['estado'] = response.status_code
+            medicion['bytes'] = _bytes_respuesta(response, kwargs.get('stream', False))
+            return response
+        except Exception as e:
+            medicion['error'] = type(e).__name__
+            raise
+        finally:
+            medicion['total_ms'] = _ms(inicio)
+            _LOCAL.medicion = None
+            registrar_peticion(medicion)
+
+
+def _bytes_respuesta(response: requests.Response, stream: bool) -> int:
+    """Bytes recibidos por la red (comprimidos) si urllib3 los informa; si no, los del cuerpo"""
+    tell = getattr(response.raw, 'tell', None)
+    try:
+        leidos = tell() if tell else None
+    except Exception:
+        leidos = None
+    if leidos:
+        return leidos
+    return 0 if stream else len(response.content or b"")
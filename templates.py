@@ -1084,8 +1084,14 @@ HTML_TEMPLATE = r"""
                     els.botStatusText.textContent = "En línea ✅";
                 }
 
+                // Con la ingesta en curso ya se puede preguntar sobre lo indexado
+                if (!data.initialized && data.searchable) {
+                    const cobertura = Math.round((data.coverage || 0) * 100);
+                    els.botStatusText.textContent = `En línea (${data.indexed_count} noticias, ${cobertura}%) ⏳`;
+                }
+
                 // Manejar transición de carga
-                if (data.initialized && !initialized) {
+                if ((data.initialized || data.searchable) && !initialized) {
                     initialized = true;
                     
                     // Actualizar contador final en el mensaje de bienvenida